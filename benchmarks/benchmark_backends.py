@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: 'numpy' vs. 'python' backends of Board and DiscardPile.
+
+Usage: ``python benchmarks/benchmark_backends.py [n_games]``.
+"""
+import sys
+import time
+from hanabython import (Board, Card, Configuration, DiscardPile, Game,
+                        GameEvent, GameRecorder, PlayerRandom)
+
+
+def micro(backend, n_repeats=2000):
+    """Operations per second on the board and the discard pile alone."""
+    cfg = Configuration.STANDARD
+    cards = [Card(c, v) for c in cfg.colors for v in cfg.values]
+    t = time.perf_counter()
+    for _ in range(n_repeats):
+        board = Board(cfg, backend=backend)
+        discard_pile = DiscardPile(cfg, backend=backend)
+        for card in cards:
+            board.try_to_play(card)
+            discard_pile.receive(card)
+            _ = board.score, discard_pile.max_score_possible
+    return n_repeats * len(cards) / (time.perf_counter() - t)
+
+
+def games(backend, n_games):
+    """Turns per second in full games between cautious random bots."""
+    Board.DEFAULT_BACKEND = backend
+    DiscardPile.DEFAULT_BACKEND = backend
+    n_turns = 0
+    scores = []
+    t = time.perf_counter()
+    for seed in range(n_games):
+        players = [PlayerRandom('Player %s' % i, seed=4 * seed + i,
+                                cautious=True) for i in range(4)]
+        game = Game(players, seed=seed, trusted=True)
+        recorder = GameRecorder()
+        game.subscribe(recorder)
+        scores.append(game.play())
+        n_turns += sum(recorder.count(category) for category in (
+            GameEvent.THROW, GameEvent.PLAY_CARD, GameEvent.CLUE,
+            GameEvent.FORFEIT))
+    return n_turns / (time.perf_counter() - t), scores
+
+
+if __name__ == '__main__':
+    my_n_games = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    my_scores = {}
+    for my_backend in ('numpy', 'python'):
+        print('%s: %.0f operations/sec (board and discard pile alone)' % (
+            my_backend, micro(my_backend)))
+        my_speed, my_scores[my_backend] = games(my_backend, my_n_games)
+        print('%s: %.0f turns/sec (full games)' % (my_backend, my_speed))
+    assert my_scores['numpy'] == my_scores['python']
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: throughput and move latency of the game server under load.
+
+The server runs in its own process, on a Unix socket. For each number of
+simultaneous clients, a :class:`LoadTest` connects them all at once and each
+client plays several full games with a scripted policy.
+
+Usage: ``python benchmarks/benchmark_server.py [n_games] [n_clients ...]``.
+"""
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from hanabython import LoadTest, Server
+
+
+def serve(path, n_players):
+    async def main():
+        server = Server(n_players=n_players)
+        await server.start(path=path)
+        await server.server.serve_forever()
+    asyncio.run(main())
+
+
+def run(n_clients, n_games, n_players=2):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'server.sock')
+        process = multiprocessing.Process(target=serve,
+                                          args=(path, n_players))
+        process.start()
+        while not os.path.exists(path):
+            time.sleep(.01)
+        load_test = LoadTest(n_clients, n_players=n_players,
+                             n_games=n_games, path=path)
+        load_test.run()
+        process.terminate()
+        process.join()
+    return load_test
+
+
+if __name__ == '__main__':
+    my_n_games = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    my_n_clients = [int(n) for n in sys.argv[2:]] or [2, 20, 200, 2000]
+    for my_n in my_n_clients:
+        print(run(my_n, my_n_games))
+        print()
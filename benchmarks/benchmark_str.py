@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: conversion of cards, hands and discard piles to plain strings.
+
+Usage: ``python benchmarks/benchmark_str.py [n_repeats]``.
+"""
+import sys
+import timeit
+from hanabython import (Card, Clue, Colors, Configuration, DiscardPile,
+                        HandPublic)
+
+
+def objects():
+    """A card, a public hand with some clues and a discard pile."""
+    cfg = Configuration.STANDARD
+    card = Card('B3')
+    hand_public = HandPublic(cfg, n_cards=5)
+    hand_public.match(Clue(Colors.BLUE), [True, False, False, True, False])
+    hand_public.match(Clue(3), [False, True, False, True, False])
+    discard_pile = DiscardPile(cfg)
+    for s in ['B3', 'R4', 'B1', 'G2', 'Y5', 'W1', 'W1', 'R2']:
+        discard_pile.receive(Card(s))
+    return {'Card': card, 'HandPublic': hand_public,
+            'DiscardPile': discard_pile}
+
+
+if __name__ == '__main__':
+    my_n_repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for my_name, my_object in objects().items():
+        my_time = timeit.timeit(lambda: str(my_object), number=my_n_repeats)
+        print('str(%s): %.2f us' % (my_name, 1e6 * my_time / my_n_repeats))
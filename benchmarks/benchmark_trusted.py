@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: turns per second with trusted players vs. untrusted players.
+
+Untrusted players receive copies of the configuration, the cards and the
+clues; trusted players receive the shared objects themselves.
+
+Usage: ``python benchmarks/benchmark_trusted.py [n_games]``.
+"""
+import random
+import sys
+import time
+from hanabython import (Configuration, PlayerBase, ActionSpace, Game,
+                        GameEvent, GameRecorder)
+
+
+class PlayerRandomLegal(PlayerBase):
+    """
+    A player who chooses a legal action uniformly at random.
+    """
+
+    def receive_init(self, cfg, player_names):
+        super().receive_init(cfg, player_names)
+        self.action_space = ActionSpace(cfg, self.n_players)
+
+    def choose_action(self):
+        mask = self.action_space.legal_mask(self)
+        return self.action_space.actions[
+            random.choice([a for a, ok in enumerate(mask) if ok])]
+
+
+def run(n_games, trusted, cfg=Configuration.STANDARD, n_players=4):
+    random.seed(0)
+    n_turns = 0
+    t = time.perf_counter()
+    for seed in range(n_games):
+        players = [PlayerRandomLegal('Player %s' % i)
+                   for i in range(n_players)]
+        game = Game(players, cfg, seed=seed, trusted=trusted)
+        recorder = GameRecorder()
+        game.subscribe(recorder)
+        game.play()
+        n_turns += sum(recorder.count(category) for category in (
+            GameEvent.THROW, GameEvent.PLAY_CARD, GameEvent.CLUE,
+            GameEvent.FORFEIT))
+    return n_turns / (time.perf_counter() - t)
+
+
+if __name__ == '__main__':
+    my_n_games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for my_trusted in (False, True):
+        print('trusted=%s: %.0f turns/sec' % (
+            my_trusted, run(my_n_games, my_trusted)))
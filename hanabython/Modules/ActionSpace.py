@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import List
+import numpy as np
+from hanabython.Modules.Action import Action
+from hanabython.Modules.ActionClue import ActionClue
+from hanabython.Modules.ActionPlayCard import ActionPlayCard
+from hanabython.Modules.ActionThrow import ActionThrow
+from hanabython.Modules.Clue import Clue
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.Configuration import Configuration
+from hanabython.Modules.ConfigurationEmptyClueRule \
+    import ConfigurationEmptyClueRule
+from hanabython.Modules.PlayerBase import PlayerBase
+
+
+class ActionSpace(Colored):
+    """
+    The set of possible actions in a game, numbered by integers.
+
+    This is typically used by learning agents, which choose an action by its
+    index. The forfeit is not included.
+
+    :param cfg: the configuration of the game.
+    :param n_players: the number of players.
+
+    :var int hand_size: the initial size of the hands.
+    :var list actions: the list of all possible actions. First come the
+        throws (one per position in the hand), then the plays (idem), then the
+        clues: for each partner (by relative position), one clue per cluable
+        color, then one clue per value.
+    :var int n_actions: the number of possible actions.
+
+    >>> action_space = ActionSpace(Configuration.STANDARD, n_players=3)
+    >>> print(action_space)
+    30 actions
+    >>> action_space.n_actions
+    30
+    >>> print(action_space.actions[0])
+    Discard card in position 1
+    >>> print(action_space.actions[5])
+    Try to play card in position 1
+    >>> print(action_space.actions[10])
+    Clue B to player in relative position 1
+    >>> print(action_space.actions[29])
+    Clue 5 to player in relative position 2
+    """
+
+    def __init__(self, cfg: Configuration, n_players: int):
+        self.cfg = cfg
+        self.n_players = n_players
+        self.hand_size = cfg.hand_size_rule.f(n_players)    # type: int
+        clues = (
+            [Clue(c) for c in cfg.colors if c.is_cluable]
+            + [Clue(v) for v in cfg.values]
+        )                                                   # type: List[Clue]
+        self.n_clues_per_partner = len(clues)               # type: int
+        self.actions = (
+            [ActionThrow(k) for k in range(self.hand_size)]
+            + [ActionPlayCard(k) for k in range(self.hand_size)]
+            + [ActionClue(i, clue)
+               for i in range(1, n_players) for clue in clues]
+        )                                                 # type: List[Action]
+        self.n_actions = len(self.actions)                  # type: int
+
+    def colored(self) -> str:
+        return '%s actions' % self.n_actions
+
+    def index(self, action: Action) -> int:
+        """
+        Index of an action.
+
+        :param action: an action (not a forfeit).
+
+        :return: the index of this action in :attr:`actions`.
+
+        >>> from hanabython import Colors
+        >>> action_space = ActionSpace(Configuration.STANDARD, n_players=3)
+        >>> action_space.index(ActionPlayCard(0))
+        5
+        >>> action_space.index(ActionClue(i=2, clue=Clue(Colors.BLUE)))
+        20
+        >>> action_space.index(ActionClue(i=2, clue=Clue(5)))
+        29
+        >>> from hanabython import ActionForfeit
+        >>> action_space.index(ActionForfeit())
+        Traceback (most recent call last):
+        ValueError: No index for this action: Forfeit
+        """
+        if action.category == Action.THROW:
+            return action.k
+        if action.category == Action.PLAY_CARD:
+            return self.hand_size + action.k
+        if action.category != Action.CLUE:
+            raise ValueError('No index for this action: %s' % action)
+        start = 2 * self.hand_size + (
+            action.i - 1) * self.n_clues_per_partner
+        if action.clue.category == Clue.VALUE:
+            return (start + self.n_clues_per_partner - self.cfg.n_values
+                    + self.cfg.i_from_v(action.clue.x))
+        return start + [c for c in self.cfg.colors
+                        if c.is_cluable].index(action.clue.x)
+
+    def legal_mask(self, player: PlayerBase, out: np.array = None) -> np.array:
+        """
+        Legal actions, from the point of view of a player.
+
+        :param player: the player who is going to act. Her variables
+            (:attr:`PlayerBase.n_clues`, :attr:`PlayerBase.hands`, etc.) are
+            used to determine whether each action is legal.
+        :param out: an array of booleans of size :attr:`n_actions` where the
+            result is written. If None, a new array is created.
+
+        :return: the array of booleans. The coefficient is True iff the
+            corresponding action is legal.
+
+        >>> from hanabython import PlayerBase
+        >>> antoine = PlayerBase('Antoine')
+        >>> antoine.demo_game()
+        >>> action_space = ActionSpace(antoine.cfg, antoine.n_players)
+        >>> mask = action_space.legal_mask(antoine)
+        >>> print(mask[:10])
+        [ True  True  True  True  True  True  True  True  True  True]
+        >>> print(antoine.hands[1])
+        Y2 R1 R3 G3 Y4
+        >>> print(mask[10:20])
+        [False  True  True False  True  True  True  True  True False]
+        >>> antoine.n_clues = 0
+        >>> _ = action_space.legal_mask(antoine, out=mask)
+        >>> print(mask[10:20])
+        [False False False False False False False False False False]
+        """
+        if out is None:
+            out = np.zeros(self.n_actions, dtype=bool)
+        n_cards = len(player.hands_public[0])
+        can_throw = player.n_clues < self.cfg.n_clues
+        for k in range(self.hand_size):
+            out[k] = can_throw and k < n_cards
+            out[self.hand_size + k] = k < n_cards
+        check_empty = (
+            self.cfg.empty_clue_rule == ConfigurationEmptyClueRule.FORBIDDEN)
+        for a in range(2 * self.hand_size, self.n_actions):
+            if player.n_clues == 0:
+                out[a] = False
+                continue
+            action = self.actions[a]
+            out[a] = not check_empty or any(
+                card.match(action.clue) for card in player.hands[action.i])
+        return out
+
+
+if __name__ == '__main__':
+    my_action_space = ActionSpace(Configuration.W_MULTICOLOR, n_players=2)
+    my_action_space.test_str()
+    for my_action in my_action_space.actions:
+        print(my_action.colored())
+
+    import doctest
+    doctest.testmod()
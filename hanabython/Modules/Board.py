@@ -20,7 +20,7 @@ This file is part of Hanabython.
 """
 import numpy as np
 from hanabython.Modules.Colored import Colored
-from hanabython.Modules.StringUtils import uncolor
+from hanabython.Modules.StringUtils import uncolor, cached_rendering
 from hanabython.Modules.Configuration import Configuration
 from hanabython.Modules.Color import Color
 from hanabython.Modules.Card import Card
@@ -31,21 +31,45 @@ class Board(Colored):
     The board (cards successfully played) in a game of Hanabi.
 
     :param cfg: the configuration of the game.
+    :param backend: 'numpy' or 'python'. With 'python', :attr:`altitude` is a
+        list of integers, which is faster for such a small array. If None,
+        :attr:`DEFAULT_BACKEND` is used.
 
     :var np.array altitude: indicates the highest card played in each color.
         E.g. with color ``c`` of index ``i``, ``altitude[i]`` is the value
         of the highest card played in color ``c``. The correspondence between
-        colors and indexes is the one provided by :attr:`cfg`.
+        colors and indexes is the one provided by :attr:`cfg`. It should be
+        modified only with :meth:`try_to_play`, because :attr:`score` is
+        updated at the same time.
+    :var CardClassification classification: if not None, it is updated by
+        :meth:`try_to_play` (cf. :class:`CardClassification`).
+
+    The colored representations are cached until the next card is played.
 
     >>> from hanabython import Configuration
     >>> board = Board(Configuration.STANDARD)
     >>> print(board.altitude)
     [0 0 0 0 0]
+    >>> board = Board(Configuration.STANDARD, backend='python')
+    >>> print(board.altitude)
+    [0, 0, 0, 0, 0]
     """
 
-    def __init__(self, cfg: Configuration):
+    #: Backend used when none is specified: 'numpy' or 'python'.
+    DEFAULT_BACKEND = 'numpy'
+
+    def __init__(self, cfg: Configuration, backend: str = None):
         self.cfg = cfg
-        self.altitude = np.zeros(self.cfg.n_colors, dtype=int)  # type: np.array
+        self.backend = self.DEFAULT_BACKEND if backend is None else backend
+        if self.backend == 'numpy':
+            self.altitude = np.zeros(cfg.n_colors, dtype=int)  # type: np.array
+        elif self.backend == 'python':
+            self.altitude = [0] * cfg.n_colors
+        else:
+            raise ValueError('Unknown backend: %s.' % self.backend)
+        self._score = 0
+        self._render_cache = {}
+        self.classification = None
 
     def __repr__(self) -> str:
         return '<Board: %s>' % self.str_compact()
@@ -68,6 +92,7 @@ class Board(Colored):
         """
         return uncolor(self.colored_compact())
 
+    @cached_rendering
     def colored_compact(self) -> str:
         """
         Colored version of :meth:`str_compact`.
@@ -95,6 +120,7 @@ class Board(Colored):
         """
         return uncolor(self.colored_fixed_space())
 
+    @cached_rendering
     def colored_fixed_space(self) -> str:
         """
         Colored version of :meth:`str_fixed_space`.
@@ -124,6 +150,7 @@ class Board(Colored):
         """
         return uncolor(self.colored_multi_line())
 
+    @cached_rendering
     def colored_multi_line(self) -> str:
         """
         Colored version of :meth:`str_multi_line`.
@@ -149,6 +176,7 @@ class Board(Colored):
         """
         return uncolor(self.colored_multi_line_compact())
 
+    @cached_rendering
     def colored_multi_line_compact(self) -> str:
         """
         Colored version of :meth:`str_multi_line_compact`.
@@ -182,7 +210,7 @@ class Board(Colored):
         if self.altitude[i] == 0:
             return '-'
         return ' '.join([
-            str(Card(c, j)) for j in range(1, self.altitude[i] + 1)
+            c.symbol + str(j) for j in range(1, self.altitude[i] + 1)
         ])
 
     # noinspection PyProtectedMember
@@ -233,6 +261,10 @@ class Board(Colored):
         i_c = self.cfg.i_from_c(card.c)
         if card.v == self.altitude[i_c] + 1:
             self.altitude[i_c] += 1
+            self._score += 1
+            self._render_cache.clear()
+            if self.classification is not None:
+                self.classification.card_played(i_c, card.v)
             return True
         else:
             return False
@@ -242,7 +274,8 @@ class Board(Colored):
         """
         The current score.
 
-        :return: the sum of the altitudes reached in all colors.
+        :return: the sum of the altitudes reached in all colors. It is
+            updated incrementally by :meth:`try_to_play`.
 
         >>> from hanabython import Configuration
         >>> cfg = Configuration.STANDARD
@@ -252,7 +285,7 @@ class Board(Colored):
         >>> print(board.score)
         7
         """
-        return int(np.sum(self.altitude))
+        return self._score
 
 
 if __name__ == '__main__':
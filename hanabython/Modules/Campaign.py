@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import json
+import os
+import time
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.Configuration import Configuration
+from hanabython.Modules.Game import Game
+from hanabython.Modules.GameResult import GameResult
+from hanabython.Modules.Player import Player
+from hanabython.Modules.ProcessUtils import worker_pool
+from hanabython.Modules.ResultsStore import configuration_key
+from hanabython.Modules.Statistics import Statistics
+
+# Parameters of the campaign, set in each worker process by _init_worker.
+_worker_parameters = {}
+
+
+class Campaign(Colored):
+    """
+    A long simulation campaign that can be interrupted and resumed.
+
+    The campaign is made of tasks. Each task is a matchup, i.e. a set of
+    players with a configuration, that plays `n_games` games with consecutive
+    seeds. The work is cut into chunks of seeds, which are always played and
+    added to the :class:`Statistics` in the same order (task by task, chunk by
+    chunk), whatever the number of workers.
+
+    Periodically, the campaign saves a checkpoint in a JSON file: the
+    specification of the campaign, the number of games done for each task and
+    the corresponding statistics. If the campaign is run again with the same
+    specification and the same checkpoint file, the work already done is
+    skipped. Since the order of the games is the same, the final results are
+    identical to those of an uninterrupted run.
+
+    :param tasks: a list of tuples (name, cfg, make_players). The names must
+        be distinct. `make_players` is a function that takes the seed of a
+        game and returns a new list of players, cf. :class:`Comparison`.
+    :param n_games: the number of games for each task.
+    :param path: the path of the checkpoint file. If None, there is no
+        checkpoint.
+    :param chunk_size: the number of seeds in each chunk.
+    :param first_seed: the seed of the first game of each task.
+    :param n_workers: the number of worker processes. If None, the number of
+        CPUs is used. If 0, the games are played in this process.
+    :param checkpoint_interval: the minimal time between two checkpoints, in
+        seconds. A checkpoint is also saved at the end of :meth:`run`.
+    :param trusted: whether the players are trusted, cf. :class:`Game`. This
+        is faster, but a player that modifies the objects of the game
+        (configuration, cards, clues) silently corrupts it, and with it the
+        checkpointed statistics. It is part of the specification of the
+        campaign.
+
+    :var dict n_games_done: for each task name, the number of games done.
+    :var dict statistics: for each task name, the :class:`Statistics` of the
+        games done.
+
+    >>> import os, tempfile
+    >>> from hanabython import PlayerRandom
+    >>> def make_players(seed):
+    ...     return [PlayerRandom('Player %s' % i, seed=2 * seed + i,
+    ...                          cautious=True) for i in range(2)]
+    >>> tasks = [('standard', Configuration.STANDARD, make_players),
+    ...          ('sixth', Configuration.W_SIXTH, make_players)]
+    >>> path = os.path.join(tempfile.mkdtemp(), 'checkpoint.json')
+    >>> campaign = Campaign(tasks, n_games=40, path=path, chunk_size=10,
+    ...                     n_workers=2, checkpoint_interval=0)
+    >>> campaign.run(max_chunks=5)  # Interrupted before the end
+    False
+    >>> campaign.n_games_done
+    {'standard': 40, 'sixth': 10}
+
+    Later, the campaign is resumed (typically in a new Python process):
+
+    >>> campaign = Campaign(tasks, n_games=40, path=path, chunk_size=10,
+    ...                     n_workers=2)
+    >>> campaign.n_games_done
+    {'standard': 40, 'sixth': 10}
+    >>> campaign.run()
+    True
+    >>> print(campaign)
+    standard: 40 games, mean score 2.83.
+    sixth: 40 games, mean score 2.42.
+
+    The results are the same as without interruption:
+
+    >>> uninterrupted = Campaign(tasks, n_games=40, chunk_size=10, n_workers=0)
+    >>> uninterrupted.run()
+    True
+    >>> all(uninterrupted.statistics[name].to_dict()
+    ...     == campaign.statistics[name].to_dict()
+    ...     for name in ['standard', 'sixth'])
+    True
+
+    The checkpoint cannot be used with other players, or in another mode
+    (cf. parameter `trusted`):
+
+    >>> try:
+    ...     _ = Campaign(tasks, n_games=40, path=path, chunk_size=10,
+    ...                  trusted=True)
+    ... except ValueError:
+    ...     print('Another campaign')
+    Another campaign
+
+    >>> def make_reckless_players(seed):
+    ...     return [PlayerRandom('Player %s' % i, seed=2 * seed + i)
+    ...             for i in range(2)]
+    >>> try:
+    ...     _ = Campaign([(name, cfg, make_reckless_players)
+    ...                   for name, cfg, _ in tasks],
+    ...                  n_games=40, path=path, chunk_size=10)
+    ... except ValueError:
+    ...     print('Another campaign')
+    Another campaign
+    """
+
+    def __init__(self, tasks: List[Tuple[str, Configuration,
+                                         Callable[[int], List[Player]]]],
+                 n_games: int, path: str = None, chunk_size: int = 100,
+                 first_seed: int = 0, n_workers: int = None,
+                 checkpoint_interval: float = 60., trusted: bool = False):
+        self.tasks = tasks
+        self.n_games = n_games
+        self.path = path
+        self.chunk_size = chunk_size
+        self.first_seed = first_seed
+        self.n_workers = os.cpu_count() if n_workers is None else n_workers
+        self.checkpoint_interval = checkpoint_interval
+        self.trusted = trusted
+        self.n_games_done = {
+            name: 0 for name, _, _ in tasks}            # type: Dict[str, int]
+        self.statistics = {
+            name: Statistics(cfg) for name, cfg, _ in tasks
+        }                                       # type: Dict[str, Statistics]
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def colored(self) -> str:
+        return '\n'.join(
+            '%s: %s games, mean score %.2f.' % (
+                name, self.n_games_done[name], self.statistics[name].mean)
+            for name, _, _ in self.tasks)
+
+    @property
+    def spec(self) -> dict:
+        """
+        Specification of the campaign.
+
+        It identifies the work to be done: a checkpoint can only be used by a
+        campaign with the same specification. It includes a fingerprint of the
+        functions `make_players`, cf. :func:`factory_key`.
+
+        :return: a dictionary.
+        """
+        return {
+            'tasks': [[name, configuration_key(cfg), factory_key(factory)]
+                      for name, cfg, factory in self.tasks],
+            'n_games': self.n_games, 'chunk_size': self.chunk_size,
+            'first_seed': self.first_seed, 'trusted': self.trusted,
+        }
+
+    @property
+    def is_finished(self) -> bool:
+        """
+        Whether all the games are done.
+        """
+        return all(n == self.n_games for n in self.n_games_done.values())
+
+    def save(self) -> None:
+        """
+        Save a checkpoint.
+
+        The file is replaced atomically: if the process is killed while
+        saving, the previous checkpoint remains valid.
+        """
+        data = {
+            'spec': self.spec,
+            'n_games_done': self.n_games_done,
+            'statistics': {name: statistics.to_dict()
+                           for name, statistics in self.statistics.items()},
+        }
+        with open(self.path + '.tmp', 'w') as f:
+            json.dump(data, f)
+        os.replace(self.path + '.tmp', self.path)
+
+    def load(self) -> None:
+        """
+        Load the checkpoint.
+
+        :raise ValueError: if the checkpoint was saved by a campaign with
+            another specification.
+        """
+        with open(self.path) as f:
+            data = json.load(f)
+        if data['spec'] != self.spec:
+            raise ValueError('The checkpoint %s was saved by another campaign.'
+                             % self.path)
+        self.n_games_done = data['n_games_done']
+        self.statistics = {
+            name: Statistics.from_dict(data['statistics'][name], cfg)
+            for name, cfg, _ in self.tasks
+        }
+
+    def chunks_to_do(self) -> List[Tuple[int, int, int]]:
+        """
+        Chunks of games that are not done yet.
+
+        :return: a list of tuples (index of the task, first seed, number of
+            games), in the order where they are played.
+        """
+        last_seed = self.first_seed + self.n_games
+        return [
+            (i, seed, min(self.chunk_size, last_seed - seed))
+            for i, (name, _, _) in enumerate(self.tasks)
+            for seed in range(self.first_seed + self.n_games_done[name],
+                              last_seed, self.chunk_size)
+        ]
+
+    def run(self, max_chunks: int = None) -> bool:
+        """
+        Play the games that are not done yet.
+
+        :param max_chunks: if not None, stop after this number of chunks.
+
+        :return: True iff the campaign is finished.
+        """
+        chunks = self.chunks_to_do()[:max_chunks]
+        if self.n_workers == 0:
+            _init_worker(self.tasks, self.trusted)
+            self._add_chunks(map(_play_chunk, chunks), chunks)
+        else:
+            with worker_pool(self.n_workers, _init_worker,
+                             (self.tasks, self.trusted)) as pool:
+                self._add_chunks(pool.imap(_play_chunk, chunks), chunks)
+        return self.is_finished
+
+    def _add_chunks(self, results, chunks: List[Tuple[int, int, int]]):
+        last_save = time.monotonic()
+        for chunk_results, (i, _, n_games) in zip(results, chunks):
+            name = self.tasks[i][0]
+            for result in chunk_results:
+                self.statistics[name].add(result)
+            self.n_games_done[name] += n_games
+            if (self.path is not None and time.monotonic() - last_save
+                    >= self.checkpoint_interval):
+                self.save()
+                last_save = time.monotonic()
+        if self.path is not None:
+            self.save()
+
+
+def factory_key(factory: Callable) -> str:
+    """
+    Fingerprint of a function that creates players.
+
+    :param factory: a callable, e.g. a function, a class or a
+        :func:`functools.partial` object.
+
+    :return: its qualified name (with its module) and its representation.
+        Memory addresses, which change from one process to another, are
+        omitted: a function or a class is identified by its qualified name
+        only, and a partial object by the fingerprint of its function and the
+        representation of its arguments.
+
+    >>> from functools import partial
+    >>> from hanabython import PlayerRandom
+    >>> factory_key(PlayerRandom)
+    'hanabython.Modules.PlayerRandom.PlayerRandom'
+    >>> factory_key(partial(PlayerRandom, cautious=True))
+    "partial(hanabython.Modules.PlayerRandom.PlayerRandom, (), {'cautious': \
+True})"
+    """
+    if isinstance(factory, partial):
+        return 'partial(%s, %r, %r)' % (
+            factory_key(factory.func), factory.args, factory.keywords)
+    if hasattr(factory, '__qualname__'):
+        return '%s.%s' % (factory.__module__, factory.__qualname__)
+    return '%s.%s %r' % (type(factory).__module__,
+                         type(factory).__qualname__, factory)
+
+
+def _init_worker(tasks: List[Tuple[str, Configuration,
+                                   Callable[[int], List[Player]]]],
+                 trusted: bool) -> None:
+    """
+    Initialize the parameters of the campaign in a worker process.
+
+    :param tasks: the tasks.
+    :param trusted: whether the players are trusted.
+    """
+    _worker_parameters['tasks'] = tasks
+    _worker_parameters['trusted'] = trusted
+
+
+def _play_chunk(chunk: Tuple[int, int, int]) -> List[GameResult]:
+    """
+    Play a chunk of games.
+
+    :param chunk: a tuple (index of the task, first seed, number of games).
+
+    :return: the results of the games, in the order of the seeds.
+    """
+    i, first_seed, n_games = chunk
+    _, cfg, make_players = _worker_parameters['tasks'][i]
+    trusted = _worker_parameters['trusted']
+    results = []
+    for seed in range(first_seed, first_seed + n_games):
+        game = Game(make_players(seed), cfg, seed=seed, trusted=trusted)
+        game.play()
+        results.append(game.result)
+    return results
+
+
+if __name__ == '__main__':
+    from hanabython.Modules.PlayerRandom import PlayerRandom
+
+    def my_make_players(seed):
+        return [PlayerRandom('Player %s' % i, seed=3 * seed + i,
+                             cautious=True) for i in range(3)]
+
+    my_campaign = Campaign(
+        [(cfg.name, cfg, my_make_players) for cfg in [
+            Configuration.STANDARD, Configuration.W_SIXTH,
+            Configuration.W_MULTICOLOR]],
+        n_games=200)
+    my_campaign.run()
+    my_campaign.test_str()
+
+    import doctest
+    doctest.testmod()
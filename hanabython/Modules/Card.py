@@ -96,9 +96,15 @@ class Card(Colored):
                 except ValueError:
                     raise ValueError('Could not interpret as a card: ', s)
 
+    def __reduce_ex__(self, protocol):
+        return Card, (self.c, self.v)
+
     def colored(self) -> str:
         return self.c.color_str(self.c.symbol + str(self.v))
 
+    def __str__(self) -> str:
+        return self.c.symbol + str(self.v)
+
     def match(self, clue: Clue) -> bool:
         """
         React to a clue.
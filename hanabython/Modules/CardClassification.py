@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import Iterable
+import numpy as np
+from hanabython.Modules.Board import Board
+from hanabython.Modules.Card import Card
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.DiscardPile import DiscardPile
+
+
+class CardClassification(Colored):
+    """
+    Classification of all the cards, given a board and a discard pile.
+
+    Each array is indexed by card identifiers (cf.
+    :meth:`Configuration.card_id`). At initialization, the classification is
+    attached to the board and the discard pile: then it is updated by
+    :meth:`Board.try_to_play` and :meth:`DiscardPile.receive`, in constant
+    time (except when a card becomes impossible to play, which may make the
+    higher cards of its color useless at once).
+
+    :param board: the board.
+    :param discard_pile: the discard pile.
+
+    :var np.array playable: True iff the card can be played now.
+    :var np.array eventually_playable: True iff the card can be played now or
+        later, i.e. it is not played yet and all the lower cards of its color
+        are still available.
+    :var np.array trash: True iff the card is useless, i.e. not
+        :attr:`eventually_playable`.
+    :var np.array critical: True iff the card is eventually playable and it is
+        the last copy that is not discarded.
+
+    >>> from hanabython import Configuration, Hand
+    >>> cfg = Configuration.STANDARD
+    >>> board, discard_pile = Board(cfg), DiscardPile(cfg)
+    >>> classification = CardClassification(board, discard_pile)
+    >>> for s in ['B1', 'B2', 'G1']:
+    ...     _ = board.try_to_play(Card(s))
+    >>> for s in ['R2', 'Y3', 'Y3']:
+    ...     discard_pile.receive(Card(s))
+    >>> hand = Hand(['B3', 'G1', 'R2', 'Y4', 'W5'])
+    >>> card_ids = classification.card_ids(hand)
+    >>> classification.playable[card_ids]
+    array([ True, False, False, False, False])
+    >>> classification.trash[card_ids]
+    array([False,  True, False,  True, False])
+    >>> classification.critical[card_ids]
+    array([False, False,  True, False,  True])
+    >>> print(classification)
+    Playable: B3 G2 R1 W1 Y1
+    Critical: B5 G5 R2 R5 W5
+    """
+
+    def __init__(self, board: Board, discard_pile: DiscardPile):
+        cfg = board.cfg
+        self.cfg = cfg
+        self.discard_pile = discard_pile
+        values = np.arange(1, cfg.n_values + 1)
+        altitude = np.array(board.altitude)[:, np.newaxis]
+        self.eventually_playable = (
+            np.array(discard_pile.scorable, dtype=bool) & (values > altitude)
+        ).ravel()                                           # type: np.array
+        self.playable = (
+            self.eventually_playable & (values == altitude + 1).ravel())
+        self.trash = ~self.eventually_playable              # type: np.array
+        self.critical = self.eventually_playable & (
+            np.array(discard_pile.not_discarded) == 1).ravel()
+        board.classification = self
+        discard_pile.classification = self
+
+    def colored(self) -> str:
+        return '\n'.join([
+            'Playable: %s' % ' '.join(self._cards(self.playable)),
+            'Critical: %s' % ' '.join(self._cards(self.critical)),
+        ])
+
+    def _cards(self, mask: np.array) -> Iterable[str]:
+        """
+        Colored strings of the cards in a mask.
+
+        :param mask: an array of booleans, indexed by card identifiers.
+
+        :return: the colored string of each card whose coefficient is True.
+        """
+        return [self.cfg.card_from_id(card_id).colored()
+                for card_id in np.flatnonzero(mask)]
+
+    def card_ids(self, cards: Iterable[Card]) -> np.array:
+        """
+        Identifiers of some cards, e.g. a hand.
+
+        :param cards: the cards.
+
+        :return: an array of card identifiers. It can be used to query the
+            classification of all the cards at once, e.g.
+            ``playable[card_ids]``.
+        """
+        return np.array([self.cfg.card_id(card) for card in cards],
+                        dtype=int)
+
+    def card_played(self, i: int, v: int) -> None:
+        """
+        Update the classification when a card is played on the board.
+
+        This is called by :meth:`Board.try_to_play`.
+
+        :param i: the index of the color of the card.
+        :param v: the value of the card.
+        """
+        card_id = i * self.cfg.n_values + v - 1
+        self._make_trash(card_id)
+        if v < self.cfg.n_values and self.eventually_playable[card_id + 1]:
+            self.playable[card_id + 1] = True
+
+    def card_discarded(self, i: int, j: int) -> None:
+        """
+        Update the classification when a card is discarded.
+
+        This is called by :meth:`DiscardPile.receive`, once the discard pile is
+        updated.
+
+        :param i: the index of the color of the card.
+        :param j: the index of the value of the card.
+        """
+        n_values = self.cfg.n_values
+        card_id = i * n_values + j
+        n_left = self.discard_pile.not_discarded[i][j]
+        if n_left == 0:
+            for k in range(card_id, (i + 1) * n_values):
+                self._make_trash(k)
+        elif n_left == 1 and self.eventually_playable[card_id]:
+            self.critical[card_id] = True
+
+    def _make_trash(self, card_id: int) -> None:
+        """
+        Classify a card as useless.
+
+        :param card_id: the identifier of the card.
+        """
+        self.playable[card_id] = False
+        self.eventually_playable[card_id] = False
+        self.trash[card_id] = True
+        self.critical[card_id] = False
+
+
+if __name__ == '__main__':
+    from hanabython.Modules.Configuration import Configuration
+    my_cfg = Configuration.W_MULTICOLOR
+    my_board, my_discard_pile = Board(my_cfg), DiscardPile(my_cfg)
+    my_classification = CardClassification(my_board, my_discard_pile)
+    for my_s in ['B1', 'M1', 'M2']:
+        my_board.try_to_play(Card(my_s))
+    my_discard_pile.receive(Card('M4'))
+    my_classification.test_str()
+
+    import doctest
+    doctest.testmod()
@@ -25,6 +25,7 @@ from hanabython.Modules.Configuration import Configuration
 from hanabython.Modules.Color import Color
 from hanabython.Modules.Colors import Colors
 from hanabython.Modules.StringAnsi import StringAnsi
+from hanabython.Modules.StringUtils import cached_rendering
 
 
 class CardPublic(Colored):
@@ -35,6 +36,7 @@ class CardPublic(Colored):
     the owner of the card.
 
     :param cfg: the configuration of the game.
+    :param joint: whether to maintain :attr:`can_be`.
 
     :var np.array can_be_c: a coefficient is True iff the card can be of the
         corresponding color.
@@ -45,35 +47,98 @@ class CardPublic(Colored):
         this color (this precision is important for multicolor).
     :var np.array yes_clued_v: a coefficient is True iff the card was
         explicitly clued as value v.
+    :var np.array can_be: if :attr:`joint` is True, a numpy array of booleans
+        of size :attr:`Configuration.n_colors` *
+        :attr:`Configuration.n_values`, with the same layout as
+        :attr:`Configuration.deck_array`. A coefficient is True iff the card
+        can be of the corresponding color *and* value. Otherwise, None.
+
+    The variables above should be modified only with :meth:`match`, because
+    the colored representation is cached until the next clue.
 
     >>> from hanabython import Configuration
     >>> card = CardPublic(Configuration.EIGHT_COLORS)
     >>> print(card)
     BGRWYPMC 12345
+
+    With the joint possibilities, the knowledge can be refined by other
+    information, e.g. a card that is known not to be R2 (because all of them
+    are visible elsewhere). Then :attr:`can_be` can be used directly as a mask
+    to compute the probability of each card (here, M2 has 2 chances out of
+    12):
+
+    >>> cfg = Configuration.W_MULTICOLOR
+    >>> card = CardPublic(cfg, joint=True)
+    >>> card.match(Clue(Colors.RED), b=True)
+    >>> card.match(Clue(1), b=False)
+    >>> card.can_be[cfg.i_from_c(Colors.RED), 1] = False
+    >>> card.can_be.astype(int)
+    array([[0, 0, 0, 0, 0],
+           [0, 0, 0, 0, 0],
+           [0, 0, 1, 1, 1],
+           [0, 0, 0, 0, 0],
+           [0, 0, 0, 0, 0],
+           [0, 1, 1, 1, 1]])
+    >>> weights = card.can_be * cfg.deck_array
+    >>> print(weights)
+    [[0 0 0 0 0]
+     [0 0 0 0 0]
+     [0 0 2 2 1]
+     [0 0 0 0 0]
+     [0 0 0 0 0]
+     [0 2 2 2 1]]
+    >>> print(weights[5, 1] / weights.sum())
+    0.16666666666666666
     """
-    def __init__(self, cfg: Configuration):
+    def __init__(self, cfg: Configuration, joint: bool = False):
         self.cfg = cfg
+        self.joint = joint
+        self.can_be = (np.ones((cfg.n_colors, cfg.n_values), dtype=bool)
+                       if joint else None)                  # type: np.array
         self.can_be_c = np.ones(cfg.n_colors, dtype=bool)       # type: np.array
         self.can_be_v = np.ones(cfg.n_values, dtype=bool)       # type: np.array
         self.yes_clued_c = np.zeros(cfg.n_colors, dtype=bool)   # type: np.array
         self.yes_clued_v = np.zeros(cfg.n_values, dtype=bool)   # type: np.array
+        self._render_cache = {}
 
+    @cached_rendering
     def colored(self) -> str:
+        return self._render(colored=True)
+
+    @cached_rendering
+    def __str__(self) -> str:
+        return self._render(colored=False)
+
+    def _render(self, colored: bool) -> str:
+        """
+        Colored or plain version of the card.
+
+        :param colored: whether to use ANSI escape codes.
+
+        :return: the string.
+        """
         s_c = ''
         w_c = 0
         for i, c in enumerate(self.cfg.colors):
             if self.yes_clued_c[i]:
-                s_c += StringAnsi.STYLE_REVERSE_VIDEO + c.color_str(c.symbol)
+                if colored:
+                    s_c += (StringAnsi.STYLE_REVERSE_VIDEO
+                            + c.color_str(c.symbol))
+                else:
+                    s_c += c.symbol
                 w_c += 1
             elif self.can_be_c[i]:
-                s_c += c.color_str(c.symbol)
+                s_c += c.color_str(c.symbol) if colored else c.symbol
                 w_c += 1
         s_v = ''
         w_v = 0
         for i, v in enumerate(self.cfg.values):
             if self.yes_clued_v[i]:
-                s_v += StringAnsi.STYLE_REVERSE_VIDEO + str(
-                    v) + StringAnsi.RESET
+                if colored:
+                    s_v += (StringAnsi.STYLE_REVERSE_VIDEO + str(v)
+                            + StringAnsi.RESET)
+                else:
+                    s_v += str(v)
                 w_v += 1
             elif self.can_be_v[i]:
                 s_v += str(v)
@@ -124,6 +189,9 @@ class CardPublic(Colored):
                 self.yes_clued_c[i] = False  # important for multicolor
             if b and c.match(x) and self.can_be_c[i]:
                 self.yes_clued_c[i] = True
+        if self.joint:
+            matches = self.cfg.color_match_array[:, self.cfg.i_from_c(x)]
+            self.can_be[matches != b, :] = False
 
     def _match_v(self, x: int, b: bool) -> None:
         """
@@ -141,6 +209,12 @@ class CardPublic(Colored):
             self.can_be_v[i] = True
         else:
             self.can_be_v[i] = False
+        if self.joint:
+            if b:
+                self.can_be[:, :i] = False
+                self.can_be[:, i + 1:] = False
+            else:
+                self.can_be[:, i] = False
 
     def match(self, clue: Clue, b: bool) -> None:
         """
@@ -193,6 +267,7 @@ class CardPublic(Colored):
             self._match_v(clue.x, b)
         else:
             self._match_c(clue.x, b)
+        self._render_cache.clear()
 
 
 if __name__ == '__main__':
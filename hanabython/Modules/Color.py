@@ -49,6 +49,16 @@ class Color(Colored):
         self.symbol = symbol
         self.print_color = print_color
 
+    def __reduce_ex__(self, protocol):
+        # A standard color is pickled as a reference to its symbol.
+        from hanabython.Modules.Colors import Colors
+        try:
+            if Colors.from_symbol(self.symbol) is self:
+                return Colors.from_symbol, (self.symbol, )
+        except ValueError:
+            pass
+        return super().__reduce_ex__(protocol)
+
     def colored(self) -> str:
         return self.color_str(self.symbol)
 
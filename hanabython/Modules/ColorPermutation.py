@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import numpy as np
+from typing import List, Sequence
+from hanabython.Modules.Action import Action
+from hanabython.Modules.ActionClue import ActionClue
+from hanabython.Modules.Card import Card
+from hanabython.Modules.Clue import Clue
+from hanabython.Modules.Color import Color
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.Configuration import Configuration
+
+
+class ColorPermutation(Colored):
+    """
+    A permutation of the colors of a configuration.
+
+    The rules of Hanabi are invariant when interchanging two normal colors
+    (i.e. not special colors such as multicolor or colorless) that have the
+    same contents in the deck (cf. :class:`ConfigurationColorContents`).
+    Hence a state of the game, or the view of a player, can be mapped to a
+    canonical representative, which is used for example to share the entries
+    of a :class:`DecisionCache` between equivalent views. Cf.
+    :meth:`canonical_for_player` and :meth:`canonical_for_game`.
+
+    :param cfg: the configuration of the game.
+    :param image: for each color index ``i``, the index of the color that
+        replaces it. By default, this is the identity.
+
+    :var np.array preimage: the inverse permutation. For an array indexed by
+        the color indexes, ``array[preimage]`` is the permuted array.
+
+    >>> cfg = Configuration.STANDARD
+    >>> permutation = ColorPermutation(cfg, [1, 0, 2, 4, 3])
+    >>> print(permutation)
+    BGRWY -> GBRYW
+    >>> print(permutation.apply_card(Card('B3')))
+    G3
+    >>> print(permutation.inverse())
+    BGRWY -> GBRYW
+    """
+
+    def __init__(self, cfg: Configuration, image: Sequence[int] = None):
+        self.cfg = cfg
+        if image is None:
+            image = range(cfg.n_colors)
+        self.image = np.array(image, dtype=int)             # type: np.array
+        self.preimage = np.argsort(self.image)              # type: np.array
+
+    def colored(self) -> str:
+        return '%s -> %s' % (
+            ''.join(c.colored() for c in self.cfg.colors),
+            ''.join(self.cfg.colors[i].colored() for i in self.image))
+
+    def __str__(self) -> str:
+        return '%s -> %s' % (
+            ''.join(c.symbol for c in self.cfg.colors),
+            ''.join(self.cfg.colors[i].symbol for i in self.image))
+
+    @property
+    def is_identity(self) -> bool:
+        """
+        Whether this permutation leaves every color in place.
+
+        >>> ColorPermutation(Configuration.STANDARD).is_identity
+        True
+        """
+        return bool(np.all(self.image == np.arange(self.cfg.n_colors)))
+
+    def inverse(self) -> 'ColorPermutation':
+        """
+        Inverse permutation.
+
+        :return: the permutation that undoes this one.
+
+        >>> cfg = Configuration.STANDARD
+        >>> print(ColorPermutation(cfg, [1, 2, 0, 3, 4]).inverse())
+        BGRWY -> RBGWY
+        """
+        return ColorPermutation(self.cfg, self.preimage)
+
+    def apply_c(self, c: Color) -> Color:
+        """
+        Image of a color.
+
+        :param c: a color of the configuration.
+
+        :return: the color that replaces it.
+        """
+        return self.cfg.colors[self.image[self.cfg.i_from_c(c)]]
+
+    def apply_card(self, card: Card) -> Card:
+        """
+        Image of a card.
+
+        :param card: a card.
+
+        :return: a new card, with the same value and the image color.
+        """
+        return Card(c=self.apply_c(card.c), v=card.v)
+
+    def apply_card_id(self, card_id: int) -> int:
+        """
+        Image of a card identifier (cf. :meth:`Configuration.card_id`).
+
+        :param card_id: the identifier of a card.
+
+        :return: the identifier of the image card.
+
+        >>> cfg = Configuration.STANDARD
+        >>> ColorPermutation(cfg, [1, 0, 2, 3, 4]).apply_card_id(2)
+        7
+        """
+        i_c, i_v = divmod(card_id, self.cfg.n_values)
+        return int(self.image[i_c]) * self.cfg.n_values + i_v
+
+    def apply_clue(self, clue: Clue) -> Clue:
+        """
+        Image of a clue.
+
+        :param clue: a clue.
+
+        :return: the image clue (the same object for a value clue).
+        """
+        if clue.category == Clue.VALUE:
+            return clue
+        return Clue(self.apply_c(clue.x))
+
+    def apply_action(self, action: Action) -> Action:
+        """
+        Image of an action.
+
+        Only color clues are modified: the positions of the cards and the
+        players are unchanged.
+
+        :param action: an action.
+
+        :return: the image action (the same object if it is not a color
+            clue).
+
+        >>> from hanabython import Colors
+        >>> cfg = Configuration.STANDARD
+        >>> permutation = ColorPermutation(cfg, [1, 0, 2, 3, 4])
+        >>> action = ActionClue(i=1, clue=Clue(Colors.BLUE))
+        >>> print(permutation.apply_action(action))
+        Clue G to player in relative position 1
+        """
+        if action.category == Action.CLUE and (
+                action.clue.category == Clue.COLOR):
+            return ActionClue(i=action.i, clue=self.apply_clue(action.clue))
+        return action
+
+    @staticmethod
+    def symmetry_classes(cfg: Configuration) -> List[List[int]]:
+        """
+        Classes of interchangeable colors.
+
+        :param cfg: the configuration of the game.
+
+        :return: the list of classes with at least two colors. Each class is
+            the sorted list of the indexes of normal colors that have the
+            same contents in the deck.
+
+        >>> ColorPermutation.symmetry_classes(Configuration.STANDARD)
+        [[0, 1, 2, 3, 4]]
+        >>> ColorPermutation.symmetry_classes(Configuration.W_MULTICOLOR)
+        [[0, 1, 2, 3, 4]]
+        >>> ColorPermutation.symmetry_classes(Configuration.W_SIXTH_SHORT)
+        [[0, 1, 2, 3, 4]]
+        """
+        classes = {}
+        for i, c in enumerate(cfg.colors):
+            if type(c) is Color:
+                classes.setdefault(tuple(cfg.deck[c]), []).append(i)
+        return [members for members in classes.values() if len(members) > 1]
+
+    @classmethod
+    def _canonical(cls, cfg: Configuration,
+                   signatures: List[tuple]) -> 'ColorPermutation':
+        """
+        Sort each class of interchangeable colors by signature.
+
+        :param cfg: the configuration of the game.
+        :param signatures: for each color index, a tuple gathering everything
+            that depends on this color in the state. Two colors with the same
+            signature can be swapped without modifying the state, hence the
+            result does not depend on how ties are broken.
+
+        :return: the canonical permutation.
+        """
+        image = list(range(cfg.n_colors))
+        for members in cls.symmetry_classes(cfg):
+            ordered = sorted(members, key=lambda i: signatures[i])
+            for i, j in zip(ordered, members):
+                image[i] = j
+        return ColorPermutation(cfg, image)
+
+    @classmethod
+    def canonical_for_player(cls, player: 'PlayerBase') -> 'ColorPermutation':
+        """
+        Canonical permutation for the view of a player.
+
+        :param player: a player (cf. :class:`PlayerBase`).
+
+        :return: a permutation such that two views that are equivalent up to
+            a permutation of interchangeable colors have the same key
+            :meth:`PlayerBase.view_key` after applying their respective
+            canonical permutations. To translate an action decided in the
+            canonical view into the actual game, use the inverse permutation.
+
+        >>> from hanabython import PlayerBase
+        >>> antoine = PlayerBase('Antoine')
+        >>> antoine.demo_game()
+        >>> print(ColorPermutation.canonical_for_player(antoine))
+        BGRWY -> BGWYR
+
+        With joint knowledge (cf. :attr:`CardPublic.can_be`), the rows of the
+        colors are part of their signatures. Here, the partner holds R2 W1 W1
+        G3 W3: blue and yellow are interchangeable, so excluding B1 or Y1
+        gives equivalent views:
+
+        >>> from hanabython import Game
+        >>> class PlayerJoint(PlayerBase):
+        ...     joint_knowledge = True
+        >>> def canonical_key(i_excluded):
+        ...     players = [PlayerJoint('Antoine'), PlayerJoint('Donald X')]
+        ...     Game(players, seed=1).start()
+        ...     player = players[0]
+        ...     player.hands_public[0][0].can_be[i_excluded, 0] = False
+        ...     return player.view_key(
+        ...         ColorPermutation.canonical_for_player(player))
+        >>> canonical_key(0) == canonical_key(4)
+        True
+        """
+        cfg = player.cfg
+        altitude = player.board.altitude
+        discards = np.asarray(player.discard_pile.array)
+        hands = [[(cfg.i_from_c(card.c), card.v) for card in hand]
+                 for hand in player.hands]
+        signatures = []
+        for i in range(cfg.n_colors):
+            signature = [altitude[i], tuple(discards[i])]
+            for hand in hands:
+                signature.append(tuple(v if i_c == i else 0
+                                       for i_c, v in hand))
+            for hand_public in player.hands_public:
+                signature.append(tuple(
+                    (card.can_be_c[i], card.yes_clued_c[i])
+                    + (tuple(card.can_be[i]) if card.joint else ())
+                    for card in hand_public))
+            signatures.append(tuple(signature))
+        return cls._canonical(cfg, signatures)
+
+    @classmethod
+    def canonical_for_game(cls, game: 'Game') -> 'ColorPermutation':
+        """
+        Canonical permutation for the state of a game.
+
+        :param game: a game.
+
+        :return: a permutation such that two games that are equivalent up to
+            a permutation of interchangeable colors have the same
+            serialization :meth:`Game.to_bytes` after applying their
+            respective canonical permutations.
+
+        >>> from hanabython import Game, PlayerRandom
+        >>> players = [PlayerRandom('Antoine', seed=0),
+        ...            PlayerRandom('Donald X', seed=1)]
+        >>> game = Game(players, seed=0)
+        >>> game.start()
+        >>> permutation = ColorPermutation.canonical_for_game(game)
+        >>> print(permutation)
+        BGRWY -> WGRBY
+
+        An equivalent game has the same canonical serialization:
+
+        >>> swap = ColorPermutation(game.cfg, [1, 0, 2, 4, 3])
+        >>> other_game = Game.from_bytes(game.to_bytes(swap), players)
+        >>> print(game.hands[0], '|', other_game.hands[0])
+        G5 W1 G3 R3 R2 | B5 Y1 B3 R3 R2
+        >>> other_permutation = ColorPermutation.canonical_for_game(other_game)
+        >>> (game.to_bytes(permutation)
+        ...  == other_game.to_bytes(other_permutation))
+        True
+
+        This holds even when the interchangeable colors differ only by the
+        order of their discards:
+
+        >>> from hanabython import Card, Colors
+        >>> def is_kept(card):
+        ...     return card.c not in {Colors.BLUE, Colors.YELLOW}
+        >>> game.draw_pile[:] = [c for c in game.draw_pile if is_kept(c)]
+        >>> for hand in game.hands:
+        ...     hand[:] = [c for c in hand if is_kept(c)]
+        >>> for s in ['B1', 'Y1']:
+        ...     game.discard_pile.receive(Card(s))
+        >>> swap = ColorPermutation(game.cfg, [4, 1, 2, 3, 0])
+        >>> other_game = Game.from_bytes(game.to_bytes(swap), players)
+        >>> print(other_game.discard_pile.chronological)
+        [<Card: Y1>, <Card: B1>]
+        >>> (game.to_bytes(ColorPermutation.canonical_for_game(game))
+        ...  == other_game.to_bytes(
+        ...      ColorPermutation.canonical_for_game(other_game)))
+        True
+        """
+        cfg = game.cfg
+        altitude = game.board.altitude
+        discards = np.asarray(game.discard_pile.array)
+        # The discard pile is serialized in chronological order, hence the
+        # positions of the discards of each color are part of its signature.
+        piles = [[(cfg.i_from_c(card.c), card.v) for card in cards]
+                 for cards in ([game.draw_pile] + game.hands
+                               + [game.discard_pile.chronological])]
+        signatures = []
+        for i in range(cfg.n_colors):
+            signature = [altitude[i], tuple(discards[i])]
+            for cards in piles:
+                signature.append(tuple(v if i_c == i else 0
+                                       for i_c, v in cards))
+            signatures.append(tuple(signature))
+        return cls._canonical(cfg, signatures)
+
+
+if __name__ == '__main__':
+    from hanabython.Modules.PlayerBase import PlayerBase
+    my_player = PlayerBase('Antoine')
+    my_player.demo_game()
+    my_permutation = ColorPermutation.canonical_for_player(my_player)
+    my_permutation.test_str()
+
+    import doctest
+    doctest.testmod()
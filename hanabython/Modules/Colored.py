@@ -38,6 +38,10 @@ class Colored:
     '<MyClass: some text>'
     """
 
+    # No instance dictionary is imposed by this class, so that subclasses
+    # can use ``__slots__`` (e.g. :class:`GameEvent`).
+    __slots__ = ()
+
     def __repr__(self) -> str:
         return '<%s: %s>' % (self.__class__.__name__, self)
 
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+from math import sqrt
+from statistics import NormalDist
+from typing import Callable, List, Tuple
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.Configuration import Configuration
+from hanabython.Modules.Game import Game
+from hanabython.Modules.Player import Player
+from hanabython.Modules.ProcessUtils import worker_pool
+
+# Parameters of the comparison, set in each worker process by _init_worker.
+_worker_parameters = {}
+
+
+class Comparison(Colored):
+    """
+    Compare several sets of players with common random numbers.
+
+    Each candidate (i.e. each set of players) plays the same sequence of
+    games: for a given seed, all candidates play with the same shuffled
+    :class:`DrawPile`. Hence the score differences between candidates are
+    due to their strategies rather than to the luck of the deck, which makes
+    the comparison much more precise than with independent games.
+
+    The games are played in parallel, by chunks of consecutive seeds. For
+    each candidate, the comparison reports the mean of the paired differences
+    with the first candidate (the reference), with a confidence interval.
+
+    :param candidates: a list of functions. Each function takes a seed as
+        argument and returns a list of players (a new list each time). The
+        seed is the one of the game, so that the function can use it to
+        initialize the random generators of the players. When the start
+        method of the worker processes is not `fork` (e.g. under Windows), the
+        functions must be picklable, i.e. defined at the top level of a
+        module.
+    :param cfg: the configuration.
+    :param names: the names of the candidates. By default, 'Candidate 0',
+        'Candidate 1', etc.
+    :param n_workers: the number of worker processes. If None, the number of
+        CPUs is used. If 0, the games are played in this process.
+    :param chunk_size: the number of seeds in each chunk.
+    :param confidence: the confidence level of the intervals.
+    :param first_seed: the seed of the first game. Game `g` uses seed
+        ``first_seed + g``.
+    :param trusted: whether the players are trusted, cf. :class:`Game`. This
+        is faster, but a player that modifies the objects of the game
+        (configuration, cards, clues) silently corrupts it, and with it the
+        comparison. Hence it should only be used with players that are known
+        not to do so.
+
+    :var int n_games: the number of games played by each candidate so far.
+    :var list sum_scores: for each candidate, the sum of its scores.
+    :var list sum_differences: for each candidate, the sum of the
+        differences between its score and the score of the reference.
+    :var list sum_squared_differences: for each candidate, the sum of the
+        squares of these differences.
+
+    >>> from hanabython import PlayerRandom
+    >>> def cautious(seed):
+    ...     return [PlayerRandom('Player %s' % i, seed=2 * seed + i,
+    ...                          cautious=True)
+    ...             for i in range(2)]
+    >>> def reckless(seed):
+    ...     return [PlayerRandom('Player %s' % i, seed=2 * seed + i)
+    ...             for i in range(2)]
+    >>> comparison = Comparison([cautious, reckless],
+    ...                         names=['Cautious', 'Reckless'], n_workers=2,
+    ...                         chunk_size=50)
+    >>> comparison.run(precision=0.3, max_games=1000)
+    >>> comparison.n_games
+    100
+    >>> print(comparison)
+    Games played: 100 (seeds 0 to 99).
+    Cautious: mean score 2.54 (reference).
+    Reckless: mean score 0.00, difference -2.54 +/- 0.28 (95% confidence).
+
+    Before any game:
+
+    >>> print(Comparison([cautious, reckless], names=['Cautious', 'Reckless']))
+    Games played: 0.
+    Cautious: mean score 0.00 (reference).
+    Reckless: mean score 0.00, difference +0.00 +/- inf (95% confidence).
+    """
+
+    def __init__(self, candidates: List[Callable[[int], List[Player]]],
+                 cfg: Configuration = Configuration.STANDARD,
+                 names: List[str] = None, n_workers: int = None,
+                 chunk_size: int = 100, confidence: float = 0.95,
+                 first_seed: int = 0, trusted: bool = False):
+        self.candidates = candidates
+        self.cfg = cfg
+        if names is None:
+            names = ['Candidate %s' % i for i in range(len(candidates))]
+        self.names = names
+        self.n_workers = os.cpu_count() if n_workers is None else n_workers
+        self.chunk_size = chunk_size
+        self.confidence = confidence
+        self.first_seed = first_seed
+        self.trusted = trusted
+        self.n_games = 0                                    # type: int
+        self.sum_scores = [0] * len(candidates)             # type: List[int]
+        self.sum_differences = [0] * len(candidates)        # type: List[int]
+        self.sum_squared_differences = [
+            0] * len(candidates)                            # type: List[int]
+
+    def colored(self) -> str:
+        if self.n_games:
+            lines = ['Games played: %s (seeds %s to %s).' % (
+                self.n_games, self.first_seed,
+                self.first_seed + self.n_games - 1)]
+        else:
+            lines = ['Games played: 0.']
+        for i, name in enumerate(self.names):
+            line = '%s: mean score %.2f' % (name, self.mean_score(i))
+            if i == 0:
+                line += ' (reference).'
+            else:
+                mean, half_width = self.difference(i)
+                line += ', difference %+.2f +/- %.2f (%g%% confidence).' % (
+                    mean, half_width, 100 * self.confidence)
+            lines.append(line)
+        return '\n'.join(lines)
+
+    def mean_score(self, i: int) -> float:
+        """
+        Mean score of a candidate.
+
+        :param i: the index of the candidate.
+
+        :return: the mean score (0 if no game was played).
+        """
+        return self.sum_scores[i] / self.n_games if self.n_games else 0.
+
+    def difference(self, i: int) -> Tuple[float, float]:
+        """
+        Paired difference between a candidate and the reference.
+
+        :param i: the index of the candidate.
+
+        :return: a tuple (mean, half-width). The mean is the mean of the score
+            differences between candidate `i` and candidate 0. The confidence
+            interval is [mean - half-width, mean + half-width] (normal
+            approximation). If no game was played, the mean is 0 and the
+            half-width is infinite.
+        """
+        n = self.n_games
+        mean = self.sum_differences[i] / n if n else 0.
+        if n < 2:
+            return mean, float('inf')
+        variance = max(
+            (self.sum_squared_differences[i] - n * mean ** 2) / (n - 1), 0)
+        z = NormalDist().inv_cdf((1 + self.confidence) / 2)
+        return mean, z * sqrt(variance / n)
+
+    def precision_reached(self, precision: float) -> bool:
+        """
+        Whether all the confidence intervals are narrow enough.
+
+        :param precision: the maximal half-width of the intervals.
+
+        :return: True iff the half-width of the interval of the difference is
+            at most `precision` for all the candidates (except the reference).
+        """
+        return all(self.difference(i)[1] <= precision
+                   for i in range(1, len(self.candidates)))
+
+    def add(self, scores: List[Tuple[int, ...]]) -> None:
+        """
+        Add the results of some games.
+
+        :param scores: a list of tuples. Each tuple contains the scores of
+            all candidates in one game.
+        """
+        for game_scores in scores:
+            reference = game_scores[0]
+            for i, score in enumerate(game_scores):
+                self.sum_scores[i] += score
+                self.sum_differences[i] += score - reference
+                self.sum_squared_differences[i] += (score - reference) ** 2
+        self.n_games += len(scores)
+
+    def run(self, precision: float = None, max_games: int = 10000) -> None:
+        """
+        Play games.
+
+        The games are played by chunks. The results are added in the order of
+        the seeds, so that they do not depend on the number of workers.
+
+        :param precision: if not None, stop as soon as the half-width of all
+            the confidence intervals is at most `precision` (checked after
+            each chunk).
+        :param max_games: the maximal number of games played by each candidate
+            during this call.
+        """
+        first_seed = self.first_seed + self.n_games
+        chunks = [
+            (seed, min(self.chunk_size, first_seed + max_games - seed))
+            for seed in range(first_seed, first_seed + max_games,
+                              self.chunk_size)
+        ]
+        parameters = (self.candidates, self.cfg, self.trusted)
+        if self.n_workers == 0:
+            _init_worker(*parameters)
+            results = map(_play_chunk, chunks)
+            self._add_until_precision(results, precision)
+            return
+        with worker_pool(self.n_workers, _init_worker, parameters) as pool:
+            results = pool.imap(_play_chunk, chunks)
+            self._add_until_precision(results, precision)
+
+    def _add_until_precision(self, results, precision: float) -> None:
+        for scores in results:
+            self.add(scores)
+            if precision is not None and self.precision_reached(precision):
+                break
+
+
+def _init_worker(candidates: List[Callable[[int], List[Player]]],
+                 cfg: Configuration, trusted: bool) -> None:
+    """
+    Initialize the parameters of the comparison in a worker process.
+
+    :param candidates: the functions that create the players.
+    :param cfg: the configuration.
+    :param trusted: whether the players are trusted.
+    """
+    _worker_parameters['candidates'] = candidates
+    _worker_parameters['cfg'] = cfg
+    _worker_parameters['trusted'] = trusted
+
+
+def _play_chunk(chunk: Tuple[int, int]) -> List[Tuple[int, ...]]:
+    """
+    Play a chunk of games for all the candidates.
+
+    :param chunk: a tuple (first seed, number of games).
+
+    :return: a list of tuples. Each tuple contains the scores of all
+        candidates for one seed.
+    """
+    candidates = _worker_parameters['candidates']
+    cfg = _worker_parameters['cfg']
+    trusted = _worker_parameters['trusted']
+    first_seed, n_games = chunk
+    return [
+        tuple(Game(make_players(seed), cfg, seed=seed, trusted=trusted).play()
+              for make_players in candidates)
+        for seed in range(first_seed, first_seed + n_games)
+    ]
+
+
+if __name__ == '__main__':
+    from hanabython.Modules.PlayerRandom import PlayerRandom
+
+    def my_cautious(seed):
+        return [PlayerRandom('Player %s' % i, seed=3 * seed + i,
+                             cautious=True)
+                for i in range(3)]
+
+    def my_reckless(seed):
+        return [PlayerRandom('Player %s' % i, seed=3 * seed + i)
+                for i in range(3)]
+
+    my_comparison = Comparison([my_cautious, my_reckless],
+                               names=['Cautious', 'Reckless'])
+    my_comparison.run(precision=0.2)
+    my_comparison.test_str()
+
+    import doctest
+    doctest.testmod()
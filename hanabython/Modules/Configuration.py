@@ -19,8 +19,10 @@ This file is part of Hanabython.
     along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
 """
 import numpy as np
+from hashlib import blake2b
 from typing import List, Dict
 from collections import OrderedDict
+from hanabython.Modules.Card import Card
 from hanabython.Modules.Colored import Colored
 from hanabython.Modules.Color import Color
 from hanabython.Modules.Colors import Colors
@@ -66,6 +68,13 @@ class Configuration(Colored):
         standard configuration).
     :var int max_score: the maximum possible score (25 in the standard
         configuration).
+    :var np.array color_match_array: a numpy array of booleans of size
+        :attr:`n_colors` * :attr:`n_colors`. The coefficient ``[i, j]`` is True
+        iff a card of the `i`-th color matches a clue of the `j`-th color (cf.
+        :meth:`Color.match`).
+    :var bytes fingerprint: a short digest (8 bytes) of the name, the
+        contents of the deck and the rules, which identifies the configuration
+        (e.g. in :meth:`PlayerBase.view_key`).
 
     >>> cfg = Configuration.W_MULTICOLOR_SHORT
     >>> print(cfg.name)
@@ -157,6 +166,15 @@ class Configuration(Colored):
         ])                                                  # type: np.array
         self.n_cards = np.sum(self.deck_array)              # type: int
         self.max_score = sum(self.highest.values())         # type: int
+        self.color_match_array = np.array([
+            [c.match(x) for x in self.colors] for c in self.colors
+        ], dtype=bool)                                      # type: np.array
+        self.fingerprint = blake2b(repr((
+            name,
+            [(type(c).__name__, c.name, list(contents))
+             for c, contents in deck.items()],
+            n_clues, n_misfires, hand_size_rule, empty_clue_rule, end_rule
+        )).encode(), digest_size=8).digest()                # type: bytes
         # Conversion
         self._i_from_c_name = {
             c.name: i for i, c in enumerate(self.colors)
@@ -172,6 +190,39 @@ class Configuration(Colored):
                self.hand_size_rule, self.empty_clue_rule, self.end_rule)
         )
 
+    def __reduce_ex__(self, protocol):
+        if self.is_registered:
+            return Configuration.from_name, (self.name, )
+        return Configuration, (
+            self.deck, self.n_clues, self.n_misfires, self.hand_size_rule,
+            self.empty_clue_rule, self.end_rule, self.name)
+
+    def __copy__(self) -> 'Configuration':
+        cfg = Configuration.__new__(Configuration)
+        cfg.__dict__.update(self.__dict__)
+        return cfg
+
+    @property
+    def is_registered(self) -> bool:
+        """
+        Whether the configuration is registered (cf. :meth:`register`).
+
+        :return: True if this configuration is registered, or if it is a
+            (shallow) copy of a registered configuration.
+
+        >>> from copy import copy
+        >>> copy(Configuration.STANDARD).is_registered
+        True
+        >>> Configuration(name='standard').is_registered
+        False
+        """
+        registered = Configuration._registry.get(self.name)
+        if registered is None:
+            return False
+        return registered is self or all(
+            value is registered.__dict__.get(key)
+            for key, value in self.__dict__.items())
+
     def colored(self) -> str:
         return '\n'.join([
             'Deck: %s.' % self.deck.colored(),
@@ -208,6 +259,90 @@ class Configuration(Colored):
         """
         return v - 1
 
+    @property
+    def n_card_ids(self) -> int:
+        """
+        Number of card identifiers, cf. :meth:`card_id`.
+
+        >>> Configuration.STANDARD.n_card_ids
+        25
+        """
+        return self.n_colors * self.n_values
+
+    def card_id(self, card: Card) -> int:
+        """
+        Identifier of a card, as an integer.
+
+        :param card: a card.
+
+        :return: the identifier, between 0 and :attr:`n_card_ids` - 1. Cards
+            are numbered by color, then by value: ``i_c * n_values + i_v``,
+            where ``i_c`` and ``i_v`` are the indexes of the color and the
+            value.
+
+        >>> Configuration.STANDARD.card_id(Card('G3'))
+        7
+        """
+        return self.i_from_c(card.c) * self.n_values + self.i_from_v(card.v)
+
+    def card_from_id(self, card_id: int) -> Card:
+        """
+        Card corresponding to an identifier, cf. :meth:`card_id`.
+
+        :param card_id: the identifier.
+
+        :return: a new card.
+
+        >>> print(Configuration.STANDARD.card_from_id(7))
+        G3
+        """
+        i_c, i_v = divmod(card_id, self.n_values)
+        return Card(c=self.colors[i_c], v=self.values[i_v])
+
+    @classmethod
+    def register(cls, cfg: 'Configuration') -> None:
+        """
+        Register a configuration under its name.
+
+        A registered configuration is pickled as a reference to its name (cf.
+        :meth:`from_name`), which is compact and does not require the
+        configuration itself to be picklable. The presets like
+        :attr:`STANDARD` are registered.
+
+        :param cfg: a configuration, which must have a name.
+
+        :raise ValueError: if the configuration has no name, or if another
+            configuration is registered with this name.
+
+        >>> import pickle
+        >>> cfg = Configuration(n_clues=6, name='six clues')
+        >>> Configuration.register(cfg)
+        >>> pickle.loads(pickle.dumps(cfg)) is cfg
+        True
+        """
+        if cfg.name is None:
+            raise ValueError('Cannot register a configuration with no name.')
+        if cls._registry.setdefault(cfg.name, cfg) is not cfg:
+            raise ValueError('Another configuration is registered as %r.'
+                             % cfg.name)
+
+    @classmethod
+    def from_name(cls, name: str) -> 'Configuration':
+        """
+        Find a registered configuration from its name.
+
+        :param name: the name of the configuration.
+
+        :return: the configuration.
+
+        >>> Configuration.from_name('standard') is Configuration.STANDARD
+        True
+        """
+        return cls._registry[name]
+
+    # Registered configurations, by name.
+    _registry = {}                          # type: Dict[str, Configuration]
+
     #:
     STANDARD = None
     #:
@@ -238,6 +373,10 @@ Configuration.W_MULTICOLOR_SHORT = Configuration(
 Configuration.EIGHT_COLORS = Configuration(
     deck=ConfigurationDeck.EIGHT_COLORS,
     name=ConfigurationDeck.EIGHT_COLORS.name)
+for _cfg in [Configuration.STANDARD, Configuration.W_SIXTH,
+             Configuration.W_SIXTH_SHORT, Configuration.W_MULTICOLOR,
+             Configuration.W_MULTICOLOR_SHORT, Configuration.EIGHT_COLORS]:
+    Configuration.register(_cfg)
 
 
 if __name__ == '__main__':
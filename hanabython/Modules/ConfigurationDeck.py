@@ -67,6 +67,9 @@ class ConfigurationDeck(Colored, OrderedDict):
         super(ConfigurationDeck, self).__init__(contents)
         self.name = name
 
+    def __reduce_ex__(self, protocol):
+        return ConfigurationDeck, (list(self.items()), self.name)
+
     def colored(self) -> str:
         if self.name is None:
             return ', '.join([
@@ -38,12 +38,27 @@ class ConfigurationHandSize(Colored):
     >>> cfg = ConfigurationHandSize(f=lambda n: 9 - n)
     >>> print(cfg)
     7 for 2p, 6 for 3p, 5 for 4p, 4 for 5p
+
+    The presets can be pickled:
+
+    >>> import pickle
+    >>> rule = pickle.loads(pickle.dumps(ConfigurationHandSize.VARIANT_6_3))
+    >>> rule is ConfigurationHandSize.VARIANT_6_3
+    True
     """
 
     def __init__(self, f: Callable[[int], int], name: str = None):
         self.f = f
         self.name = name
 
+    def __reduce_ex__(self, protocol):
+        # The presets are pickled by reference, because their functions are
+        # lambdas, which cannot be pickled.
+        for attribute in ['NORMAL', 'VARIANT_6_3']:
+            if getattr(ConfigurationHandSize, attribute) is self:
+                return getattr, (ConfigurationHandSize, attribute)
+        return super().__reduce_ex__(protocol)
+
     def colored(self) -> str:
         if self.name is None:
             return ', '.join([
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Hashable
+from hanabython.Modules.Action import Action
+from hanabython.Modules.ColorPermutation import ColorPermutation
+from hanabython.Modules.Colored import Colored
+
+
+class DecisionCache(Colored):
+    """
+    A cache of decisions, with bounded size and LRU eviction.
+
+    The keys are typically given by :meth:`PlayerBase.view_key` and the
+    values are actions. When the cache is full, the least recently used
+    entry is evicted.
+
+    :param max_size: the maximal number of entries.
+    :param canonical: if True, :func:`cached_decision` shares the entries
+        between views that are equivalent up to a permutation of
+        interchangeable colors (cf. :class:`ColorPermutation`). This is
+        correct only for a policy that is itself invariant under such
+        permutations.
+
+    :var int n_hits: the number of successful lookups.
+    :var int n_misses: the number of unsuccessful lookups.
+
+    >>> cache = DecisionCache(max_size=2)
+    >>> cache.put(b'a', 'throw')
+    >>> cache.put(b'b', 'play')
+    >>> cache.get(b'a')
+    'throw'
+    >>> cache.put(b'c', 'clue')
+    >>> print(cache.get(b'b'))
+    None
+    >>> print(cache)
+    Decision cache: 2 entries, 1 hits, 1 misses (hit rate 50.0%).
+    """
+
+    def __init__(self, max_size: int = 100000, canonical: bool = False):
+        self.max_size = max_size
+        self.canonical = canonical
+        self.n_hits = 0                                     # type: int
+        self.n_misses = 0                                   # type: int
+        self._entries = OrderedDict()                       # type: OrderedDict
+
+    def colored(self) -> str:
+        return ('Decision cache: %s entries, %s hits, %s misses '
+                '(hit rate %.1f%%).' % (len(self), self.n_hits,
+                                        self.n_misses, 100 * self.hit_rate))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Proportion of successful lookups.
+
+        :return: the hit rate, between 0 and 1 (0 if there was no lookup).
+        """
+        n_lookups = self.n_hits + self.n_misses
+        return self.n_hits / n_lookups if n_lookups else 0.
+
+    def get(self, key: Hashable) -> object:
+        """
+        Look up a decision.
+
+        :param key: the key.
+
+        :return: the value stored for this key (which becomes the most
+            recently used), or None if there is none.
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.n_misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.n_hits += 1
+        return value
+
+    def put(self, key: Hashable, value: object) -> None:
+        """
+        Store a decision.
+
+        :param key: the key.
+        :param value: the value (not None).
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove all the entries and reset the statistics.
+        """
+        self._entries.clear()
+        self.n_hits = 0
+        self.n_misses = 0
+
+
+def cached_decision(method: Callable[[object], Action]) -> Callable:
+    """
+    Decorator for the method :meth:`Player.choose_action` of a subclass of
+    :class:`PlayerBase`.
+
+    If the attribute ``decision_cache`` of the player is a
+    :class:`DecisionCache`, the action is looked up there with the key
+    :meth:`PlayerBase.view_key`, and computed only if it is not found. This is
+    correct only for a deterministic player whose decision depends only on
+    its view (not on its past observations nor on a random generator).
+    The actions returned by the cache are shared: they must not be modified.
+    A cache must be shared only between players that use the same policy.
+
+    :param method: the method ``choose_action``.
+
+    :return: the method with a cache.
+
+    >>> from hanabython import (ActionClue, ActionThrow, Clue, Game,
+    ...                         PlayerBase)
+    >>> class PlayerDiscarder(PlayerBase):
+    ...     @cached_decision
+    ...     def choose_action(self):
+    ...         if self.n_clues < self.cfg.n_clues:
+    ...             return ActionThrow(len(self.hands_public[0]) - 1)
+    ...         return ActionClue(1, Clue(self.hands[1][0].v))
+    >>> cache = DecisionCache()
+    >>> for _ in range(2):
+    ...     players = [PlayerDiscarder('Antoine'), PlayerDiscarder('Donald X')]
+    ...     for player in players:
+    ...         player.decision_cache = cache
+    ...     _ = Game(players, seed=0).play()
+    >>> cache.hit_rate
+    0.5
+
+    With a canonical cache, a game where the blue and green cards are swapped
+    also benefits from the decisions taken in the original game:
+
+    >>> from hanabython import ColorPermutation, Configuration
+    >>> identity = ColorPermutation(Configuration.STANDARD)
+    >>> swap = ColorPermutation(Configuration.STANDARD, [1, 0, 2, 3, 4])
+    >>> for canonical in [False, True]:
+    ...     cache = DecisionCache(canonical=canonical)
+    ...     for permutation in [identity, swap]:
+    ...         players = [PlayerDiscarder('Antoine'),
+    ...                    PlayerDiscarder('Donald X')]
+    ...         for player in players:
+    ...             player.decision_cache = cache
+    ...         game = Game(players, seed=0)
+    ...         game.draw_pile[:] = [permutation.apply_card(card)
+    ...                              for card in game.draw_pile]
+    ...         _ = game.play()
+    ...     print(cache.hit_rate)
+    0.0
+    0.5
+    """
+    @wraps(method)
+    def wrapper(self) -> Action:
+        cache = self.decision_cache
+        if cache is None:
+            return method(self)
+        if not cache.canonical:
+            key = self.view_key()
+            action = cache.get(key)
+            if action is None:
+                action = method(self)
+                cache.put(key, action)
+            return action
+        permutation = ColorPermutation.canonical_for_player(self)
+        key = self.view_key(permutation)
+        action = cache.get(key)
+        if action is None:
+            action = method(self)
+            cache.put(key, permutation.apply_action(action))
+            return action
+        return permutation.inverse().apply_action(action)
+    return wrapper
+
+
+if __name__ == '__main__':
+    my_cache = DecisionCache(max_size=2)
+    my_cache.put(b'a', 'throw')
+    my_cache.get(b'a')
+    my_cache.get(b'b')
+    my_cache.test_str()
+
+    import doctest
+    doctest.testmod()
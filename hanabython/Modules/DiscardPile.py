@@ -21,7 +21,8 @@ This file is part of Hanabython.
 from typing import List
 import numpy as np
 from hanabython.Modules.Colored import Colored
-from hanabython.Modules.StringUtils import uncolor, str_from_iterable
+from hanabython.Modules.StringUtils import uncolor, str_from_iterable, \
+    cached_rendering
 from hanabython.Modules.Configuration import Configuration
 from hanabython.Modules.Card import Card
 
@@ -31,6 +32,9 @@ class DiscardPile(Colored):
     The discard pile in a game of Hanabi.
 
     :param cfg: the configuration of the game.
+    :param backend: 'numpy' or 'python'. With 'python', :attr:`array`,
+        :attr:`not_discarded` and :attr:`scorable` are lists of lists, which is
+        faster for such small arrays. If None, :attr:`DEFAULT_BACKEND` is used.
 
     :var list chronological: a list a cards discarded, by chronological order.
     :var np.array array: each row represents a color, each column a card value.
@@ -46,6 +50,11 @@ class DiscardPile(Colored):
         board or not). For example, if the two G4's are discarded, then G4 and
         G5 are not "scorable". Note that a 1 always is considered "scorable",
         whether it is on the board or not.
+    :var CardClassification classification: if not None, it is updated by
+        :meth:`receive` (cf. :class:`CardClassification`).
+
+    The colored representations are cached until the next card is received.
+    The variables above should be modified only with :meth:`receive`.
 
     >>> from hanabython import Configuration
     >>> discard_pile = DiscardPile(Configuration.STANDARD)
@@ -75,16 +84,46 @@ class DiscardPile(Colored):
      [ True  True False False]]
     >>> print(discard_pile.max_score_possible)
     6
+
+    The same with the Python backend:
+
+    >>> discard_pile = DiscardPile(Configuration(
+    ...     deck=ConfigurationDeck(contents=[
+    ...         (Colors.BLUE, ConfigurationColorContents([3, 2, 1, 1])),
+    ...         (Colors.RED, ConfigurationColorContents([2, 1])),
+    ...     ])
+    ... ), backend='python')
+    >>> print(discard_pile.not_discarded)
+    [[3, 2, 1, 1], [2, 1, 0, 0]]
+    >>> print(discard_pile.scorable)
+    [[True, True, True, True], [True, True, False, False]]
+    >>> print(discard_pile.max_score_possible)
+    6
     """
 
-    def __init__(self, cfg: Configuration):
+    #: Backend used when none is specified: 'numpy' or 'python'.
+    DEFAULT_BACKEND = 'numpy'
+
+    def __init__(self, cfg: Configuration, backend: str = None):
         self.cfg = cfg
+        self.backend = self.DEFAULT_BACKEND if backend is None else backend
         self.chronological = []
-        self.array = np.zeros(cfg.deck_array.shape, dtype=int)
-        self.not_discarded = np.copy(cfg.deck_array)
-        # This formula below is valid only at the beginning because there is no
-        # "holes" (zeros) in the middle of some rows.
-        self.scorable = (cfg.deck_array > 0)
+        if self.backend == 'numpy':
+            self.array = np.zeros(cfg.deck_array.shape, dtype=int)
+            self.not_discarded = np.copy(cfg.deck_array)
+            # This formula below is valid only at the beginning because there
+            # is no "holes" (zeros) in the middle of some rows.
+            self.scorable = (cfg.deck_array > 0)
+        elif self.backend == 'python':
+            self.array = [[0] * cfg.n_values for _ in cfg.colors]
+            self.not_discarded = cfg.deck_array.tolist()
+            self.scorable = [[n > 0 for n in row]
+                             for row in self.not_discarded]
+        else:
+            raise ValueError('Unknown backend: %s.' % self.backend)
+        self._max_score_possible = int(sum(map(sum, self.scorable)))
+        self._render_cache = {}
+        self.classification = None
 
     def __repr__(self) -> str:
         return '<DiscardPile: %s>' % self.str_compact_chronological()
@@ -97,9 +136,10 @@ class DiscardPile(Colored):
         """
         Maximum possible score, considering the discard pile.
 
-        :return: the maximum score that is still possible.
+        :return: the maximum score that is still possible. It is updated
+            incrementally by :meth:`receive`.
         """
-        return np.sum(self.scorable)
+        return self._max_score_possible
 
     def str_multi_line_compact(self) -> str:
         """
@@ -118,22 +158,36 @@ class DiscardPile(Colored):
         B1 B3
         R4
         """
-        return uncolor(self.colored_multi_line_compact())
+        return str(self)
 
+    @cached_rendering
     def colored_multi_line_compact(self) -> str:
         """
         Colored version of :meth:`str_multi_line_compact`.
         """
+        return self._multi_line_compact(colored=True)
+
+    @cached_rendering
+    def __str__(self) -> str:
+        return self._multi_line_compact(colored=False)
+
+    def _multi_line_compact(self, colored: bool) -> str:
+        """
+        Colored or plain version of :meth:`str_multi_line_compact`.
+
+        :param colored: whether to use ANSI escape codes.
+
+        :return: the string.
+        """
         if len(self.chronological) == 0:
             return 'No card discarded yet'
         lines = []
         for i, c in enumerate(self.cfg.colors):
-            if np.sum(self.array[i, :]) == 0:
+            values = self._values_discarded(i)
+            if not values:
                 continue
-            words = [str(Card(c, v))
-                     for j, v in enumerate(self.cfg.values)
-                     for _ in range(self.array[i, j])]
-            lines.append(c.color_str(' '.join(words)))
+            line = ' '.join([c.symbol + v for v in values])
+            lines.append(c.color_str(line) if colored else line)
         return '\n'.join(lines)
 
     def str_multi_line(self) -> str:
@@ -156,19 +210,18 @@ class DiscardPile(Colored):
         """
         return uncolor(self.colored_multi_line())
 
+    @cached_rendering
     def colored_multi_line(self) -> str:
         """
         Colored version of :meth:`str_multi_line`.
         """
         lines = []
         for i, c in enumerate(self.cfg.colors):
-            if np.sum(self.array[i, :]) == 0:
+            values = self._values_discarded(i)
+            if not values:
                 lines.append(c.color_str('-'))
                 continue
-            words = [str(Card(c, v))
-                     for j, v in enumerate(self.cfg.values)
-                     for _ in range(self.array[i, j])]
-            lines.append(c.color_str(' '.join(words)))
+            lines.append(c.color_str(' '.join([c.symbol + v for v in values])))
         return '\n'.join(lines)
 
     def str_as_array(self) -> str:
@@ -192,6 +245,7 @@ class DiscardPile(Colored):
         """
         return uncolor(self.colored_as_array())
 
+    @cached_rendering
     def colored_as_array(self) -> str:
         """
         Colored version of :meth:`str_as_array`.
@@ -201,7 +255,7 @@ class DiscardPile(Colored):
         ]
         for i, c in enumerate(self.cfg.colors):
             to_join.append(
-                c.color_str('%s %s' % (c.symbol, self.array[i, :]))
+                c.color_str('%s %s' % (c.symbol, np.array(self.array[i])))
             )
         return '\n'.join(to_join)
 
@@ -221,6 +275,7 @@ class DiscardPile(Colored):
         """
         return uncolor(self.colored_compact_factorized())
 
+    @cached_rendering
     def colored_compact_factorized(self) -> str:
         """
         Colored version of :meth:`str_multi_line_compact`.
@@ -229,14 +284,32 @@ class DiscardPile(Colored):
             return 'No card discarded yet'
         lines = []
         for i, c in enumerate(self.cfg.colors):
-            if np.sum(self.array[i, :]) == 0:
+            values = self._values_discarded(i)
+            if not values:
                 continue
-            words = [str(v)
-                     for j, v in enumerate(self.cfg.values)
-                     for _ in range(self.array[i, j])]
-            lines.append(c.color_str(c.symbol + ' ' + ' '.join(words)))
+            lines.append(c.color_str(c.symbol + ' ' + ' '.join(values)))
         return '  '.join(lines)
 
+    def _values_discarded(self, i: int) -> List[str]:
+        """
+        Values of the discarded cards in one color.
+
+        :param i: index of the color.
+
+        :return: the values, as strings, in increasing order and with
+            repetitions.
+
+        >>> from hanabython import Configuration
+        >>> discard_pile = DiscardPile(Configuration.STANDARD)
+        >>> for s in ['B3', 'R4', 'B1', 'B3']:
+        ...     discard_pile.receive(Card(s))
+        >>> discard_pile._values_discarded(0)
+        ['1', '3', '3']
+        """
+        row = self.array[i]
+        return [str(v) for j, v in enumerate(self.cfg.values)
+                for _ in range(row[j])]
+
     def str_compact_ordered(self) -> str:
         """
         Convert to string in a list-style layout, ordered by color and value.
@@ -253,6 +326,7 @@ class DiscardPile(Colored):
         """
         return uncolor(self.colored_compact_ordered())
 
+    @cached_rendering
     def colored_compact_ordered(self) -> str:
         """
         Colored version of :meth:`str_compact_ordered`.
@@ -278,6 +352,7 @@ class DiscardPile(Colored):
         """
         return uncolor(self.colored_compact_chronological())
 
+    @cached_rendering
     def colored_compact_chronological(self) -> str:
         """
         Colored version of :meth:`str_compact_chronological`.
@@ -306,7 +381,7 @@ class DiscardPile(Colored):
         ordered = []
         for i, c in enumerate(self.cfg.colors):
             for j, v in enumerate(self.cfg.values):
-                ordered.extend([Card(c, v)] * self.array[i, j])
+                ordered.extend([Card(c, v)] * self.array[i][j])
         return ordered
 
     def receive(self, card) -> None:
@@ -340,12 +415,19 @@ class DiscardPile(Colored):
         22
         """
         self.chronological.append(card)
+        self._render_cache.clear()
         i = self.cfg.i_from_c(card.c)
         j = self.cfg.i_from_v(card.v)
-        self.array[i, j] += 1
-        self.not_discarded[i, j] -= 1
-        if self.not_discarded[i, j] == 0:
-            self.scorable[i, j:] = False
+        self.array[i][j] += 1
+        self.not_discarded[i][j] -= 1
+        if self.not_discarded[i][j] == 0:
+            scorable = self.scorable[i]
+            for k in range(j, self.cfg.n_values):
+                if scorable[k]:
+                    scorable[k] = False
+                    self._max_score_possible -= 1
+        if self.classification is not None:
+            self.classification.card_discarded(i, j)
 
 
 if __name__ == '__main__':
@@ -18,9 +18,9 @@ This file is part of Hanabython.
     You should have received a copy of the GNU General Public License
     along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
 """
-from typing import Union
+from typing import List, Union
 from hanabython.Modules.Colored import Colored
-from random import shuffle
+from random import shuffle, Random
 from hanabython.Modules.Configuration import Configuration
 from hanabython.Modules.Card import Card
 
@@ -30,6 +30,14 @@ class DrawPile(Colored, list):
     The draw pile of a game of Hanabi.
 
     :param cfg: the configuration of the game.
+    :param seed: if None (default), the pile is shuffled with the global
+        random generator of module ``random``. Otherwise, it is shuffled with
+        a generator of its own, initialized with this seed: hence the order of
+        the cards depends only on the seed.
+    :param cards: if not None, the draw pile is made of these cards, in this
+        order, and it is not shuffled (parameter :attr:`seed` is then
+        ignored). This is used to restore a pile, e.g. in
+        :meth:`Game.from_bytes`.
 
     At initialization, the draw pile is generated with the parameters in
     :attr:`cfg`, then it is shuffled.
@@ -41,15 +49,34 @@ class DrawPile(Colored, list):
 
     >>> from hanabython import Configuration
     >>> draw_pile = DrawPile(Configuration.STANDARD)
+
+    With a seed:
+
+    >>> draw_pile = DrawPile(Configuration.STANDARD, seed=42)
+    >>> draw_pile_bis = DrawPile(Configuration.STANDARD, seed=42)
+    >>> str(draw_pile) == str(draw_pile_bis)
+    True
+
+    With given cards:
+
+    >>> print(DrawPile(Configuration.STANDARD, cards=draw_pile[:3]))
+    [R3, R2, G5]
     """
 
-    def __init__(self, cfg: Configuration):
+    def __init__(self, cfg: Configuration, seed: int = None,
+                 cards: List[Card] = None):
         super().__init__()
         self.cfg = cfg
+        if cards is not None:
+            self.extend(cards)
+            return
         for i, c in enumerate(cfg.colors):
             for j, v in enumerate(cfg.values):
                 self.extend([Card(c, v)] * cfg.deck[c][j])
-        shuffle(self)
+        if seed is None:
+            shuffle(self)
+        else:
+            Random(seed).shuffle(self)
 
     def colored(self) -> str:
         return '[' + ', '.join([card.colored() for card in self]) + ']'
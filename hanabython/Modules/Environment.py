@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import Tuple
+import numpy as np
+from hanabython.Modules.ActionSpace import ActionSpace
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.Configuration import Configuration
+from hanabython.Modules.Game import Game
+from hanabython.Modules.PlayerBase import PlayerBase
+
+
+class Environment(Colored):
+    """
+    A game of Hanabi seen as an environment for learning agents.
+
+    Instead of being called back by the :class:`Game` (like a :class:`Player`),
+    the agent drives the game: :meth:`reset` starts a new game and
+    :meth:`step` executes the action of the active player.
+
+    The active player is described by a vector of fixed size,
+    :attr:`observation`, that encodes everything that she knows (her
+    :class:`PlayerBase` variables), from her point of view:
+
+    * Cards in hands: for each player (by relative position) and each position
+      in the hand, a one-hot encoding of the card (color * value). The
+      active player's own cards are unknown, hence encoded as zeros.
+    * Knowledge about the cards in hands: for each player and each position in
+      the hand, :attr:`CardPublic.can_be_c`, :attr:`CardPublic.can_be_v`,
+      :attr:`CardPublic.yes_clued_c` and :attr:`CardPublic.yes_clued_v`.
+    * The altitudes of the :class:`Board`.
+    * The array of the :class:`DiscardPile`.
+    * The counters: number of clues, number of misfires, number of cards in
+      the draw pile, and number of remaining turns (-1 if the final countdown
+      has not started).
+
+    The legal actions are given by :attr:`legal_mask`, whose indexes are those
+    of :attr:`action_space`.
+
+    The arrays :attr:`observation` and :attr:`legal_mask` are allocated once
+    and for all, then overwritten at each step: copy them if you need to keep
+    them.
+
+    :param cfg: the configuration of the games.
+    :param n_players: the number of players.
+    :param observation: an array of float32 of size :attr:`observation_size`,
+        used to store the observation. If None, a new array is allocated.
+    :param legal_mask: an array of booleans of size
+        :attr:`ActionSpace.n_actions`, used to store the legal actions. If
+        None, a new array is allocated.
+
+    :var ActionSpace action_space: the possible actions.
+    :var int observation_size: the size of the observation vector.
+    :var Game game: the current game.
+    :var bool done: whether the current game is over.
+
+    >>> env = Environment(Configuration.STANDARD, n_players=2)
+    >>> env.observation_size, env.action_space.n_actions
+    (484, 20)
+    >>> observation, legal_mask = env.reset(seed=0)
+    >>> print(env.game.hands[1])
+    W1 R3 W1 B1 Y4
+    >>> observation[125:150].reshape(5, 5)
+    array([[0., 0., 0., 0., 0.],
+           [0., 0., 0., 0., 0.],
+           [0., 0., 0., 0., 0.],
+           [1., 0., 0., 0., 0.],
+           [0., 0., 0., 0., 0.]], dtype=float32)
+    >>> observation[-4:]
+    array([ 8.,  0., 40., -1.], dtype=float32)
+    >>> print(legal_mask[:10])
+    [False False False False False  True  True  True  True  True]
+    >>> print(legal_mask[10:])
+    [ True False  True  True  True  True False  True  True False]
+    >>> observation, legal_mask, reward, done = env.step(10)
+    >>> print(env.action_space.actions[10])
+    Clue B to player in relative position 1
+    >>> observation[-4:]
+    array([ 7.,  0., 40., -1.], dtype=float32)
+    >>> reward, done
+    (0.0, False)
+    """
+
+    def __init__(self, cfg: Configuration = Configuration.STANDARD,
+                 n_players: int = 2, observation: np.array = None,
+                 legal_mask: np.array = None):
+        self.cfg = cfg
+        self.n_players = n_players
+        self.action_space = ActionSpace(cfg, n_players)
+        self.hand_size = self.action_space.hand_size
+        n_c, n_v = cfg.n_colors, cfg.n_values
+        shape_cards = (n_players, self.hand_size, n_c, n_v)
+        shape_knowledge = (n_players, self.hand_size, 2 * (n_c + n_v))
+        shapes = [shape_cards, shape_knowledge, (n_c, ), (n_c, n_v), (4, )]
+        sizes = [int(np.prod(shape)) for shape in shapes]
+        self.observation_size = sum(sizes)                  # type: int
+        # Buffers
+        if observation is None:
+            observation = np.zeros(self.observation_size, dtype=np.float32)
+        if legal_mask is None:
+            legal_mask = np.zeros(self.action_space.n_actions, dtype=bool)
+        self.observation = observation                      # type: np.array
+        self.legal_mask = legal_mask                        # type: np.array
+        # Views on the observation buffer
+        views = []
+        begin = 0
+        for shape, size in zip(shapes, sizes):
+            views.append(self.observation[begin:begin + size].reshape(shape))
+            begin += size
+        (self._obs_cards, self._obs_knowledge, self._obs_board,
+         self._obs_discard, self._obs_counters) = views
+        # Game
+        self.game = None                                    # type: Game
+        self.done = True                                    # type: bool
+
+    def colored(self) -> str:
+        return '%s players, %s' % (self.n_players, self.cfg.colored())
+
+    @property
+    def active(self) -> PlayerBase:
+        """
+        The active player.
+
+        :return: the player whose point of view is given by
+            :attr:`observation`.
+        """
+        return self.game.active
+
+    def reset(self, seed: int = None) -> Tuple[np.array, np.array]:
+        """
+        Start a new game.
+
+        :param seed: the seed used to shuffle the draw pile. Cf.
+            :class:`DrawPile`.
+
+        :return: the tuple (:attr:`observation`, :attr:`legal_mask`), for the
+            first player.
+        """
+        players = [PlayerBase('Player %s' % (i + 1))
+                   for i in range(self.n_players)]
+        self.game = Game(players, self.cfg, seed=seed)
+        self.game.start()
+        self.game.begin_turn()
+        self.done = False
+        self._update()
+        return self.observation, self.legal_mask
+
+    def step(self, i_action: int) -> Tuple[np.array, np.array, float, bool]:
+        """
+        Execute an action of the active player.
+
+        :param i_action: the index of the action in :attr:`action_space`.
+            It must be legal.
+
+        :return: the tuple (:attr:`observation`, :attr:`legal_mask`, `reward`,
+            :attr:`done`). The observation and the mask are for the next
+            player. The reward is the variation of the score (if the game is
+            lost, the final score is 0, hence the reward is the opposite of the
+            score before this action).
+
+        >>> env = Environment(Configuration.STANDARD, n_players=2)
+        >>> _ = env.reset(seed=0)
+        >>> _ = env.step(0)
+        Traceback (most recent call last):
+        ValueError: Illegal action: Discard card in position 1
+
+        If the game rejects the action anyway (here, because the mask was
+        tampered with), the turn is not finished:
+
+        >>> env.legal_mask[0] = True
+        >>> _ = env.step(0)
+        Traceback (most recent call last):
+        ValueError: Illegal action: Discard card in position 1
+        >>> env.game.n_turns, env.game.n_clues
+        (0, 8)
+        """
+        if self.done:
+            raise RuntimeError('The game is over: call reset first.')
+        if not self.legal_mask[i_action]:
+            raise ValueError('Illegal action: %s'
+                             % self.action_space.actions[i_action])
+        score_before = self.game.board.score
+        action = self.action_space.actions[i_action]
+        if not self.game.execute_action(action):
+            raise ValueError('Illegal action: %s' % action)
+        final_score = self.game.finish_turn()
+        if final_score is None:
+            final_score = self.game.begin_turn()
+        if final_score is None:
+            reward = self.game.board.score - score_before
+        else:
+            reward = final_score - score_before
+            self.done = True
+        self._update()
+        return self.observation, self.legal_mask, float(reward), self.done
+
+    def _update(self) -> None:
+        """
+        Update :attr:`observation` and :attr:`legal_mask`.
+        """
+        player = self.game.active
+        n_c, n_v = self.cfg.n_colors, self.cfg.n_values
+        self.observation.fill(0)
+        for i in range(1, self.n_players):
+            for k, card in enumerate(player.hands[i]):
+                self._obs_cards[
+                    i, k, self.cfg.i_from_c(card.c), self.cfg.i_from_v(card.v)
+                ] = 1
+        for i, hand_public in enumerate(player.hands_public):
+            for k, card_public in enumerate(hand_public):
+                knowledge = self._obs_knowledge[i, k]
+                knowledge[:n_c] = card_public.can_be_c
+                knowledge[n_c:n_c + n_v] = card_public.can_be_v
+                knowledge[n_c + n_v:2 * n_c + n_v] = card_public.yes_clued_c
+                knowledge[2 * n_c + n_v:] = card_public.yes_clued_v
+        self._obs_board[:] = player.board.altitude
+        self._obs_discard[:] = player.discard_pile.array
+        self._obs_counters[0] = player.n_clues
+        self._obs_counters[1] = player.n_misfires
+        self._obs_counters[2] = player.draw_pile.n_cards
+        self._obs_counters[3] = (-1 if player.remaining_turns is None
+                                 else player.remaining_turns)
+        if self.done:
+            self.legal_mask.fill(False)
+        else:
+            self.action_space.legal_mask(player, out=self.legal_mask)
+
+
+if __name__ == '__main__':
+    import random
+    my_env = Environment(Configuration.STANDARD, n_players=3)
+    my_env.test_str()
+    my_observation, my_legal_mask = my_env.reset(seed=42)
+    my_done = False
+    my_total = 0
+    while not my_done:
+        my_i_action = random.choice(np.flatnonzero(my_legal_mask))
+        my_observation, my_legal_mask, my_reward, my_done = my_env.step(
+            my_i_action)
+        my_total += my_reward
+    print('\nRandom agent: total reward = %s' % my_total)
+
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Tuple
+import numpy as np
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.Configuration import Configuration
+from hanabython.Modules.Environment import Environment
+
+
+class EnvironmentVector(Colored):
+    """
+    Several :class:`Environment` objects, run in parallel by worker processes.
+
+    The observations, legal masks, rewards, "done" flags and actions of all the
+    environments are stored in blocks of shared memory. The workers read the
+    actions and write the results directly in these blocks, so that a batch
+    :meth:`step` only sends a few bytes of command to each worker (no pickled
+    data).
+
+    When a game is over, the corresponding environment is automatically reset.
+    In that case, the flag in :attr:`dones` is True, the reward is the last
+    reward of the game that just ended, and the observation and the legal mask
+    are those of the new game.
+
+    The environments have independent streams of seeds (used to shuffle the
+    draw piles), all derived from :attr:`seed`: hence the sequence of games
+    in each environment is reproducible.
+
+    :param n_envs: the number of environments.
+    :param cfg: the configuration of the games. If the start method of
+        ``multiprocessing`` is not "fork" (e.g. on Windows), it must be
+        picklable.
+    :param n_players: the number of players.
+    :param n_workers: the number of worker processes. Default: the number of
+        CPUs (but not more than the number of environments).
+    :param seed: the root seed. If None, the streams of seeds are not
+        reproducible.
+
+    :var np.array observations: array of size :attr:`n_envs` *
+        :attr:`Environment.observation_size`.
+    :var np.array legal_masks: array of size :attr:`n_envs` *
+        :attr:`ActionSpace.n_actions`.
+    :var np.array rewards: array of size :attr:`n_envs`.
+    :var np.array dones: array of size :attr:`n_envs`.
+
+    These arrays are overwritten by each call to :meth:`reset` or :meth:`step`.
+    They must not be used once this object is destroyed.
+
+    >>> with EnvironmentVector(n_envs=4, n_workers=2, seed=0) as envs:
+    ...     observations, legal_masks = envs.reset()
+    ...     actions = [np.flatnonzero(mask)[0] for mask in legal_masks]
+    ...     observations, legal_masks, rewards, dones = envs.step(actions)
+    >>> observations.shape, legal_masks.shape
+    ((4, 484), (4, 20))
+    >>> print(rewards)
+    [0. 1. 0. 0.]
+    """
+
+    def __init__(self, n_envs: int, cfg: Configuration = Configuration.STANDARD,
+                 n_players: int = 2, n_workers: int = None, seed: int = None):
+        self.n_envs = n_envs
+        self.cfg = cfg
+        self.n_players = n_players
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        self.n_workers = min(n_workers, n_envs)
+        self.seed = seed
+        probe = Environment(cfg, n_players)
+        self.observation_size = probe.observation_size
+        self.n_actions = probe.action_space.n_actions
+        # Shared memory
+        specs = [
+            ((n_envs, self.observation_size), np.float32),
+            ((n_envs, self.n_actions), bool),
+            ((n_envs, ), np.float32),
+            ((n_envs, ), bool),
+            ((n_envs, ), np.int64),
+        ]
+        self._shared = []                       # type: List[SharedMemory]
+        arrays = []
+        for shape, dtype in specs:
+            size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            shared = SharedMemory(create=True, size=size)
+            self._shared.append(shared)
+            arrays.append(np.ndarray(shape, dtype=dtype, buffer=shared.buf))
+        (self.observations, self.legal_masks, self.rewards, self.dones,
+         self.actions) = arrays
+        # Workers
+        seed_sequences = np.random.SeedSequence(seed).spawn(n_envs)
+        chunks = np.array_split(np.arange(n_envs), self.n_workers)
+        self._connections = []                  # type: List[Connection]
+        self._processes = []                    # type: List[Process]
+        for chunk in chunks:
+            connection, worker_connection = Pipe()
+            process = Process(
+                target=_work,
+                args=(worker_connection, [s.name for s in self._shared],
+                      specs, cfg, n_players, list(chunk),
+                      [seed_sequences[i] for i in chunk]),
+                daemon=True
+            )
+            process.start()
+            worker_connection.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+        self.closed = False
+
+    def colored(self) -> str:
+        return '%s environments (%s workers): %s players, %s' % (
+            self.n_envs, self.n_workers, self.n_players, self.cfg.colored())
+
+    def __enter__(self) -> 'EnvironmentVector':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _command(self, command: bytes) -> None:
+        """
+        Send a command to all workers and wait until they are done.
+
+        :param command: the command.
+        """
+        for connection in self._connections:
+            connection.send_bytes(command)
+        errors = [connection.recv_bytes() for connection in self._connections]
+        errors = [error.decode() for error in errors if error]
+        if errors:
+            raise ValueError('\n'.join(errors))
+
+    def reset(self) -> Tuple[np.array, np.array]:
+        """
+        Start a new game in each environment.
+
+        :return: the tuple (:attr:`observations`, :attr:`legal_masks`).
+        """
+        self._command(b'reset')
+        return self.observations, self.legal_masks
+
+    def step(self, actions) -> Tuple[np.array, np.array, np.array, np.array]:
+        """
+        Execute one action in each environment.
+
+        :param actions: an iterable of :attr:`n_envs` indexes of actions (cf.
+            :class:`ActionSpace`).
+
+        :return: the tuple (:attr:`observations`, :attr:`legal_masks`,
+            :attr:`rewards`, :attr:`dones`).
+
+        If the action fails in some environments (e.g. because it is illegal),
+        the other environments are stepped anyway. Then a ValueError is raised,
+        with one line per failure. The environments that failed are not
+        advanced: their reward is 0 and their "done" flag is False.
+
+        >>> with EnvironmentVector(n_envs=4, n_workers=2, seed=0) as envs:
+        ...     _, legal_masks = envs.reset()
+        ...     actions = [np.flatnonzero(mask)[0] for mask in legal_masks]
+        ...     try:
+        ...         _ = envs.step([0] + actions[1:])
+        ...     except ValueError as e:
+        ...         print(e)
+        ...     print(envs.rewards)
+        Environment 0: Illegal action: Discard card in position 1
+        [0. 1. 0. 0.]
+        """
+        self.actions[:] = actions
+        self._command(b'step')
+        return self.observations, self.legal_masks, self.rewards, self.dones
+
+    def close(self) -> None:
+        """
+        Stop the workers and release the shared memory.
+
+        The arrays (:attr:`observations`, etc.) remain readable as long as this
+        object exists, but not after: the memory is unmapped when it is
+        destroyed.
+        """
+        if self.closed:
+            return
+        for connection in self._connections:
+            connection.send_bytes(b'close')
+        for process in self._processes:
+            process.join()
+        for connection in self._connections:
+            connection.close()
+        # The memory is unmapped only when this object is destroyed, so that
+        # the arrays remain readable in the meantime.
+        for shared in self._shared:
+            shared.unlink()
+        self.closed = True
+
+    def __del__(self) -> None:
+        if getattr(self, 'closed', True) is False:
+            self.close()
+        # Unmap the shared memory. If some arrays are still referenced
+        # elsewhere, the memory is unmapped when they are freed.
+        for name in ['observations', 'legal_masks', 'rewards', 'dones',
+                     'actions']:
+            self.__dict__.pop(name, None)
+        for shared in getattr(self, '_shared', []):
+            try:
+                shared.close()
+            except BufferError:
+                pass
+
+
+def _work(connection: Connection, names: List[str], specs: list,
+          cfg: Configuration, n_players: int, indexes: List[int],
+          seed_sequences: List[np.random.SeedSequence]) -> None:
+    """
+    Main function of a worker process of :class:`EnvironmentVector`.
+
+    :param connection: the connection with the main process.
+    :param names: the names of the blocks of shared memory.
+    :param specs: the shapes and dtypes of the arrays in shared memory.
+    :param cfg: the configuration of the games.
+    :param n_players: the number of players.
+    :param indexes: the indexes of the environments handled by this worker.
+    :param seed_sequences: the seed sequences of these environments.
+    """
+    shared = [SharedMemory(name=name) for name in names]
+    observations, legal_masks, rewards, dones, actions = [
+        np.ndarray(shape, dtype=dtype, buffer=s.buf)
+        for s, (shape, dtype) in zip(shared, specs)
+    ]
+    envs = [
+        Environment(cfg, n_players, observation=observations[i],
+                    legal_mask=legal_masks[i])
+        for i in indexes
+    ]
+    generators = [np.random.default_rng(s) for s in seed_sequences]
+
+    def reset(j: int) -> None:
+        envs[j].reset(seed=int(generators[j].integers(2 ** 32)))
+
+    while True:
+        command = connection.recv_bytes()
+        if command == b'close':
+            break
+        errors = []
+        for j, i in enumerate(indexes):
+            # Any exception is reported, so that the worker survives and the
+            # other environments of its slice are processed.
+            try:
+                if command == b'reset':
+                    rewards[i], dones[i] = 0, False
+                    reset(j)
+                elif command == b'step':
+                    rewards[i], dones[i] = 0, False
+                    _, _, rewards[i], dones[i] = envs[j].step(actions[i])
+                    if dones[i]:
+                        reset(j)
+            except Exception as e:
+                errors.append('Environment %s: %s' % (i, e))
+        connection.send_bytes('\n'.join(errors).encode())
+    del observations, legal_masks, rewards, dones, actions, envs
+    for s in shared:
+        s.close()
+    connection.close()
+
+
+if __name__ == '__main__':
+    from time import time
+    my_n_envs = 16
+    with EnvironmentVector(n_envs=my_n_envs, seed=42) as my_envs:
+        my_envs.test_str()
+        my_observations, my_legal_masks = my_envs.reset()
+        my_generator = np.random.default_rng(0)
+        my_n_steps = 200
+        my_time = time()
+        for _ in range(my_n_steps):
+            my_actions = [my_generator.choice(np.flatnonzero(my_mask))
+                          for my_mask in my_legal_masks]
+            my_envs.step(my_actions)
+        my_time = time() - my_time
+        print('\n%s steps/sec' % int(my_n_envs * my_n_steps / my_time))
+
+    import doctest
+    doctest.testmod()
@@ -19,8 +19,9 @@ This file is part of Hanabython.
     along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
 """
 import logging
+import struct
 from copy import copy
-from typing import List
+from typing import Callable, List, Union
 from hanabython.Modules.Card import Card
 from hanabython.Modules.Clue import Clue
 from hanabython.Modules.Colors import Colors
@@ -41,6 +42,9 @@ from hanabython.Modules.ActionThrow import ActionThrow
 from hanabython.Modules.ActionForfeit import ActionForfeit
 from hanabython.Modules.ActionPlayCard import ActionPlayCard
 from hanabython.Modules.Player import Player
+from hanabython.Modules.GameEvent import GameEvent
+from hanabython.Modules.GameResult import GameResult
+from hanabython.Modules.PlayerSubscriber import PlayerSubscriber
 
 
 class Game(Colored):
@@ -50,6 +54,20 @@ class Game(Colored):
     :param cfg: the configuration.
     :param players: the list of players. They will play in this order, starting
         with the first player in this list.
+    :param early_termination: if True, the game stops as soon as the score
+        cannot improve anymore, considering not only the discard pile but also
+        the number of cards and turns left. Cf. :attr:`max_score_reachable`.
+        If False (default), the game stops early only when the score is equal
+        to :attr:`DiscardPile.max_score_possible`.
+    :param seed: if not None, the draw pile is shuffled with its own random
+        generator initialized with this seed. Cf. :class:`DrawPile`.
+    :param trusted: whether the players are trusted: a boolean (same for all
+        players) or a list of booleans (one per player). A trusted player
+        receives the objects of the game (configuration, cards, clues) instead
+        of copies, which is faster. These objects are mutable: they are not
+        frozen nor wrapped in read-only views, because that would slow down
+        every access made by the game itself. Hence a trusted player must not
+        modify them, which is not checked. Cf. :class:`PlayerSubscriber`.
 
     :var int n_players: the number of players.
     :var Board board: the board.
@@ -69,21 +87,67 @@ class Game(Colored):
     :var int i_active: the index of the active player.
     :var Player active: the active player. It is automatically updated when
         :attr:`i_active` is updated.
+    :var int n_turns: the number of turns played so far.
+    :var int n_clues_given: the number of clues given so far.
+    :var str ending: None as long as the game is not over. Then, how the game
+        ended: :attr:`GameResult.WIN`, :attr:`GameResult.LOSE` or
+        :attr:`GameResult.GAME_EXHAUSTED`.
+    :var list subscribers: the callables that receive the :class:`GameEvent`
+        objects, i.e. the changes of the state of the game. Initially, there
+        is one :class:`PlayerSubscriber` for each player. Others can be added
+        with :meth:`subscribe`.
 
     >>> game = Game(players=[PlayerHumanText('Antoine'),
-    ...                      PlayerHumanText('Donald X')])
+    ...                      PlayerHumanText('Donald X')],
+    ...             trusted=[True, False])
+    >>> game.players[0].cfg is game.cfg, game.players[1].cfg is game.cfg
+    (True, False)
+    >>> Game(players=[PlayerHumanText('Antoine'),
+    ...               PlayerHumanText('Donald X')], trusted=[True])
+    Traceback (most recent call last):
+    ValueError: trusted has 1 elements but there are 2 players.
     """
 
     def __init__(self, players: List[Player],
-                 cfg: Configuration = Configuration.STANDARD):
+                 cfg: Configuration = Configuration.STANDARD,
+                 early_termination: bool = False, seed: int = None,
+                 trusted: Union[bool, List[bool]] = False):
+        self._setup(players, cfg, early_termination, seed, trusted)
+        # Inform the players of the initialization
+        for i, p in enumerate(self.players):
+            p.receive_init(cfg=(
+                self.cfg if self.trusted[i] else copy(self.cfg)
+            ), player_names=(
+                [self.players[j].name for j in range(i, self.n_players)]
+                + [self.players[j].name for j in range(i)]
+            ))
+
+    def _setup(self, players: List[Player], cfg: Configuration,
+               early_termination: bool, seed: Union[int, None],
+               trusted: Union[bool, List[bool]],
+               cards: List[Card] = None) -> None:
+        """
+        Initialize the variables, without informing the players.
+
+        :param cards: if not None, the cards of the draw pile (which is then
+            not shuffled). Cf. :class:`DrawPile`.
+        """
         logging.info('General initializations')
         # Parameters
         self.players = players
         self.cfg = cfg
+        self.early_termination = early_termination
+        self.seed = seed
+        if isinstance(trusted, bool):
+            trusted = [trusted] * len(players)
+        if len(trusted) != len(players):
+            raise ValueError('trusted has %s elements but there are %s '
+                             'players.' % (len(trusted), len(players)))
+        self.trusted = trusted
         # Variables
         self.n_players = len(self.players)                  # type: int
         self.board = Board(cfg)                             # type: Board
-        self.draw_pile = DrawPile(cfg)                      # type: DrawPile
+        self.draw_pile = DrawPile(cfg, seed, cards)         # type: DrawPile
         self.discard_pile = DiscardPile(cfg)                # type: DiscardPile
         self.n_clues = cfg.n_clues                          # type: int
         self.n_misfires = 0                                 # type: int
@@ -92,15 +156,16 @@ class Game(Colored):
         self.remaining_turns = None                         # type: int
         self.b_lose = False                                 # type: bool
         self.b_win = False                                  # type: bool
+        self.n_turns = 0                                    # type: int
+        self.n_clues_given = 0                              # type: int
+        self.ending = None                                  # type: str
+        self.subscribers = [
+            PlayerSubscriber(p, i, self.n_players, trusted[i])
+            for i, p in enumerate(self.players)
+        ]                                       # type: List[Callable]
         # Active player
         self.active = None                                  # type: Player
         self._i_active = None                               # type: int
-        # Inform the players of the initialization
-        for i, p in enumerate(self.players):
-            p.receive_init(cfg=copy(self.cfg), player_names=(
-                [self.players[j].name for j in range(i, self.n_players)]
-                + [self.players[j].name for j in range(i)]
-            ))
 
     # *** Utils ***
 
@@ -147,6 +212,256 @@ class Game(Colored):
         """
         return (who - fro) % self.n_players
 
+    @property
+    def max_score_reachable(self) -> int:
+        """
+        Upper bound on the final score, evaluated at the end of a turn.
+
+        This bound is tighter than :attr:`DiscardPile.max_score_possible`:
+        each card that remains to be played needs a turn and a card, so the
+        score cannot increase by more than the number of cards left (in the
+        draw pile and in the hands) or, in the normal end-of-game rule once
+        the countdown has started, by more than the number of turns left.
+
+        There is no separate term for the gaps of the board. The only gaps that
+        cannot be filled are those where all the copies of a card are
+        discarded, and :attr:`DiscardPile.max_score_possible` already stops
+        each color at its first such value. Constraints such as the order in
+        which the cards of a color must be played, or which player holds
+        them, are ignored.
+
+        :return: the maximum final score that is still reachable.
+
+        >>> game = Game(players=[PlayerPuppet('Antoine'),
+        ...                      PlayerPuppet('Donald X')])
+        >>> game.max_score_reachable
+        25
+        >>> game.remaining_turns = 3
+        >>> game.max_score_reachable
+        2
+        >>> for s in ['B1', 'B2', 'B3']:
+        ...     _ = game.board.try_to_play(Card(s))
+        >>> game.max_score_reachable
+        5
+        >>> for s in ['B4', 'B4', 'R2', 'R2']:
+        ...     game.discard_pile.receive(Card(s))
+        >>> game.max_score_reachable
+        5
+        >>> game.remaining_turns = 30
+        >>> game.max_score_reachable
+        19
+        """
+        n_plays_left = (self.draw_pile.n_cards
+                        + sum(len(hand) for hand in self.hands))
+        if self.remaining_turns is not None:
+            n_plays_left = min(n_plays_left, self.remaining_turns - 1)
+        return min(self.discard_pile.max_score_possible,
+                   self.board.score + n_plays_left)
+
+    @property
+    def result(self) -> GameResult:
+        """
+        Outcome of the game (once it is over).
+
+        :return: the result, or None if the game is not over.
+
+        >>> from hanabython import PlayerRandom
+        >>> game = Game(players=[PlayerRandom('Antoine', seed=0),
+        ...                      PlayerRandom('Donald X', seed=1)], seed=0)
+        >>> print(game.result)
+        None
+        >>> game.play()
+        0
+        >>> print(game.result)
+        Score 0 (lose) after 8 turns, 3 misfires, 2 clues given
+        """
+        if self.ending is None:
+            return None
+        return GameResult(
+            score=0 if self.ending == GameResult.LOSE else self.board.score,
+            ending=self.ending, n_turns=self.n_turns,
+            n_misfires=self.n_misfires, n_clues_given=self.n_clues_given)
+
+    # *** Serialization ***
+
+    # Header of the format of to_bytes: version, n_players, n_clues,
+    # n_misfires, i_active, remaining_turns, n_turns, n_clues_given, flags
+    # (b_win, b_lose, early_termination) and ending.
+    _HEADER = struct.Struct('<BBBBbbHHBB')
+    _ENDINGS = [None] + list(GameResult.ENDINGS)
+
+    def to_bytes(self, permutation: 'ColorPermutation' = None) -> bytes:
+        """
+        Serialize the state of the game in a compact form.
+
+        The configuration must be registered (cf.
+        :meth:`Configuration.register`): only its name is stored. The cards
+        (draw pile, hands, discard pile) are stored as card identifiers (cf.
+        :meth:`Configuration.card_id`), one byte each. The players and the
+        subscribers are not stored. Cf. :meth:`from_bytes`.
+
+        :param permutation: if given, serialize the game where the colors are
+            permuted (cf. :class:`ColorPermutation`). With
+            :meth:`ColorPermutation.canonical_for_game`, two games that are
+            equivalent up to interchangeable colors have the same
+            serialization.
+
+        :return: the serialized state.
+
+        >>> from hanabython import PlayerRandom
+        >>> players = [PlayerRandom('Antoine', seed=0),
+        ...            PlayerRandom('Donald X', seed=1)]
+        >>> game = Game(players, seed=0)
+        >>> game.start()
+        >>> for _ in range(6):
+        ...     _ = game.begin_turn()
+        ...     game.ask_action()
+        ...     _ = game.finish_turn()
+        >>> data = game.to_bytes()
+        >>> len(data)
+        79
+        >>> copy_game = Game.from_bytes(data, players)
+        >>> print(copy_game.hands[0], '|', copy_game.hands[1])
+        G2 W1 G3 R3 R2 | Y2 W4 R1 W1 W1
+        >>> print(game.hands[0], '|', game.hands[1])
+        G2 W1 G3 R3 R2 | Y2 W4 R1 W1 W1
+        >>> copy_game.to_bytes() == data
+        True
+        """
+        cfg = self.cfg
+        if not cfg.is_registered:
+            raise ValueError('The configuration must be registered.')
+        name = cfg.name.encode()
+        header = self._HEADER.pack(
+            0, self.n_players, self.n_clues, self.n_misfires,
+            -1 if self.i_active is None else self.i_active,
+            -1 if self.remaining_turns is None else self.remaining_turns,
+            self.n_turns, self.n_clues_given,
+            self.b_win | self.b_lose << 1 | self.early_termination << 2,
+            self._ENDINGS.index(self.ending))
+        altitude = list(self.board.altitude)
+        card_id = cfg.card_id
+        if permutation is not None:
+            altitude = [altitude[i] for i in permutation.preimage]
+
+            def card_id(card):
+                return permutation.apply_card_id(cfg.card_id(card))
+        parts = [bytes([len(name)]), name, header, bytes(altitude)]
+        for cards in ([self.draw_pile] + self.hands
+                      + [self.discard_pile.chronological]):
+            parts.append(bytes([len(cards)]))
+            parts.append(bytes(card_id(card) for card in cards))
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, players: List[Player],
+                   trusted: Union[bool, List[bool]] = False) -> 'Game':
+        """
+        Restore a game serialized by :meth:`to_bytes`.
+
+        The players are not informed (their method :meth:`Player.receive_init`
+        is not called): they are supposed to be already in the corresponding
+        state, e.g. because they were restored as well.
+
+        :param data: the serialized state.
+        :param players: the players.
+        :param trusted: cf. :class:`Game`.
+
+        :return: the game.
+        """
+        length = data[0]
+        cfg = Configuration.from_name(data[1:1 + length].decode())
+        position = 1 + length
+        (_, n_players, n_clues, n_misfires, i_active, remaining_turns,
+         n_turns, n_clues_given, flags, ending) = cls._HEADER.unpack_from(
+            data, position)
+        position += cls._HEADER.size
+        altitude = data[position:position + cfg.n_colors]
+        position += cfg.n_colors
+        card_lists = []
+        for _ in range(n_players + 2):
+            length = data[position]
+            card_lists.append([cfg.card_from_id(card_id) for card_id
+                               in data[position + 1:position + 1 + length]])
+            position += 1 + length
+        game = cls.__new__(cls)
+        game._setup(players, cfg, bool(flags & 4), None, trusted,
+                    card_lists[0])
+        game.n_clues, game.n_misfires = n_clues, n_misfires
+        if i_active >= 0:
+            game.i_active = i_active
+        game.remaining_turns = None if remaining_turns < 0 else remaining_turns
+        game.n_turns, game.n_clues_given = n_turns, n_clues_given
+        game.b_win, game.b_lose = bool(flags & 1), bool(flags & 2)
+        game.ending = cls._ENDINGS[ending]
+        for i, c in enumerate(cfg.colors):
+            for v in range(1, altitude[i] + 1):
+                game.board.try_to_play(Card(c, v))
+        for hand, cards in zip(game.hands, card_lists[1:-1]):
+            hand.extend(cards)
+        for card in card_lists[-1]:
+            game.discard_pile.receive(card)
+        return game
+
+    def __reduce_ex__(self, protocol):
+        """
+        Pickle the game with :meth:`to_bytes` and :meth:`from_bytes`.
+
+        This applies only if the configuration is registered (cf.
+        :meth:`Configuration.register`); otherwise, the game is pickled as a
+        usual object. The players are pickled as well, but not the additional
+        subscribers (cf. :meth:`subscribe`) nor the seed.
+
+        >>> from pickle import dumps, loads
+        >>> from hanabython import PlayerRandom
+        >>> game = Game([PlayerRandom('Antoine', seed=0),
+        ...              PlayerRandom('Donald X', seed=1)], seed=0)
+        >>> game.start()
+        >>> for _ in range(6):
+        ...     _ = game.begin_turn()
+        ...     game.ask_action()
+        ...     _ = game.finish_turn()
+        >>> data = dumps(game)
+        >>> len(data) < 8000
+        True
+        >>> copy_game = loads(data)
+        >>> copy_game.to_bytes() == game.to_bytes()
+        True
+        >>> copy_game.play() == game.play()
+        True
+        """
+        if not self.cfg.is_registered:
+            return super().__reduce_ex__(protocol)
+        return Game.from_bytes, (self.to_bytes(), self.players, self.trusted)
+
+    # *** Events ***
+
+    def subscribe(self, subscriber: Callable[[GameEvent], None]) -> None:
+        """
+        Add a subscriber to the events of the game.
+
+        :param subscriber: a callable that takes a :class:`GameEvent` as
+            argument, e.g. a :class:`GameRecorder`. It receives the events
+            after the players.
+
+        >>> game = Game(players=[PlayerPuppet('Antoine'),
+        ...                      PlayerPuppet('Donald X')])
+        >>> game.subscribe(print)
+        >>> game.i_active = 0
+        >>> _ = game.execute_forfeit()
+        Player 0 forfeits
+        """
+        self.subscribers.append(subscriber)
+
+    def emit(self, event: GameEvent) -> None:
+        """
+        Send an event to all the subscribers.
+
+        :param event: the event. The same object is sent to all subscribers.
+        """
+        for subscriber in self.subscribers:
+            subscriber(event)
+
     # *** Strings ***
 
     def colored(self) -> str:
@@ -169,39 +484,114 @@ class Game(Colored):
         to define a new :class:`Game`.
 
         :return: the final score of the game.
+
+        The game is played by :meth:`start`, then by a succession of turns. Each
+        turn is made of :meth:`begin_turn`, :meth:`ask_action` and
+        :meth:`finish_turn`. These methods can also be called directly in order
+        to drive the game step by step (cf. :class:`Environment`).
+        """
+        self.start()
+        while True:
+            score = self.begin_turn()
+            if score is not None:
+                return score
+            self.ask_action()
+            score = self.finish_turn()
+            if score is not None:
+                return score
+
+    def start(self) -> None:
+        """
+        Deal the initial hands, before the first turn.
+
+        >>> game = Game(players=[PlayerPuppet('Antoine'),
+        ...                      PlayerPuppet('Donald X')], seed=0)
+        >>> game.start()
+        >>> [len(hand) for hand in game.hands]
+        [5, 5]
         """
         logging.info("Begin dealing.")
         self.i_active = -1
         self.deal()
         logging.info("The game begins.")
-        while True:
-            self.i_active += 1
-            logging.info("Check game-exhaustion condition.")
-            if self.check_game_exhausted():
-                return self.game_exhausted()
-            logging.info("%s's turn begins" % self.active.name)
-            self.active.receive_turn_begin()
-            logging.info("Ask %s for an action." % self.active.name)
-            for _ in range(Game.ATTEMPTS_BEFORE_FORFEIT):
-                action = self.active.choose_action()
-                is_legal = self.execute_action(action)
-                if is_legal:
-                    break
-            else:  # i.e. if all the attempts were without a legal action
-                logging.warning(
-                    "%s failed 100 times to choose an action. Automatic "
-                    "forfeit is applied." % self.active.name)
-                self.execute_action(ActionForfeit())
-            logging.info("Inform %s that his/her turn is over."
-                         % self.active.name)
-            self.active.receive_turn_finished()
-            logging.info("Check win-or-lose condition.")
-            if self.b_win:
-                return self.win()
-            if self.b_lose:
-                return self.lose()
-            if self.board.score == self.discard_pile.max_score_possible:
-                return self.game_exhausted()
+
+    def begin_turn(self) -> Union[int, None]:
+        """
+        Begin the turn of the next player.
+
+        The next player becomes active. If the game is exhausted, it ends.
+        Otherwise, the active player is informed that her turn begins.
+
+        :return: the final score if the game is over, None otherwise.
+
+        >>> game = Game(players=[PlayerPuppet('Antoine'),
+        ...                      PlayerPuppet('Donald X')], seed=0)
+        >>> game.start()
+        >>> print(game.begin_turn())
+        None
+        >>> game.active.name
+        'Antoine'
+        """
+        self.i_active += 1
+        logging.info("Check game-exhaustion condition.")
+        if self.check_game_exhausted():
+            return self.game_exhausted()
+        logging.info("%s's turn begins" % self.active.name)
+        self.active.receive_turn_begin()
+        return None
+
+    def ask_action(self) -> None:
+        """
+        Ask the active player for an action and execute it.
+
+        If the player fails to provide a legal action after
+        :attr:`ATTEMPTS_BEFORE_FORFEIT` attempts, she is considered to forfeit.
+        """
+        logging.info("Ask %s for an action." % self.active.name)
+        for _ in range(Game.ATTEMPTS_BEFORE_FORFEIT):
+            action = self.active.choose_action()
+            is_legal = self.execute_action(action)
+            if is_legal:
+                break
+        else:  # i.e. if all the attempts were without a legal action
+            logging.warning(
+                "%s failed 100 times to choose an action. Automatic "
+                "forfeit is applied." % self.active.name)
+            self.execute_action(ActionForfeit())
+
+    def finish_turn(self) -> Union[int, None]:
+        """
+        Finish the turn of the active player.
+
+        The active player is informed that her turn is over. Then the game ends
+        if it is won, lost, or if the score cannot improve anymore.
+
+        :return: the final score if the game is over, None otherwise.
+
+        >>> game = Game(players=[PlayerPuppet('Antoine'),
+        ...                      PlayerPuppet('Donald X')], seed=0)
+        >>> game.start()
+        >>> _ = game.begin_turn()
+        >>> game.execute_action(ActionForfeit())
+        True
+        >>> game.finish_turn()
+        0
+        """
+        logging.info("Inform %s that his/her turn is over."
+                     % self.active.name)
+        self.n_turns += 1
+        self.active.receive_turn_finished()
+        logging.info("Check win-or-lose condition.")
+        if self.b_win:
+            return self.win()
+        if self.b_lose:
+            return self.lose()
+        if self.board.score == self.discard_pile.max_score_possible:
+            return self.game_exhausted()
+        if (self.early_termination
+                and self.board.score >= self.max_score_reachable):
+            return self.game_exhausted()
+        return None
 
     # *** Drawing cards ***
 
@@ -244,11 +634,7 @@ class Game(Colored):
                 and self.remaining_turns is None):
             self.remaining_turns = self.n_players + 1
         logging.debug('Inform the players that someone drew.')
-        for i, p in enumerate(self.players):
-            if i == self.i_active:
-                p.receive_i_draw()
-            else:
-                p.receive_partner_draws(self.rel(self.i_active, i), copy(card))
+        self.emit(GameEvent(GameEvent.DRAW, i_active=self.i_active, card=card))
 
     def deal(self) -> None:
         """
@@ -268,15 +654,13 @@ class Game(Colored):
         2
         """
         logging.debug('Inform the players that dealing begins.')
-        for p in self.players:
-            p.receive_begin_dealing()
+        self.emit(GameEvent(GameEvent.BEGIN_DEALING))
         logging.debug('Deal cards.')
         for _ in range(self.n_players * self.hand_size):
             self.i_active += 1
             self.draw()
         logging.debug('Inform the players that dealing is over.')
-        for p in self.players:
-            p.receive_end_dealing()
+        self.emit(GameEvent(GameEvent.END_DEALING))
 
     # *** Manage the 4 types of actions ***
 
@@ -353,8 +737,7 @@ class Game(Colored):
         logging.debug('Perform the action.')
         self.b_lose = True
         logging.debug('Inform all players of the result of the action.')
-        for i, p in enumerate(self.players):
-            p.receive_someone_forfeits(self.rel(self.i_active, i))
+        self.emit(GameEvent(GameEvent.FORFEIT, i_active=self.i_active))
         return True
 
     def execute_throw(self, k: int) -> bool:
@@ -414,8 +797,8 @@ class Game(Colored):
         self.discard_pile.receive(card)
         self.n_clues += 1
         logging.debug('Inform all players of the result of the action.')
-        for i, p in enumerate(self.players):
-            p.receive_someone_throws(self.rel(self.i_active, i), k, card)
+        self.emit(GameEvent(GameEvent.THROW, i_active=self.i_active, k=k,
+                            card=card))
         logging.debug('Draw a card')
         self.draw()
         return True
@@ -568,9 +951,8 @@ class Game(Colored):
             if self.n_misfires == self.cfg.n_misfires:
                 self.b_lose = True
         logging.debug('Inform all players of the result of the action.')
-        for i, p in enumerate(self.players):
-            p.receive_someone_plays_card(
-                self.rel(self.i_active, i), k, copy(card))
+        self.emit(GameEvent(GameEvent.PLAY_CARD, i_active=self.i_active, k=k,
+                            card=card))
         if not self.b_lose and not self.b_win:
             logging.debug('Draw a card')
             self.draw()
@@ -670,11 +1052,11 @@ any card.
         self.active.receive_action_legal()
         logging.debug('Perform the clue action.')
         self.n_clues -= 1
+        self.n_clues_given += 1
         logging.debug('Inform all players of the result of the action.')
-        for i, p in enumerate(self.players):
-            p.receive_someone_clues(
-                self.rel(self.i_active, i), self.rel(i_clued, i), copy(clue),
-                copy(bool_list))
+        self.emit(GameEvent(GameEvent.CLUE, i_active=self.i_active,
+                            i_clued=i_clued, clue=clue,
+                            bool_list=tuple(bool_list)))
         return True
 
     # *** End of game ***
@@ -743,8 +1125,8 @@ any card.
         if self.cfg.end_rule == ConfigurationEndRule.NORMAL:
             if self.remaining_turns is not None:
                 self.remaining_turns -= 1
-                for p in self.players:
-                    p.receive_remaining_turns(self.remaining_turns)
+                self.emit(GameEvent(GameEvent.REMAINING_TURNS,
+                                    value=self.remaining_turns))
                 if self.remaining_turns == 0:
                     return True
         elif self.cfg.end_rule == ConfigurationEndRule.CROWNING_PIECE:
@@ -770,8 +1152,8 @@ any card.
         >>> score
         0
         """
-        for i, p in enumerate(self.players):
-            p.receive_lose(score=0)
+        self.ending = GameResult.LOSE
+        self.emit(GameEvent(GameEvent.LOSE, value=0))
         return 0
 
     def game_exhausted(self) -> int:
@@ -796,8 +1178,8 @@ any card.
         >>> score
         1
         """
-        for i, p in enumerate(self.players):
-            p.receive_game_exhausted(score=self.board.score)
+        self.ending = GameResult.GAME_EXHAUSTED
+        self.emit(GameEvent(GameEvent.GAME_EXHAUSTED, value=self.board.score))
         return self.board.score
 
     def win(self) -> int:
@@ -821,8 +1203,8 @@ any card.
         >>> score
         25
         """
-        for i, p in enumerate(self.players):
-            p.receive_win(score=self.board.score)
+        self.ending = GameResult.WIN
+        self.emit(GameEvent(GameEvent.WIN, value=self.board.score))
         return self.board.score
 
 
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from collections import namedtuple
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.StringUtils import str_from_iterable
+
+
+class GameEvent(Colored, namedtuple('GameEvent', [
+    'category', 'i_active', 'k', 'card', 'i_clued', 'clue', 'bool_list',
+    'value'
+], defaults=[None] * 7)):
+    """
+    An event in a game of Hanabi, i.e. a change of the state of the game.
+
+    Each time the state changes, the :class:`Game` creates one event and sends
+    it to all its subscribers (players, recorders, spectators, etc.). Events
+    are immutable tuples, so that the same object can be shared by all the
+    subscribers. Each subscriber applies its own point of view, e.g.
+    :class:`PlayerSubscriber` converts the absolute positions into relative
+    positions and hides the cards drawn by a player to herself.
+
+    :param category: the type of event, e.g. :attr:`GameEvent.DRAW`.
+    :param i_active: the (absolute) position of the active player.
+    :param k: the position of the card in the hand.
+    :param card: the card drawn, thrown or played.
+    :param i_clued: the (absolute) position of the player who receives a clue.
+    :param clue: the clue.
+    :param bool_list: a tuple of booleans that indicates what cards match the
+        clue.
+    :param value: the number of remaining turns, or the final score, depending
+        on the category.
+
+    Only the relevant parameters are used, depending on the category; the
+    others are None.
+
+    >>> from hanabython import Card
+    >>> event = GameEvent(GameEvent.THROW, i_active=1, k=4, card=Card('B3'))
+    >>> print(event)
+    Player 1 throws B3 (position 4)
+    >>> event.card
+    <Card: B3>
+    """
+
+    __slots__ = ()
+
+    #: The initial dealing of hands begins.
+    BEGIN_DEALING = 0
+    #: The initial dealing of hands is over.
+    END_DEALING = 1
+    #: A player tries to draw a card. Parameters: `i_active`, `card`.
+    DRAW = 2
+    #: A player throws a card. Parameters: `i_active`, `k`, `card`.
+    THROW = 3
+    #: A player tries to play a card. Parameters: `i_active`, `k`, `card`.
+    PLAY_CARD = 4
+    #: A player gives a clue. Parameters: `i_active`, `i_clued`, `clue`,
+    #: `bool_list`.
+    CLUE = 5
+    #: A player forfeits. Parameters: `i_active`.
+    FORFEIT = 6
+    #: The number of remaining turns is known. Parameters: `value`.
+    REMAINING_TURNS = 7
+    #: The game is lost. Parameters: `value` (the final score).
+    LOSE = 8
+    #: The game is exhausted. Parameters: `value` (the final score).
+    GAME_EXHAUSTED = 9
+    #: The game is won. Parameters: `value` (the final score).
+    WIN = 10
+
+    def colored(self) -> str:
+        if self.category == GameEvent.BEGIN_DEALING:
+            return 'Dealing begins'
+        if self.category == GameEvent.END_DEALING:
+            return 'Dealing is over'
+        if self.category == GameEvent.DRAW:
+            return 'Player %s draws %s' % (
+                self.i_active,
+                'nothing' if self.card is None else self.card.colored())
+        if self.category == GameEvent.THROW:
+            return 'Player %s throws %s (position %s)' % (
+                self.i_active, self.card.colored(), self.k)
+        if self.category == GameEvent.PLAY_CARD:
+            return 'Player %s plays %s (position %s)' % (
+                self.i_active, self.card.colored(), self.k)
+        if self.category == GameEvent.CLUE:
+            return 'Player %s clues player %s about %s (%s)' % (
+                self.i_active, self.i_clued, self.clue.colored(),
+                str_from_iterable(int(b) for b in self.bool_list))
+        if self.category == GameEvent.FORFEIT:
+            return 'Player %s forfeits' % self.i_active
+        if self.category == GameEvent.REMAINING_TURNS:
+            return '%s turns remaining' % self.value
+        if self.category == GameEvent.LOSE:
+            return 'Lose, score %s' % self.value
+        if self.category == GameEvent.GAME_EXHAUSTED:
+            return 'Game exhausted, score %s' % self.value
+        return 'Win, score %s' % self.value
+
+
+if __name__ == '__main__':
+    from hanabython.Modules.Card import Card
+    from hanabython.Modules.Clue import Clue
+    from hanabython.Modules.Colors import Colors
+    GameEvent(GameEvent.PLAY_CARD, i_active=0, k=2, card=Card('R3')).test_str()
+    print()
+    GameEvent(GameEvent.CLUE, i_active=0, i_clued=1, clue=Clue(Colors.RED),
+              bool_list=(True, False, True)).test_str()
+
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import Callable, List
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.GameEvent import GameEvent
+
+
+class GameRecorder(Colored):
+    """
+    Subscriber that records the events of a game.
+
+    The recorded events can be used for analytics, or sent again to other
+    subscribers in order to replay the game (cf. :meth:`replay`).
+
+    :var list events: the events, by chronological order.
+
+    >>> from hanabython import Game, PlayerPuppet
+    >>> game = Game(players=[PlayerPuppet('Antoine'),
+    ...                      PlayerPuppet('Donald X')], seed=0)
+    >>> recorder = GameRecorder()
+    >>> game.subscribe(recorder)
+    >>> game.play()
+    0
+    >>> len(recorder.events)
+    14
+    >>> print(recorder.events[-2])
+    Player 0 forfeits
+    >>> print(recorder)
+    14 events
+    """
+
+    def __init__(self):
+        self.events = []                            # type: List[GameEvent]
+
+    def colored(self) -> str:
+        return '%s events' % len(self.events)
+
+    def __call__(self, event: GameEvent) -> None:
+        self.events.append(event)
+
+    def count(self, category: int) -> int:
+        """
+        Number of events of a given category.
+
+        :param category: the category, e.g. :attr:`GameEvent.CLUE`.
+
+        :return: the number of such events.
+
+        >>> from hanabython import Card
+        >>> recorder = GameRecorder()
+        >>> recorder(GameEvent(GameEvent.DRAW, i_active=0, card=Card('B3')))
+        >>> recorder(GameEvent(GameEvent.DRAW, i_active=1, card=Card('R1')))
+        >>> recorder.count(GameEvent.DRAW)
+        2
+        """
+        return sum(1 for event in self.events if event.category == category)
+
+    def replay(self, subscriber: Callable[[GameEvent], None]) -> None:
+        """
+        Send all the recorded events to a subscriber.
+
+        :param subscriber: the subscriber, e.g. a :class:`PlayerSubscriber`.
+
+        >>> from hanabython import (Card, Configuration, PlayerBase,
+        ...                         PlayerSubscriber)
+        >>> recorder = GameRecorder()
+        >>> recorder(GameEvent(GameEvent.DRAW, i_active=1, card=Card('B3')))
+        >>> recorder(GameEvent(GameEvent.DRAW, i_active=1, card=Card('R1')))
+        >>> antoine = PlayerBase('Antoine')
+        >>> antoine.receive_init(Configuration.STANDARD,
+        ...                      player_names=['Antoine', 'Donald X'])
+        >>> recorder.replay(PlayerSubscriber(antoine, i=0, n_players=2))
+        >>> print(antoine.hands[1])
+        R1 B3
+        """
+        for event in self.events:
+            subscriber(event)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
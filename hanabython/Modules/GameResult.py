@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from collections import namedtuple
+from hanabython.Modules.Colored import Colored
+
+
+class GameResult(Colored, namedtuple('GameResult', [
+    'score', 'ending', 'n_turns', 'n_misfires', 'n_clues_given'
+])):
+    """
+    The outcome of a game of Hanabi.
+
+    This small immutable tuple is typically sent by worker processes to the
+    tools that aggregate or store the results of simulations. Cf.
+    :attr:`Game.result`.
+
+    :param score: the final score.
+    :param ending: how the game ended: :attr:`GameResult.WIN`,
+        :attr:`GameResult.LOSE` or :attr:`GameResult.GAME_EXHAUSTED`.
+    :param n_turns: the number of turns played.
+    :param n_misfires: the number of misfires.
+    :param n_clues_given: the number of clues given.
+
+    >>> result = GameResult(score=17, ending=GameResult.GAME_EXHAUSTED,
+    ...                     n_turns=61, n_misfires=2, n_clues_given=25)
+    >>> print(result)
+    Score 17 (game_exhausted) after 61 turns, 2 misfires, 25 clues given
+    """
+
+    __slots__ = ()
+
+    #: The game is won (maximal score).
+    WIN = 'win'
+    #: The game is lost (misfires or forfeit).
+    LOSE = 'lose'
+    #: The game is over and is neither lost nor won.
+    GAME_EXHAUSTED = 'game_exhausted'
+    #: All the possible endings.
+    ENDINGS = (WIN, LOSE, GAME_EXHAUSTED)
+
+    def colored(self) -> str:
+        return 'Score %s (%s) after %s turns, %s misfires, %s clues given' % (
+            self.score, self.ending, self.n_turns, self.n_misfires,
+            self.n_clues_given)
+
+
+if __name__ == '__main__':
+    my_result = GameResult(score=17, ending=GameResult.GAME_EXHAUSTED,
+                           n_turns=61, n_misfires=2, n_clues_given=25)
+    my_result.test_str()
+
+    import doctest
+    doctest.testmod()
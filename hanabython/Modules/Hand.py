@@ -60,6 +60,9 @@ class Hand(Colored, list):
     def colored(self) -> str:
         return ' '.join(card.colored() for card in self)
 
+    def __str__(self) -> str:
+        return ' '.join([str(card) for card in self])
+
     def receive(self, card: Card) -> None:
         """
         Receive a card.
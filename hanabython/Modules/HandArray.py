@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import List
+import numpy as np
+from hanabython.Modules.Card import Card
+from hanabython.Modules.CardPublic import CardPublic
+from hanabython.Modules.Clue import Clue
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.Colors import Colors
+from hanabython.Modules.Configuration import Configuration
+from hanabython.Modules.Hand import Hand
+from hanabython.Modules.HandPublic import HandPublic
+
+
+class HandArray(Colored):
+    """
+    A hand stored in preallocated arrays.
+
+    This is an alternative to :class:`Hand` and :class:`HandPublic`, designed
+    for speed. Each card occupies a *slot* in arrays of fixed size: the slot
+    stores the card identifier (cf. :meth:`Configuration.card_id`) and the
+    public knowledge about the card, as bitmasks. When a card is received or
+    given, the data of the other cards stay in their slots: only the small
+    list :attr:`slots` is updated, so no object is created.
+
+    We use the same convention as in :class:`Hand`: position 0 is the newest
+    card (on the left).
+
+    :param cfg: the configuration of the game.
+    :param capacity: the maximal number of cards in the hand.
+
+    :var int n_cards: the number of cards in the hand.
+    :var list slots: a permutation of the slots. For `k` < :attr:`n_cards`,
+        ``slots[k]`` is the slot of the card in position `k`. The other
+        elements are the free slots.
+    :var np.array card_ids: for each slot, the identifier of the card, or -1
+        if it is unknown.
+    :var np.array can_be_c: for each slot, bit `i` is set iff the card can be
+        of the `i`-th color. Similarly for :attr:`can_be_v`,
+        :attr:`yes_clued_c` and :attr:`yes_clued_v`, with the same meaning as
+        in :class:`CardPublic`.
+
+    >>> cfg = Configuration.W_MULTICOLOR
+    >>> hand = HandArray(cfg, capacity=5)
+    >>> for s in ['R4', 'B2', 'M1', 'Y3']:
+    ...     _ = hand.receive(cfg.card_id(Card(s)))
+    >>> print(hand)
+    Y3 M1 B2 R4
+    >>> len(hand)
+    4
+    >>> print(cfg.card_from_id(hand.give(1)))
+    M1
+    >>> hand.slots
+    [3, 1, 0, 4, 2]
+    >>> hand.match(Clue(Colors.RED), bool_list=[False, False, True])
+    >>> print(hand.to_hand_public())  #doctest: +NORMALIZE_WHITESPACE
+    BGWY 12345 ,  BGWY 12345 ,  RM 12345
+    """
+
+    def __init__(self, cfg: Configuration, capacity: int):
+        self.cfg = cfg
+        self.capacity = capacity
+        self.n_cards = 0                                    # type: int
+        self.slots = list(range(capacity))                  # type: List[int]
+        self.card_ids = np.full(capacity, -1, dtype=np.int64)
+        self.can_be_c = np.zeros(capacity, dtype=np.int64)
+        self.can_be_v = np.zeros(capacity, dtype=np.int64)
+        self.yes_clued_c = np.zeros(capacity, dtype=np.int64)
+        self.yes_clued_v = np.zeros(capacity, dtype=np.int64)
+        self._all_c = (1 << cfg.n_colors) - 1               # type: int
+        self._all_v = (1 << cfg.n_values) - 1               # type: int
+
+    def colored(self) -> str:
+        if self.n_cards > 0 and all(
+                self.card_ids[self.slots[k]] >= 0 for k in range(len(self))):
+            return self.to_hand().colored()
+        return self.to_hand_public().colored()
+
+    def __len__(self) -> int:
+        return self.n_cards
+
+    def receive(self, card_id: int = -1) -> int:
+        """
+        Receive a card.
+
+        The card is added on the left (position 0), with no public knowledge.
+
+        :param card_id: the identifier of the card, or -1 if it is unknown (in
+            the point of view of the owner of the hand).
+
+        :return: the slot where the card is stored.
+
+        :raise ValueError: if the hand already holds :attr:`capacity` cards.
+
+        >>> cfg = Configuration.STANDARD
+        >>> hand = HandArray(cfg, capacity=5)
+        >>> hand.receive(cfg.card_id(Card('G2')))
+        0
+        >>> hand.receive()
+        1
+        >>> hand.slots
+        [1, 0, 2, 3, 4]
+        >>> hand = HandArray(cfg, capacity=1)
+        >>> hand.receive()
+        0
+        >>> hand.receive()
+        Traceback (most recent call last):
+        ValueError: The hand is full (capacity 1).
+        """
+        if self.n_cards >= self.capacity:
+            raise ValueError('The hand is full (capacity %s).'
+                             % self.capacity)
+        slot = self.slots.pop(self.n_cards)
+        self.slots.insert(0, slot)
+        self.n_cards += 1
+        self.card_ids[slot] = card_id
+        self.can_be_c[slot] = self._all_c
+        self.can_be_v[slot] = self._all_v
+        self.yes_clued_c[slot] = 0
+        self.yes_clued_v[slot] = 0
+        return slot
+
+    def give(self, k: int) -> int:
+        """
+        Give a card.
+
+        The slot of the card becomes free. The data of the other cards are not
+        moved.
+
+        :param k: the position of the card in the hand (0 = newest).
+
+        :return: the identifier of the card given (-1 if it is unknown).
+
+        >>> cfg = Configuration.STANDARD
+        >>> hand = HandArray(cfg, capacity=5)
+        >>> for s in ['R4', 'B2', 'G1', 'Y3']:
+        ...     _ = hand.receive(cfg.card_id(Card(s)))
+        >>> print(cfg.card_from_id(hand.give(1)))
+        G1
+        >>> print(hand)
+        Y3 B2 R4
+        """
+        slot = self.slots.pop(k)
+        self.slots.append(slot)
+        self.n_cards -= 1
+        return int(self.card_ids[slot])
+
+    def slot(self, k: int) -> int:
+        """
+        Slot of a card.
+
+        :param k: the position of the card in the hand (0 = newest).
+
+        :return: the slot where the card is stored.
+        """
+        return self.slots[k]
+
+    def matches(self, clue: Clue) -> List[bool]:
+        """
+        Cards that match a clue (all cards must be known).
+
+        :param clue: the clue.
+
+        :return: a list of booleans. The `k`-th coefficient is `True`
+            iff the card in position `k` matches the clue. Cf.
+            :meth:`Hand.match`.
+
+        >>> cfg = Configuration.STANDARD
+        >>> hand = HandArray(cfg, capacity=5)
+        >>> for s in ['R4', 'B2', 'G1', 'Y2']:
+        ...     _ = hand.receive(cfg.card_id(Card(s)))
+        >>> hand.matches(Clue(2))
+        [True, False, True, False]
+        >>> hand.matches(Clue(Colors.RED))
+        [False, False, False, True]
+        """
+        n_values = self.cfg.n_values
+        if clue.category == Clue.VALUE:
+            i_v = self.cfg.i_from_v(clue.x)
+            return [int(self.card_ids[slot]) % n_values == i_v
+                    for slot in self.slots[:self.n_cards]]
+        colors = self.cfg.colors
+        return [colors[int(self.card_ids[slot]) // n_values].match(clue.x)
+                for slot in self.slots[:self.n_cards]]
+
+    def match(self, clue: Clue, bool_list: List[bool]) -> None:
+        """
+        React to a clue.
+
+        Updates the public knowledge about the cards, with the same rules as
+        :meth:`CardPublic.match`.
+
+        :param clue: the clue.
+        :param bool_list: a list of booleans. The `k`-th coefficient is
+            `True` iff the card in position `k` matches the clue given.
+
+        >>> hand = HandArray(Configuration.STANDARD, capacity=4)
+        >>> for _ in range(4):
+        ...     _ = hand.receive()
+        >>> hand.match(clue=Clue(3), bool_list=[False, True, False, False])
+        >>> hand.match(clue=Clue(Colors.RED),
+        ...            bool_list=[False, True, False, False])
+        >>> print(hand)  #doctest: +NORMALIZE_WHITESPACE
+        BGWY 1245 ,     R3     ,  BGWY 1245 ,  BGWY 1245
+        """
+        slots = np.array(self.slots[:self.n_cards])
+        b = np.array(bool_list, dtype=bool)
+        yes, no = slots[b], slots[~b]
+        if clue.category == Clue.VALUE:
+            mask = 1 << self.cfg.i_from_v(clue.x)
+            self.can_be_v[yes] = mask
+            self.yes_clued_v[yes] |= mask
+            self.can_be_v[no] &= ~mask
+        else:
+            mask = sum(1 << i for i, c in enumerate(self.cfg.colors)
+                       if c.match(clue.x))
+            self.can_be_c[yes] &= mask
+            self.yes_clued_c[yes] = (
+                (self.yes_clued_c[yes] & mask) | self.can_be_c[yes])
+            self.can_be_c[no] &= ~mask
+            self.yes_clued_c[no] &= ~mask
+
+    def card(self, k: int) -> Card:
+        """
+        Card in a given position (it must be known).
+
+        :param k: the position of the card in the hand (0 = newest).
+
+        :return: a new :class:`Card`.
+        """
+        return self.cfg.card_from_id(int(self.card_ids[self.slots[k]]))
+
+    def card_public(self, k: int) -> CardPublic:
+        """
+        Public knowledge about the card in a given position.
+
+        :param k: the position of the card in the hand (0 = newest).
+
+        :return: a new :class:`CardPublic`.
+        """
+        slot = self.slots[k]
+        card = CardPublic(self.cfg)
+        for attribute in ['can_be_c', 'can_be_v', 'yes_clued_c',
+                          'yes_clued_v']:
+            bits = int(getattr(self, attribute)[slot])
+            array = getattr(card, attribute)
+            for i in range(len(array)):
+                array[i] = bool(bits >> i & 1)
+        return card
+
+    def to_hand(self) -> Hand:
+        """
+        Convert to a :class:`Hand` (all cards must be known).
+
+        :return: a new hand.
+        """
+        return Hand([self.card(k) for k in range(self.n_cards)])
+
+    def to_hand_public(self) -> HandPublic:
+        """
+        Convert to a :class:`HandPublic`.
+
+        :return: a new public hand.
+        """
+        hand = HandPublic(self.cfg)
+        hand.extend(self.card_public(k) for k in range(self.n_cards))
+        return hand
+
+
+if __name__ == '__main__':
+    my_cfg = Configuration.STANDARD
+    my_hand = HandArray(my_cfg, capacity=5)
+    for my_s in ['R4', 'B2', 'G1', 'Y3']:
+        my_hand.receive(my_cfg.card_id(Card(my_s)))
+    my_hand.test_str()
+
+    print('\nClue 2:')
+    my_hand.match(Clue(2), my_hand.matches(Clue(2)))
+    print(my_hand.to_hand_public().colored())
+
+    import doctest
+    doctest.testmod()
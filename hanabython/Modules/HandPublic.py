@@ -44,20 +44,27 @@ class HandPublic(Colored, list):
         is mostly used for examples and tests. In contrast, at the beginning of
         a game, the hand should be initialized with 0 cards, because cards will
         be given one by one to the players during the initial dealing of hands.
+    :param joint: whether the cards maintain their joint possibilities (cf.
+        :attr:`CardPublic.can_be`).
 
     >>> hand = HandPublic(cfg=Configuration.STANDARD, n_cards=4)
     >>> print(hand)
     BGRWY 12345, BGRWY 12345, BGRWY 12345, BGRWY 12345
     """
-    def __init__(self, cfg: Configuration, n_cards: int = 0):
+    def __init__(self, cfg: Configuration, n_cards: int = 0,
+                 joint: bool = False):
         super().__init__()
         self.cfg = cfg
+        self.joint = joint
         for i in range(n_cards):
             self.receive()
 
     def colored(self) -> str:
         return ', '.join([card.colored() for card in self])
 
+    def __str__(self) -> str:
+        return ', '.join([str(card) for card in self])
+
     def receive(self) -> None:
         """
         Receive a card.
@@ -72,7 +79,7 @@ class HandPublic(Colored, list):
         >>> print(hand)  #doctest: +NORMALIZE_WHITESPACE
         BGRWY 12345,   BGRWY 5  ,   BGRWY 5  , BGRWY 1234 , BGRWY 1234
         """
-        self.insert(0, CardPublic(self.cfg))
+        self.insert(0, CardPublic(self.cfg, self.joint))
 
     def give(self, k: int) -> None:
         """
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import json
+from typing import Dict, List
+from hanabython.Modules.Colored import Colored
+
+
+class LatencyHistograms(Colored):
+    """
+    Histograms of the durations of some calls, e.g. the callbacks of a player.
+
+    The durations are in nanoseconds and the buckets are powers of 2: a
+    duration ``d`` is counted in bucket ``d.bit_length()``, which contains the
+    durations from ``2 ** (bucket - 1)`` (included) to ``2 ** bucket``
+    (excluded). Hence the memory does not depend on the number of calls, and
+    histograms computed separately (e.g. in different games or worker
+    processes) can be combined with :meth:`merge`.
+
+    :var dict counts: for each method name, the list of the number of calls
+        in each bucket.
+    :var dict totals: for each method name, the total duration of the calls
+        (in nanoseconds).
+
+    >>> histograms = LatencyHistograms()
+    >>> for duration in [900, 1000, 1100, 5000]:
+    ...     histograms.add('choose_action', duration)
+    >>> histograms.add('receive_turn_begin', 300)
+    >>> histograms.counts['choose_action'][10:14]
+    [2, 1, 0, 1]
+    >>> other = LatencyHistograms()
+    >>> other.add('choose_action', 2000000)
+    >>> histograms.merge(other)
+    >>> print(histograms)
+    method                 calls total (ms)  mean (us)   p50 (us)   p99 (us)
+    choose_action              5       2.01    401.600      2.048   2097.152
+    receive_turn_begin         1       0.00      0.300      0.512      0.512
+    """
+
+    #: Number of buckets: enough for durations up to about 584 years.
+    N_BUCKETS = 65
+
+    def __init__(self):
+        self.counts = {}                        # type: Dict[str, List[int]]
+        self.totals = {}                        # type: Dict[str, int]
+
+    def colored(self) -> str:
+        lines = ['%-20s %7s %10s %10s %10s %10s' % (
+            'method', 'calls', 'total (ms)', 'mean (us)', 'p50 (us)',
+            'p99 (us)')]
+        for method in sorted(self.counts):
+            lines.append('%-20s %7d %10.2f %10.3f %10.3f %10.3f' % (
+                method, self.n_calls(method), self.totals[method] / 1e6,
+                self.mean(method) / 1e3, self.quantile(method, .5) / 1e3,
+                self.quantile(method, .99) / 1e3))
+        return '\n'.join(lines)
+
+    def add(self, method: str, duration: int) -> None:
+        """
+        Count a call.
+
+        :param method: the name of the method.
+        :param duration: the duration of the call, in nanoseconds.
+        """
+        try:
+            self.counts[method][duration.bit_length()] += 1
+            self.totals[method] += duration
+        except KeyError:
+            self.counts[method] = [0] * self.N_BUCKETS
+            self.counts[method][duration.bit_length()] += 1
+            self.totals[method] = duration
+
+    def n_calls(self, method: str) -> int:
+        """
+        Number of calls of a method.
+
+        :param method: the name of the method.
+
+        :return: the number of calls.
+        """
+        return sum(self.counts.get(method, []))
+
+    def mean(self, method: str) -> float:
+        """
+        Mean duration of the calls of a method.
+
+        :param method: the name of the method.
+
+        :return: the mean duration, in nanoseconds (exact, not estimated from
+            the histogram), or NaN if there was no call.
+        """
+        n_calls = self.n_calls(method)
+        if n_calls == 0:
+            return float('nan')
+        return self.totals[method] / n_calls
+
+    def quantile(self, method: str, q: float) -> int:
+        """
+        Quantile of the durations of the calls of a method.
+
+        :param method: the name of the method.
+        :param q: a number between 0 and 1, e.g. 0.99 for the 99th percentile.
+
+        :return: an upper bound of the quantile, in nanoseconds: the upper
+            limit of the bucket where it lies. Hence the result is within a
+            factor 2 of the actual quantile.
+
+        >>> histograms = LatencyHistograms()
+        >>> for duration in range(1, 101):
+        ...     histograms.add('choose_action', duration)
+        >>> histograms.quantile('choose_action', .5)
+        64
+        >>> histograms.quantile('choose_action', .99)
+        128
+        """
+        counts = self.counts[method]
+        threshold = q * sum(counts)
+        cumulated = 0
+        for bucket, count in enumerate(counts):
+            cumulated += count
+            if count and cumulated >= threshold:
+                return 2 ** bucket
+        return 0
+
+    def merge(self, other: 'LatencyHistograms') -> None:
+        """
+        Add the calls counted in other histograms.
+
+        :param other: other histograms.
+        """
+        for method, other_counts in other.counts.items():
+            counts = self.counts.setdefault(method, [0] * self.N_BUCKETS)
+            for bucket, count in enumerate(other_counts):
+                counts[bucket] += count
+            self.totals[method] = (self.totals.get(method, 0)
+                                   + other.totals[method])
+
+    def to_dict(self) -> dict:
+        """
+        Convert to a dictionary (e.g. to save it as JSON).
+
+        :return: a dictionary. For each method, the list of counts is
+            truncated after the last nonzero bucket. Cf. :meth:`from_dict`.
+
+        >>> histograms = LatencyHistograms()
+        >>> histograms.add('choose_action', 5)
+        >>> histograms.to_dict()
+        {'choose_action': {'total': 5, 'counts': [0, 0, 0, 1]}}
+        """
+        d = {}
+        for method, counts in self.counts.items():
+            length = max(bucket for bucket, count in enumerate(counts)
+                         if count) + 1
+            d[method] = {'total': self.totals[method],
+                         'counts': counts[:length]}
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> 'LatencyHistograms':
+        """
+        Convert from a dictionary.
+
+        :param d: a dictionary given by :meth:`to_dict`.
+
+        :return: the histograms.
+        """
+        histograms = cls()
+        for method, value in d.items():
+            counts = list(value['counts'])
+            histograms.counts[method] = (
+                counts + [0] * (cls.N_BUCKETS - len(counts)))
+            histograms.totals[method] = value['total']
+        return histograms
+
+    def to_json(self) -> str:
+        """
+        Convert to JSON.
+
+        :return: a JSON string. Cf. :meth:`from_json`.
+
+        >>> histograms = LatencyHistograms()
+        >>> histograms.add('choose_action', 5)
+        >>> s = histograms.to_json()
+        >>> print(LatencyHistograms.from_json(s).to_json() == s)
+        True
+        """
+        return json.dumps(self.to_dict(), sort_keys=True)
+
+    @classmethod
+    def from_json(cls, s: str) -> 'LatencyHistograms':
+        """
+        Convert from JSON.
+
+        :param s: a JSON string given by :meth:`to_json`.
+
+        :return: the histograms.
+        """
+        return cls.from_dict(json.loads(s))
+
+
+if __name__ == '__main__':
+    my_histograms = LatencyHistograms()
+    for my_duration in [900, 1000, 1100, 5000, 2000000]:
+        my_histograms.add('choose_action', my_duration)
+    my_histograms.test_str()
+
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import asyncio
+import logging
+import uuid
+from time import perf_counter, perf_counter_ns
+from typing import Callable, List
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.Configuration import Configuration
+from hanabython.Modules.LatencyHistograms import LatencyHistograms
+from hanabython.Modules.Player import Player
+from hanabython.Modules.PlayerScripted import PlayerScripted
+from hanabython.Modules.Server import Server, play_remote
+
+
+class LoadTest(Colored):
+    """
+    A load generator for a :class:`Server`.
+
+    The simulated clients all connect at the same time, so that there are
+    ``n_clients / n_players`` simultaneous tables. Each client plays
+    ``n_games`` full games in a row, with a cheap policy (by default
+    :class:`PlayerScripted`), hence the time is essentially spent in the
+    server and the network stack.
+
+    :param n_clients: the number of simultaneous clients (a multiple of
+        ``n_players``).
+    :param n_players: the number of players per table (the same as the
+        server).
+    :param n_games: the number of successive games played by each client.
+    :param host: the host of the server (for TCP).
+    :param port: the port of the server (for TCP).
+    :param path: the Unix socket of the server. If neither ``port`` nor
+        ``path`` is given, a :class:`Server` is started in the same event
+        loop: the measures then include the cost of the clients. To size a
+        deployment, run the server in its own process (cf.
+        ``benchmarks/benchmark_server.py``).
+    :param cfg: the configuration, for a server started by the test.
+    :param seed: the seed, for a server started by the test.
+    :param player_factory: a function that takes a name and returns the
+        player of a client.
+    :param timeout: the maximal duration of a game for a client (including
+        the wait for the partners), in seconds. A game that takes longer is
+        abandoned and counted as an error, so that a failed client does not
+        block her partners forever.
+
+    :var LatencyHistograms histograms: the round-trip times of the moves
+        (``'move'``) and the durations of the games (``'game'``), as seen by
+        the clients.
+    :var float duration: the duration of the test, in seconds.
+    :var int n_games_played: the number of games played until the end.
+    :var int n_errors: the number of games that failed for a client (e.g.
+        connection refused, closed before the end of the game, or timeout).
+        After a failure, the client goes on with her next game.
+    :var list scores: the scores of the games (one per game).
+
+    >>> load_test = LoadTest(n_clients=20, n_games=2, seed=0)
+    >>> load_test.run()
+    >>> load_test.n_games_played, load_test.n_errors
+    (20, 0)
+    >>> load_test.histograms.n_calls('move')
+    1780
+    >>> load_test.moves_per_second > 0
+    True
+
+    Errors are counted, and do not stop the test:
+
+    >>> load_test = LoadTest(n_clients=2, n_games=2, path='/nonexistent')
+    >>> load_test.run()
+    >>> load_test.n_games_played, load_test.n_errors
+    (0, 4)
+    """
+
+    def __init__(self, n_clients: int, n_players: int = 2, n_games: int = 1,
+                 host: str = '127.0.0.1', port: int = None, path: str = None,
+                 cfg: Configuration = Configuration.STANDARD,
+                 seed: int = None,
+                 player_factory: Callable[[str], Player] = PlayerScripted,
+                 timeout: float = 60.):
+        if n_clients % n_players:
+            raise ValueError('The number of clients must be a multiple of '
+                             'the number of players.')
+        self.n_clients = n_clients
+        self.n_players = n_players
+        self.n_games = n_games
+        self.host = host
+        self.port = port
+        self.path = path
+        self.cfg = cfg
+        self.seed = seed
+        self.player_factory = player_factory
+        self.timeout = timeout
+        self.histograms = LatencyHistograms()
+        self.duration = None                    # type: float
+        self.n_games_played = 0
+        self.n_errors = 0
+        self.scores = []                        # type: List[int]
+
+    def colored(self) -> str:
+        if self.duration is None:
+            return 'Load test: %s clients (not run).' % self.n_clients
+        lines = [
+            'Load test: %s clients, %s tables, %s games in %.2f s '
+            '(%s errors).' % (
+                self.n_clients, self.n_clients // self.n_players,
+                self.n_games_played, self.duration, self.n_errors),
+            'Throughput: %.1f games/s, %.0f moves/s.' % (
+                self.games_per_second, self.moves_per_second)]
+        if self.histograms.n_calls('move'):
+            lines.append(
+                'Round trip of a move (us): p50 %.0f, p90 %.0f, p99 %.0f, '
+                'p99.9 %.0f.' % tuple(
+                    self.histograms.quantile('move', q) / 1e3
+                    for q in (.5, .9, .99, .999)))
+        return '\n'.join(lines)
+
+    @property
+    def games_per_second(self) -> float:
+        """
+        Number of games played per second.
+        """
+        return self.n_games_played / self.duration
+
+    @property
+    def moves_per_second(self) -> float:
+        """
+        Number of moves played per second.
+        """
+        return self.histograms.n_calls('move') / self.duration
+
+    def run(self) -> None:
+        """
+        Run the test in a new event loop.
+        """
+        asyncio.run(self.run_async())
+
+    async def run_async(self) -> None:
+        """
+        Run the test in the current event loop.
+        """
+        server = None
+        host, port, path = self.host, self.port, self.path
+        if port is None and path is None:
+            server = Server(self.cfg, self.n_players, self.seed)
+            await server.start()
+            host, port = server.address
+        prefix = uuid.uuid4().hex[:8]
+        start = perf_counter()
+        await asyncio.gather(*[
+            self._client(i, prefix, host, port, path)
+            for i in range(self.n_clients)])
+        self.duration = perf_counter() - start
+        if server is not None:
+            await server.close()
+
+    async def _client(self, i: int, prefix: str, host: str, port: int,
+                      path: str) -> None:
+        """
+        Play the games of a simulated client.
+
+        :param i: the number of the client.
+        :param prefix: the prefix of the names of the tables.
+        :param host: the host of the server.
+        :param port: the port of the server.
+        :param path: the Unix socket of the server.
+        """
+        for r in range(self.n_games):
+            table = '%s-%s-%s' % (prefix, r, i // self.n_players)
+            start = perf_counter_ns()
+            try:
+                score = await asyncio.wait_for(play_remote(
+                    self.player_factory('Client %s' % i), table, host=host,
+                    port=port, path=path, histograms=self.histograms),
+                    self.timeout)
+            except (OSError, asyncio.TimeoutError, ValueError) as e:
+                logging.warning('Client %s failed at table %s: %r.'
+                                % (i, table, e))
+                score = None
+            if score is None:
+                self.n_errors += 1
+                continue
+            self.histograms.add('game', perf_counter_ns() - start)
+            if i % self.n_players == 0:
+                self.n_games_played += 1
+                self.scores.append(score)
+
+
+if __name__ == '__main__':
+    my_load_test = LoadTest(n_clients=100, n_games=2)
+    my_load_test.test_str()
+    my_load_test.run()
+    print(my_load_test)
+    print(my_load_test.histograms)
+
+    import doctest
+    doctest.testmod()
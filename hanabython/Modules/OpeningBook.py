@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import numpy as np
+from typing import Callable, Dict, Iterable, Union
+from hanabython.Modules.Action import Action
+from hanabython.Modules.ActionSpace import ActionSpace
+from hanabython.Modules.ColorPermutation import ColorPermutation
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.Configuration import Configuration
+from hanabython.Modules.Game import Game
+from hanabython.Modules.PlayerBase import PlayerBase
+
+
+class OpeningBook(Colored):
+    """
+    A table of precomputed decisions for the first turns of the game.
+
+    The decisions are indexed by the canonical key of the view of the active
+    player: :meth:`PlayerBase.view_key`, after the canonical permutation of
+    the interchangeable colors (cf. :class:`ColorPermutation`). Hence a
+    decision is shared between all the views that are equivalent up to such
+    a permutation, which is correct only for a policy that is itself
+    invariant under these permutations. The actions are stored by their
+    index in an :class:`ActionSpace`.
+
+    The book is typically computed offline (cf. :meth:`compute`), saved with
+    :meth:`save` and loaded with :meth:`load`. During a game, it is consulted
+    by :class:`PlayerOpeningBook`.
+
+    :param cfg: the configuration of the game.
+    :param n_players: the number of players.
+
+    :var int min_n_cards: the minimal number of cards in the draw pile
+        among the entries. Views with fewer cards in the draw pile are
+        rejected without computing their key.
+
+    >>> from hanabython import PlayerRandom
+    >>> book = OpeningBook(Configuration.STANDARD, n_players=2)
+    >>> antoine = PlayerRandom('Antoine', seed=0)
+    >>> donald = PlayerRandom('Donald X', seed=1)
+    >>> game = Game([antoine, donald], seed=0)
+    >>> game.start()
+    >>> _ = game.begin_turn()
+    >>> action = antoine.choose_action()
+    >>> print(action)
+    Clue R to player in relative position 1
+    >>> book.add(antoine, action)
+    >>> print(book)
+    Opening book (standard, 2 players): 1 entries.
+    >>> print(book.lookup(antoine))
+    Clue R to player in relative position 1
+    >>> print(book.lookup(donald))
+    None
+    """
+
+    def __init__(self, cfg: Configuration, n_players: int):
+        self.cfg = cfg
+        self.n_players = n_players
+        self.action_space = ActionSpace(cfg, n_players)     # type: ActionSpace
+        self.min_n_cards = int(cfg.n_cards)                 # type: int
+        self._entries = {}                          # type: Dict[bytes, int]
+
+    def colored(self) -> str:
+        return 'Opening book (%s, %s players): %s entries.' % (
+            self.cfg.name, self.n_players, len(self))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _key(self, player: PlayerBase):
+        """
+        Canonical key of the view of a player.
+
+        :param player: the player.
+
+        :return: the canonical permutation and the key.
+        """
+        permutation = ColorPermutation.canonical_for_player(player)
+        return permutation, player.view_key(permutation)
+
+    def add(self, player: PlayerBase, action: Action) -> None:
+        """
+        Add a decision.
+
+        :param player: the active player, whose view is the key.
+        :param action: the action chosen by the player.
+        """
+        permutation, key = self._key(player)
+        self._store(permutation, key, action, player.draw_pile.n_cards)
+
+    def _store(self, permutation: ColorPermutation, key: bytes,
+               action: Action, n_cards: int) -> None:
+        """
+        Store a decision.
+
+        :param permutation: the canonical permutation of the view.
+        :param key: the canonical key of the view.
+        :param action: the action chosen by the player.
+        :param n_cards: the number of cards in the draw pile.
+        """
+        self._entries[key] = self.action_space.index(
+            permutation.apply_action(action))
+        self.min_n_cards = min(self.min_n_cards, int(n_cards))
+
+    def lookup(self, player: PlayerBase) -> Union[Action, None]:
+        """
+        Look up a decision.
+
+        :param player: the active player.
+
+        :return: the action stored for her view (translated into the actual
+            colors of her game), or None if there is none.
+        """
+        if (player.draw_pile.n_cards < self.min_n_cards
+                or player.n_players != self.n_players
+                or player.cfg.name != self.cfg.name):
+            return None
+        permutation, key = self._key(player)
+        a = self._entries.get(key)
+        if a is None:
+            return None
+        return permutation.inverse().apply_action(self.action_space.actions[a])
+
+    def save(self, path: str) -> None:
+        """
+        Save the book in a compressed file (numpy format ``.npz``).
+
+        The configuration must be registered (cf.
+        :meth:`Configuration.register`): only its name is stored. The keys
+        are stored in a matrix of bytes (with their lengths), the actions by
+        their indexes, along with :attr:`min_n_cards`.
+
+        :param path: the path of the file.
+        """
+        if not self.cfg.is_registered:
+            raise ValueError('The configuration must be registered.')
+        lengths = np.array([len(key) for key in self._entries],
+                           dtype=np.uint16)
+        keys = np.zeros((len(self), max(lengths, default=0)), dtype=np.uint8)
+        for row, key in zip(keys, self._entries):
+            row[:len(key)] = np.frombuffer(key, dtype=np.uint8)
+        np.savez_compressed(
+            path, cfg=np.array(self.cfg.name), n_players=self.n_players,
+            min_n_cards=self.min_n_cards, keys=keys, lengths=lengths,
+            actions=np.array(list(self._entries.values()), dtype=np.uint16))
+
+    @classmethod
+    def load(cls, path: str) -> 'OpeningBook':
+        """
+        Load a book saved with :meth:`save`.
+
+        :param path: the path of the file.
+
+        :return: the book.
+
+        >>> import os, tempfile
+        >>> from hanabython import PlayerRandom
+        >>> book = OpeningBook.compute(
+        ...     lambda name: PlayerRandom(name, seed=0), n_players=3,
+        ...     seeds=range(20), n_turns=2)
+        >>> print(book)
+        Opening book (standard, 3 players): 40 entries.
+        >>> with tempfile.TemporaryDirectory() as directory:
+        ...     path = os.path.join(directory, 'book.npz')
+        ...     book.save(path)
+        ...     book_bis = OpeningBook.load(path)
+        >>> book_bis._entries == book._entries
+        True
+        >>> book_bis.min_n_cards == book.min_n_cards
+        True
+        """
+        with np.load(path) as data:
+            book = cls(Configuration.from_name(str(data['cfg'])),
+                       int(data['n_players']))
+            for row, length, a in zip(data['keys'], data['lengths'],
+                                      data['actions']):
+                book._entries[row[:length].tobytes()] = int(a)
+            book.min_n_cards = int(data['min_n_cards'])
+        return book
+
+    @classmethod
+    def compute(cls, player_factory: Callable[[str], PlayerBase],
+                n_players: int, seeds: Iterable[int],
+                cfg: Configuration = Configuration.STANDARD,
+                n_turns: int = 1) -> 'OpeningBook':
+        """
+        Compute a book by playing the first turns of some games.
+
+        :param player_factory: a function that takes a name and returns a
+            player (typically a deterministic search bot).
+        :param n_players: the number of players.
+        :param seeds: the seeds of the games.
+        :param cfg: the configuration of the game.
+        :param n_turns: the number of turns played in each game. The decision
+            of the active player is stored for each of these turns, provided
+            the game accepts it. A game stops at the first forfeit or illegal
+            action, which is not stored.
+
+        :return: the book.
+
+        >>> from hanabython import ActionForfeit, ActionThrow
+        >>> class PlayerQuitter(PlayerBase):
+        ...     def choose_action(self):
+        ...         return ActionForfeit()
+        >>> class PlayerDiscarder(PlayerBase):
+        ...     def choose_action(self):
+        ...         return ActionThrow(0)
+        >>> print(OpeningBook.compute(PlayerQuitter, n_players=2,
+        ...                           seeds=range(3)))
+        Opening book (standard, 2 players): 0 entries.
+        >>> print(OpeningBook.compute(PlayerDiscarder, n_players=2,
+        ...                           seeds=range(3)))
+        Opening book (standard, 2 players): 0 entries.
+        """
+        book = cls(cfg, n_players)
+        for seed in seeds:
+            players = [player_factory('Player %s' % (i + 1))
+                       for i in range(n_players)]
+            game = Game(players, cfg, seed=seed)
+            game.start()
+            for _ in range(n_turns):
+                if game.begin_turn() is not None:
+                    break
+                player = game.active
+                action = player.choose_action()
+                if action.category == Action.FORFEIT:
+                    break
+                # The key is the view before the action.
+                permutation, key = book._key(player)
+                n_cards = player.draw_pile.n_cards
+                if not game.execute_action(action):
+                    break
+                book._store(permutation, key, action, n_cards)
+                if game.finish_turn() is not None:
+                    break
+        return book
+
+
+if __name__ == '__main__':
+    from hanabython.Modules.PlayerRandom import PlayerRandom
+    my_book = OpeningBook.compute(lambda name: PlayerRandom(name, seed=0),
+                                  n_players=2, seeds=range(100))
+    my_book.test_str()
+
+    import doctest
+    doctest.testmod()
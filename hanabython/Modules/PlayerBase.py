@@ -18,18 +18,21 @@ This file is part of Hanabython.
     You should have received a copy of the GNU General Public License
     along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
 """
+import numpy as np
 from typing import List
 from hanabython.Modules.Clue import Clue
 from hanabython.Modules.Card import Card
-from hanabython.Modules.StringUtils import uncolor, title
+from hanabython.Modules.StringUtils import uncolor, title, cached_rendering
 from hanabython.Modules.Configuration import Configuration
 from hanabython.Modules.ConfigurationEndRule import ConfigurationEndRule
 from hanabython.Modules.Board import Board
+from hanabython.Modules.CardClassification import CardClassification
 from hanabython.Modules.DiscardPile import DiscardPile
 from hanabython.Modules.DrawPilePublic import DrawPilePublic
 from hanabython.Modules.DrawPile import DrawPile
 from hanabython.Modules.Hand import Hand
 from hanabython.Modules.HandPublic import HandPublic
+from hanabython.Modules.CardPublic import CardPublic
 from hanabython.Modules.StringAnsi import StringAnsi
 from hanabython.Modules.Player import Player
 
@@ -80,9 +83,21 @@ class PlayerBase(Player):
         Cf. :meth:`log`.
     :var int display_width: the width of the display on the terminal (in number
         of characters).
+    :var CardClassification classification: which cards are playable,
+        useless or critical, given :attr:`board` and :attr:`discard_pile`.
 
     >>> antoine = PlayerBase(name='Antoine')
     """
+
+    #: Whether the cards of :attr:`hands_public` maintain their joint
+    #: possibilities (cf. :attr:`CardPublic.can_be`). Subclasses that need
+    #: them may set this to True.
+    joint_knowledge = False
+
+    #: A :class:`DecisionCache` used by the methods decorated with
+    #: :func:`cached_decision`, or None (no cache).
+    decision_cache = None
+
     def __init__(self, name: str):
         super().__init__(name)
         self.player_names = None        # type: List[str]
@@ -100,6 +115,8 @@ class PlayerBase(Player):
         self.dealing_is_ongoing = None  # type: bool
         self.recent_events = None       # type: str
         self.display_width = None       # type: int
+        self.classification = None      # type: CardClassification
+        self._render_cache = {}
 
     # *** String functions ***
 
@@ -114,10 +131,186 @@ class PlayerBase(Player):
                 title(attr, repr_width) + '\n'
                 + str(self.__getattribute__(attr)) + '\n'
                 for attr in sorted(self.__dict__.keys())
+                if not attr.startswith('_')
             ])
             + '>'
         )
 
+    def __getstate__(self) -> dict:
+        """
+        State of the player, for pickling.
+
+        The board, the discard pile and the hands are stored as card
+        identifiers (cf. :meth:`Configuration.card_id`) and the public
+        knowledge about the cards as bitmasks, instead of object graphs. A
+        registered configuration is stored by its name (cf.
+        :meth:`Configuration.register`). The caches are not stored: they are
+        rebuilt when unpickling.
+
+        >>> from pickle import dumps, loads
+        >>> antoine = PlayerBase('Antoine')
+        >>> antoine.receive_init(Configuration.STANDARD,
+        ...                      player_names=['Antoine', 'Donald X'])
+        >>> antoine.receive_i_draw()
+        >>> for s in ['B1', 'G3']:
+        ...     antoine.receive_partner_draws(i_active=1, card=Card(s))
+        >>> antoine.receive_someone_clues(
+        ...     i_active=1, i_clued=0, clue=Clue(3), bool_list=[True])
+        >>> antoine.receive_someone_plays_card(
+        ...     i_active=1, k=1, card=Card('B1'))
+        >>> clone = loads(dumps(antoine))
+        >>> clone.board.score
+        1
+        >>> print(clone.hands[1])
+        G3
+        >>> clone.hands_public[0][0].can_be_v
+        array([False, False,  True, False, False])
+        >>> clone.cfg is Configuration.STANDARD
+        True
+        >>> len(dumps(antoine)) < 1000
+        True
+        """
+        state = self.__dict__.copy()
+        cfg = self.cfg
+        if cfg is None:
+            return state
+        if cfg.is_registered:
+            state['cfg'] = cfg.name
+        card_id = cfg.card_id
+        state['board'] = (self.board.backend,
+                          bytes(list(self.board.altitude)))
+        state['discard_pile'] = (
+            self.discard_pile.backend,
+            bytes(card_id(card) for card in self.discard_pile.chronological))
+        state['draw_pile'] = int(self.draw_pile.n_cards)
+        state['classification'] = None
+        state['hands'] = [bytes(card_id(card) for card in hand)
+                          for hand in self.hands]
+        state['hands_public'] = [[_card_public_masks(card) for card in hand]
+                                 for hand in self.hands_public]
+        state['_render_cache'] = {}
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if isinstance(self.cfg, str):
+            self.cfg = Configuration.from_name(self.cfg)
+        cfg = self.cfg
+        if cfg is None:
+            return
+        backend, altitude = state['board']
+        self.board = Board(cfg, backend)
+        for c, v_max in zip(cfg.colors, altitude):
+            for v in range(1, v_max + 1):
+                self.board.try_to_play(Card(c, v))
+        backend, card_ids = state['discard_pile']
+        self.discard_pile = DiscardPile(cfg, backend)
+        for card_id in card_ids:
+            self.discard_pile.receive(cfg.card_from_id(card_id))
+        self.classification = CardClassification(self.board, self.discard_pile)
+        self.draw_pile = DrawPilePublic(cfg)
+        self.draw_pile.n_cards = state['draw_pile']
+        self.hands = [Hand([cfg.card_from_id(card_id) for card_id in ids])
+                      for ids in state['hands']]
+        self.hands_public = []
+        for masks in state['hands_public']:
+            hand = HandPublic(cfg, n_cards=len(masks),
+                              joint=self.joint_knowledge)
+            for card, card_masks in zip(hand, masks):
+                card.can_be_c[:] = _from_bitmask(card_masks[0], cfg.n_colors)
+                card.can_be_v[:] = _from_bitmask(card_masks[1], cfg.n_values)
+                card.yes_clued_c[:] = _from_bitmask(card_masks[2],
+                                                    cfg.n_colors)
+                card.yes_clued_v[:] = _from_bitmask(card_masks[3],
+                                                    cfg.n_values)
+                if card.joint:
+                    card.can_be[:] = np.reshape(_from_bitmask(
+                        card_masks[4], cfg.n_colors * cfg.n_values),
+                        card.can_be.shape)
+            self.hands_public.append(hand)
+
+    def view_key(self, permutation: 'ColorPermutation' = None) -> bytes:
+        """
+        Canonical representation of what this player knows about the game.
+
+        It encodes the configuration (cf. :attr:`Configuration.fingerprint`),
+        the counters, the board, the content of the discard pile
+        (regardless of the order of the discards), the number of cards in the
+        draw pile, the partners' hands and the public knowledge about all the
+        hands (including the joint possibilities :attr:`CardPublic.can_be`
+        when they are maintained). Two players with the same view have the
+        same key. This is typically used as a key for :class:`DecisionCache`.
+
+        :param permutation: if given, the key of the view where the colors
+            are permuted (cf. :class:`ColorPermutation`). With
+            :meth:`ColorPermutation.canonical_for_player`, two views that are
+            equivalent up to interchangeable colors have the same key.
+
+        :return: the key.
+
+        >>> antoine = PlayerBase('Antoine')
+        >>> antoine.demo_game()
+        >>> len(antoine.view_key())
+        93
+        >>> donald = PlayerBase('Donald X')
+        >>> donald.demo_game()
+        >>> antoine.view_key() == donald.view_key()
+        True
+
+        The same cards under another configuration give another key, since a
+        clue does not have the same effects:
+
+        >>> from hanabython import Card
+        >>> def key_with_red_cards(cfg):
+        ...     player = PlayerBase('Antoine')
+        ...     player.receive_init(cfg, player_names=['Antoine', 'Donald X'])
+        ...     player.receive_partner_draws(i_active=1, card=Card('R1'))
+        ...     return player.view_key()
+        >>> (key_with_red_cards(Configuration.W_SIXTH)
+        ...  == key_with_red_cards(Configuration.W_MULTICOLOR))
+        False
+
+        With joint knowledge, refining :attr:`CardPublic.can_be` changes the
+        key:
+
+        >>> class PlayerJoint(PlayerBase):
+        ...     joint_knowledge = True
+        >>> antoine = PlayerJoint('Antoine')
+        >>> antoine.demo_game()
+        >>> key = antoine.view_key()
+        >>> antoine.hands_public[0][0].can_be[0, 0] = False
+        >>> antoine.view_key() == key
+        False
+        """
+        card_id = self.cfg.card_id
+        order = slice(None) if permutation is None else permutation.preimage
+        counters = [
+            self.n_clues, self.n_misfires, self.draw_pile.n_cards,
+            255 if self.remaining_turns is None else self.remaining_turns]
+        counters.extend(np.asarray(self.board.altitude)[order])
+        discards = np.asarray(self.discard_pile.array, dtype=np.uint8)[order]
+        cards = []
+        knowledge = []
+        for hand, hand_public in zip(self.hands, self.hands_public):
+            cards.append(len(hand_public))
+            if permutation is None:
+                cards.extend(card_id(card) for card in hand)
+            else:
+                cards.extend(permutation.apply_card_id(card_id(card))
+                             for card in hand)
+            for card in hand_public:
+                knowledge.extend((card.can_be_c[order], card.can_be_v,
+                                  card.yes_clued_c[order], card.yes_clued_v))
+                if card.joint:
+                    knowledge.append(card.can_be[order].ravel())
+        return b''.join([
+            self.cfg.fingerprint,
+            bytes(counters),
+            discards.tobytes(),
+            bytes(cards),
+            np.packbits(np.concatenate(knowledge)).tobytes(),
+        ])
+
     def colored(self) -> str:
         if self.cfg is None:
             return super().colored()
@@ -147,12 +340,14 @@ class PlayerBase(Player):
         )
         return '\n'.join(lines)
 
+    @cached_rendering
     def colored_hands(self) -> str:
         """
         A string used to display the hands of all players.
 
         :return: the string (whose width is usually :attr:`display_width`,
-            except maybe in the end of game when the hands are shorter).
+            except maybe in the end of game when the hands are shorter). It
+            is cached until the next draw, discard, play or clue.
 
         >>> antoine = PlayerBase('Antoine')
         >>> antoine.demo_game()
@@ -295,6 +490,9 @@ class PlayerBase(Player):
         Number of misfires: 3.
         Clues rule: empty clues are forbidden.
         End rule: normal.
+        ********************* classification **********************
+        Playable: B1 G1 R1 W1 Y1
+        Critical: B5 G5 R5 W5 Y5
         ******************* dealing_is_ongoing ********************
         False
         ********************** discard_pile ***********************
@@ -338,11 +536,14 @@ class PlayerBase(Player):
         self.board = Board(cfg)
         self.draw_pile = DrawPilePublic(cfg)
         self.discard_pile = DiscardPile(cfg)
+        self.classification = CardClassification(self.board, self.discard_pile)
         self.n_clues = cfg.n_clues
         self.n_misfires = 0
         self.hand_size = cfg.hand_size_rule.f(self.n_players)
         self.hands = [Hand() for _ in player_names]
-        self.hands_public = [HandPublic(cfg) for _ in player_names]
+        self.hands_public = [HandPublic(cfg, joint=self.joint_knowledge)
+                             for _ in player_names]
+        self._render_cache.clear()
         self.dealing_is_ongoing = False
         self.display_width = (
             self.cfg.n_colors + 3 + self.cfg.n_values) * self.hand_size - 2
@@ -421,6 +622,7 @@ class PlayerBase(Player):
             return
         self.draw_pile.give()
         self.hands_public[0].receive()
+        self._render_cache.clear()
         self.log('%s draws a card.\n' % self.name)
 
     def receive_partner_draws(self, i_active: int, card: Card) -> None:
@@ -468,6 +670,7 @@ class PlayerBase(Player):
         self.draw_pile.give()
         self.hands[i_active].receive(card)
         self.hands_public[i_active].receive()
+        self._render_cache.clear()
         self.log('%s draws %s.\n' % (
             self.player_names[i_active], card.colored()))
 
@@ -500,6 +703,7 @@ class PlayerBase(Player):
         self.hands_public[i_active].give(k)
         if i_active != 0:
             self.hands[i_active].give(k)
+        self._render_cache.clear()
         self.discard_pile.receive(card)
         self.n_clues += 1
         self.log('%s discards %s.\n' % (
@@ -551,6 +755,7 @@ class PlayerBase(Player):
         self.hands_public[i_active].give(k)
         if i_active != 0:
             self.hands[i_active].give(k)
+        self._render_cache.clear()
         success = self.board.try_to_play(card)
         if success:
             self.log('%s plays %s' % (
@@ -593,6 +798,7 @@ class PlayerBase(Player):
         """
         self.n_clues -= 1
         self.hands_public[i_clued].match(clue, bool_list)
+        self._render_cache.clear()
         self.log(
             '%s clues %s about %s.\n'
             % (self.player_names[i_active], self.player_names[i_clued],
@@ -742,6 +948,57 @@ class PlayerBase(Player):
         self.receive_i_draw()
 
 
+def _card_public_masks(card: CardPublic) -> tuple:
+    """
+    Public knowledge about a card, as bitmasks.
+
+    :param card: the public part of a card.
+
+    :return: the bitmasks of :attr:`CardPublic.can_be_c`,
+        :attr:`CardPublic.can_be_v`, :attr:`CardPublic.yes_clued_c`,
+        :attr:`CardPublic.yes_clued_v` and, if the card is joint,
+        :attr:`CardPublic.can_be` (flattened).
+
+    >>> card = CardPublic(Configuration.STANDARD)
+    >>> card.match(Clue(3), b=True)
+    >>> _card_public_masks(card)
+    (31, 4, 0, 4)
+    """
+    arrays = [card.can_be_c, card.can_be_v, card.yes_clued_c, card.yes_clued_v]
+    if card.joint:
+        arrays.append(card.can_be.ravel())
+    return tuple(_to_bitmask(a) for a in arrays)
+
+
+def _to_bitmask(a: np.array) -> int:
+    """
+    Convert an array of booleans to a bitmask.
+
+    :param a: an array of booleans.
+
+    :return: the integer whose bit ``i`` is ``a[i]``.
+
+    >>> _to_bitmask(np.array([True, False, True]))
+    5
+    """
+    return sum(1 << i for i, b in enumerate(a) if b)
+
+
+def _from_bitmask(mask: int, n: int) -> List[bool]:
+    """
+    Convert a bitmask to a list of booleans.
+
+    :param mask: the bitmask.
+    :param n: the length of the list.
+
+    :return: the list whose element ``i`` is bit ``i`` of :attr:`mask`.
+
+    >>> _from_bitmask(5, 3)
+    [True, False, True]
+    """
+    return [bool(mask >> i & 1) for i in range(n)]
+
+
 if __name__ == '__main__':
     my_antoine = PlayerBase(name='Antoine')
     my_antoine.test_str()
@@ -26,7 +26,7 @@ from hanabython.Modules.ActionPlayCard import ActionPlayCard
 from hanabython.Modules.ActionThrow import ActionThrow
 from hanabython.Modules.ActionForfeit import ActionForfeit
 from hanabython.Modules.Clue import Clue
-from IPython.display import clear_output
+from hanabython.Modules.TerminalRenderer import TerminalRenderer
 from time import sleep
 
 
@@ -35,14 +35,49 @@ class PlayerHumanText(PlayerBase):
     User interface for a human player in text mode (terminal or notebook).
 
     :param ipython: use `True` when using the player in a notebook. This
-        fixes a problem between ``clear_output`` and ``input``.
+        fixes a problem between ``clear_output`` and ``input``. IPython is
+        imported only in that case.
+    :param renderer: if None (default), the whole screen is printed at the
+        beginning of each turn, after blank lines that hide the previous
+        one and a pause (so that several humans can share the terminal).
+        With a :class:`TerminalRenderer`, the screen is displayed without
+        pause and only the lines that changed are redrawn: this is faster,
+        e.g. over SSH, but meant for a terminal used by only one human. The
+        prompts and messages are written below the frame, cf.
+        :meth:`TerminalRenderer.write`.
 
     >>> antoine = PlayerHumanText('Antoine', ipython=True)
+    >>> donald = PlayerHumanText('Donald X', renderer=TerminalRenderer())
     """
 
-    def __init__(self, name: str, ipython=False):
+    def __init__(self, name: str, ipython=False,
+                 renderer: TerminalRenderer = None):
         super().__init__(name)
         self.ipython = ipython
+        self.renderer = renderer
+
+    def _print(self, s: str) -> None:
+        """
+        Print a message (below the frame, if there is a renderer).
+
+        :param s: the message.
+        """
+        if self.renderer is None:
+            print(s)
+        else:
+            self.renderer.write(s + '\n')
+
+    def _input(self, prompt: str) -> str:
+        """
+        Ask the user for an input (below the frame, if there is a renderer).
+
+        :param prompt: the prompt.
+
+        :return: the answer of the user.
+        """
+        if self.renderer is None:
+            return input(prompt)
+        return self.renderer.input(prompt)
 
     # *** General methods about actions ***
 
@@ -50,8 +85,12 @@ class PlayerHumanText(PlayerBase):
         """
         We pause, then we inform the player of the most recent events.
         """
+        if self.renderer is not None:
+            self.renderer.render(self.colored())
+            return
         print('\n' * 40)
         if self.ipython:
+            from IPython.display import clear_output
             clear_output()
             sleep(0.5)  # Essential line to prevent strange behavior in Jupyter!
         input('%s is going to play (hit Enter).\n' % self.name)
@@ -67,15 +106,15 @@ class PlayerHumanText(PlayerBase):
                     'D': Action.THROW, 'F': Action.FORFEIT}
         while True:
             if category is None:
-                cat_str = input('\nWhat action? (C = Clue, P = Play, '
-                                'D = Discard, F = Forfeit)\n')
+                cat_str = self._input('\nWhat action? (C = Clue, P = Play, '
+                                      'D = Discard, F = Forfeit)\n')
                 if not cat_str:  # Nothing in the input => try again
                     continue
                 cat_str = cat_str[0].capitalize()
                 if cat_str in cat_dico.keys():
                     category = cat_dico[cat_str]
             elif category in {Action.PLAY_CARD, Action.THROW}:
-                k_str = input('What card? (1 = leftmost, etc.)\n')
+                k_str = self._input('What card? (1 = leftmost, etc.)\n')
                 try:
                     k = int(k_str) - 1
                 except ValueError:  # Not valid => cancel
@@ -86,7 +125,8 @@ class PlayerHumanText(PlayerBase):
                 else:
                     return ActionThrow(k)
             elif category == Action.FORFEIT:
-                confirm_str = input('Do you confirm forfeit? (Y/N)\n')
+                confirm_str = self._input(
+                    'Do you confirm forfeit? (Y/N)\n')
                 if not confirm_str:  # Nothing in the input => cancel
                     category = None
                     continue
@@ -99,13 +139,15 @@ class PlayerHumanText(PlayerBase):
                     if self.n_players == 2:
                         i = 1
                         continue
-                    i_str = input('What player? (1 = next player, etc.)\n')
+                    i_str = self._input(
+                        'What player? (1 = next player, etc.)\n')
                     try:
                         i = int(i_str)
                     except ValueError:  # Not valid => cancel
                         category = None
                 else:
-                    clue_str = input('What clue? (B, G, ..., 1, 2, ...)\n')
+                    clue_str = self._input(
+                        'What clue? (B, G, ..., 1, 2, ...)\n')
                     try:
                         return ActionClue(i, Clue(int(clue_str)))
                     except ValueError:
@@ -143,7 +185,7 @@ class PlayerHumanText(PlayerBase):
         self.log_forget()
 
     def receive_action_illegal(self, s: str) -> None:
-        print(s)
+        self._print(s)
 
     def receive_turn_finished(self) -> None:
         """
@@ -151,9 +193,9 @@ class PlayerHumanText(PlayerBase):
         of her actions. Then we pause (unless this string was empty).
         Finally, we forget these recent events.
         """
-        print(self.recent_events)
+        self._print(self.recent_events)
         if self.recent_events:
-            input("Your turn is over (hit Enter).\n")
+            self._input("Your turn is over (hit Enter).\n")
         self.log_forget()
 
     # *** End of game ***
@@ -175,7 +217,7 @@ class PlayerHumanText(PlayerBase):
         ''
         """
         super().receive_lose(score)
-        print(self.recent_events)
+        self._print(self.recent_events)
         self.log_forget()
 
     def receive_game_exhausted(self, score: int) -> None:
@@ -195,7 +237,7 @@ class PlayerHumanText(PlayerBase):
         ''
         """
         super().receive_game_exhausted(score)
-        print(self.recent_events)
+        self._print(self.recent_events)
         self.log_forget()
 
     def receive_win(self, score: int) -> None:
@@ -215,7 +257,7 @@ class PlayerHumanText(PlayerBase):
         ''
         """
         super().receive_win(score)
-        print(self.recent_events)
+        self._print(self.recent_events)
         self.log_forget()
 
 
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from hanabython.Modules.Action import Action
+from hanabython.Modules.OpeningBook import OpeningBook
+from hanabython.Modules.PlayerBase import PlayerBase
+from hanabython.Modules.PlayerWrapper import PlayerWrapper
+
+
+class PlayerOpeningBook(PlayerWrapper):
+    """
+    A wrapper that plays the decisions of an opening book when possible.
+
+    When the wrapped player must choose an action, her view is looked up in
+    the :class:`OpeningBook`. If it is found, the stored action is played;
+    otherwise, the wrapped player chooses. All the other callbacks are
+    transmitted to the wrapped player and the other attributes are read from
+    her (cf. :class:`PlayerWrapper`).
+
+    :param player: the player (a :class:`PlayerBase`).
+    :param book: the opening book, typically computed with the same policy
+        as the wrapped player.
+
+    :var int n_hits: the number of decisions found in the book.
+
+    >>> from hanabython import Game, PlayerRandom
+    >>> book = OpeningBook.compute(
+    ...     lambda name: PlayerRandom(name, seed=0), n_players=2,
+    ...     seeds=range(10))
+    >>> antoine = PlayerOpeningBook(PlayerRandom('Antoine', seed=0), book)
+    >>> donald = PlayerOpeningBook(PlayerRandom('Donald X', seed=1), book)
+    >>> _ = Game([antoine, donald], seed=3).play()
+    >>> antoine.n_hits, donald.n_hits
+    (1, 0)
+    >>> antoine.name
+    'Antoine'
+    """
+
+    def __init__(self, player: PlayerBase, book: OpeningBook):
+        super().__init__(player)
+        self.book = book
+        self.n_hits = 0
+
+    def choose_action(self) -> Action:
+        action = self.book.lookup(self.player)
+        if action is None:
+            return super().choose_action()
+        self.n_hits += 1
+        return action
+
+
+if __name__ == '__main__':
+    from hanabython.Modules.Game import Game
+    from hanabython.Modules.PlayerRandom import PlayerRandom
+    my_book = OpeningBook.compute(lambda name: PlayerRandom(name, seed=0),
+                                  n_players=2, seeds=range(100))
+    my_players = [PlayerOpeningBook(PlayerRandom('Antoine', seed=0), my_book),
+                  PlayerOpeningBook(PlayerRandom('Donald X', seed=0), my_book)]
+    my_players[0].test_str()
+    Game(my_players, seed=42).play()
+    print(my_players[0].n_hits)
+
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from array import array
+from random import Random
+from typing import List
+from hanabython.Modules.Action import Action
+from hanabython.Modules.ActionPlayCard import ActionPlayCard
+from hanabython.Modules.ActionSpace import ActionSpace
+from hanabython.Modules.Configuration import Configuration
+from hanabython.Modules.PlayerBase import PlayerBase
+
+
+class PlayerRandom(PlayerBase):
+    """
+    A player who chooses an action at random among the legal ones.
+
+    This player is mostly useful as a baseline and to test simulation tools.
+
+    :param name: the name of the player.
+    :param seed: the seed of the random generator of this player. If None,
+        the generator is initialized from the system.
+    :param cautious: if True, the player tries to play a card only if the
+        public knowledge ensures that this card is playable.
+
+    >>> from hanabython import Game
+    >>> players = [PlayerRandom('Antoine', seed=0, cautious=True),
+    ...            PlayerRandom('Donald X', seed=1, cautious=True)]
+    >>> Game(players, seed=0).play()
+    3
+    """
+
+    def __init__(self, name: str, seed: int = None, cautious: bool = False):
+        super().__init__(name)
+        self.seed = seed
+        self.cautious = cautious
+        self.random = Random(seed)                          # type: Random
+
+    def __getstate__(self) -> dict:
+        """
+        State of the player, for pickling.
+
+        In addition to :meth:`PlayerBase.__getstate__`, the action space is
+        not stored (it is rebuilt when unpickling) and the state of the random
+        generator is packed as 32-bit integers. This state (about 2.5 kB) is
+        most of the pickle.
+
+        >>> from pickle import dumps, loads
+        >>> from hanabython import Game
+        >>> players = [PlayerRandom('Antoine', seed=0),
+        ...            PlayerRandom('Donald X', seed=1)]
+        >>> game = Game(players, seed=0)
+        >>> game.start()
+        >>> len(dumps(players[0])) < 3500
+        True
+        >>> clone = loads(dumps(players[0]))
+        >>> print(clone.choose_action(), '|', players[0].choose_action())
+        Clue R to player in relative position 1 | Clue R to player in \
+relative position 1
+        """
+        state = super().__getstate__()
+        state.pop('action_space', None)
+        version, internal, gauss_next = self.random.getstate()
+        state['random'] = (version, array('I', internal).tobytes(),
+                           gauss_next)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        version, internal, gauss_next = state['random']
+        random = Random()
+        random.setstate((version, tuple(array('I', internal)), gauss_next))
+        state['random'] = random
+        super().__setstate__(state)
+        if self.cfg is not None:
+            self.action_space = ActionSpace(self.cfg, self.n_players)
+
+    def receive_init(self, cfg: Configuration, player_names: List[str]) -> None:
+        super().receive_init(cfg, player_names)
+        self.action_space = ActionSpace(
+            cfg, self.n_players)                            # type: ActionSpace
+
+    def choose_action(self) -> Action:
+        mask = self.action_space.legal_mask(self)
+        actions = [action for action, legal
+                   in zip(self.action_space.actions, mask) if legal]
+        if self.cautious:
+            actions = [
+                action for action in actions
+                if not isinstance(action, ActionPlayCard)
+                or self.surely_playable(action.k)
+            ]
+        return self.random.choice(actions)
+
+    def surely_playable(self, k: int) -> bool:
+        """
+        Whether a card of this player is surely playable.
+
+        :param k: the position of the card in this player's hand.
+
+        :return: True iff all the colors and values that the card can have,
+            according to the public knowledge, make it playable on the board.
+
+        >>> from hanabython import Clue, Colors
+        >>> antoine = PlayerRandom('Antoine')
+        >>> antoine.receive_init(Configuration.STANDARD,
+        ...                      player_names=['Antoine', 'Donald X'])
+        >>> antoine.hands_public[0].receive()
+        >>> antoine.hands_public[0].match(Clue(2), bool_list=[True])
+        >>> antoine.surely_playable(0)
+        False
+        >>> antoine.hands_public[0].match(Clue(1), bool_list=[True])
+        >>> antoine.surely_playable(0)
+        True
+        >>> from hanabython import Card
+        >>> antoine.board.try_to_play(Card('B1'))
+        True
+        >>> antoine.surely_playable(0)
+        False
+        """
+        card = self.hands_public[0][k]
+        altitude = self.board.altitude
+        return all(
+            altitude[i] == self.cfg.values[j] - 1
+            for i in range(self.cfg.n_colors) if card.can_be_c[i]
+            for j in range(self.cfg.n_values) if card.can_be_v[j]
+        )
+
+
+if __name__ == '__main__':
+    my_antoine = PlayerRandom('Antoine', seed=0)
+    my_antoine.test_str()
+
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import asyncio
+import inspect
+import json
+from typing import Dict, List, Tuple
+from hanabython.Modules.Action import Action
+from hanabython.Modules.ActionClue import ActionClue
+from hanabython.Modules.ActionForfeit import ActionForfeit
+from hanabython.Modules.ActionPlayCard import ActionPlayCard
+from hanabython.Modules.ActionThrow import ActionThrow
+from hanabython.Modules.Card import Card
+from hanabython.Modules.Clue import Clue
+from hanabython.Modules.Colors import Colors
+from hanabython.Modules.Configuration import Configuration
+from hanabython.Modules.Player import Player
+
+
+#: For each callback of :class:`Player`, the names of its parameters.
+PARAMETERS = {
+    name: list(inspect.signature(method).parameters)[1:]
+    for name, method in vars(Player).items()
+    if name.startswith('receive_') or name == 'choose_action'
+}                                                 # type: Dict[str, List[str]]
+
+#: Names of the categories of actions in the protocol.
+ACTION_NAMES = {Action.THROW: 'throw', Action.PLAY_CARD: 'play',
+                Action.CLUE: 'clue', Action.FORFEIT: 'forfeit'}
+
+
+def encode_message(event: str, **kwargs) -> bytes:
+    """
+    Encode a message from the server, i.e. a callback of :class:`Player`.
+
+    :param event: the name of the callback.
+    :param kwargs: its arguments. Cards are encoded by their string, e.g.
+        ``"B3"``, clues by their value or the symbol of their color and
+        configurations by their name.
+
+    :return: a line of JSON.
+
+    >>> encode_message('receive_partner_draws', i_active=1, card=Card('B3'))
+    b'{"event":"receive_partner_draws","i_active":1,"card":"B3"}\\n'
+    """
+    message = {'event': event}
+    for key, value in kwargs.items():
+        if isinstance(value, Card):
+            value = str(value)
+        elif isinstance(value, Clue):
+            value = value.x if value.category == Clue.VALUE else value.x.symbol
+        elif isinstance(value, Configuration):
+            value = value.name
+        message[key] = value
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode()
+
+
+def decode_message(line: bytes) -> Tuple[str, dict]:
+    """
+    Decode a message from the server.
+
+    :param line: a line encoded by :func:`encode_message`.
+
+    :return: the name of the callback and its arguments.
+
+    >>> event, kwargs = decode_message(
+    ...     b'{"event":"receive_someone_clues","i_active":0,"i_clued":1,'
+    ...     b'"clue":"R","bool_list":[true,false]}')
+    >>> event, kwargs['clue'].x.name, kwargs['bool_list']
+    ('receive_someone_clues', 'Red', [True, False])
+    """
+    kwargs = json.loads(line)
+    event = kwargs.pop('event')
+    if kwargs.get('card') is not None:
+        kwargs['card'] = Card(kwargs['card'])
+    if 'clue' in kwargs:
+        kwargs['clue'] = _decode_clue(kwargs['clue'])
+    if 'cfg' in kwargs:
+        kwargs['cfg'] = Configuration.from_name(kwargs['cfg'])
+    return event, kwargs
+
+
+def _decode_clue(x) -> Clue:
+    """
+    Decode a clue.
+
+    :param x: a value or the symbol of a color.
+
+    :return: the clue.
+    """
+    return Clue(x if type(x) == int else Colors.from_symbol(x))
+
+
+def encode_action(action: Action) -> bytes:
+    """
+    Encode an action, sent by a client.
+
+    :param action: the action.
+
+    :return: a line of JSON.
+
+    >>> encode_action(ActionThrow(k=2))
+    b'{"action":"throw","k":2}\\n'
+    >>> encode_action(ActionClue(i=1, clue=Clue(Colors.BLUE)))
+    b'{"action":"clue","i":1,"clue":"B"}\\n'
+    """
+    message = {'action': ACTION_NAMES[action.category]}
+    if action.category in {Action.THROW, Action.PLAY_CARD}:
+        message['k'] = action.k
+    elif action.category == Action.CLUE:
+        clue = action.clue
+        message['i'] = action.i
+        message['clue'] = (clue.x if clue.category == Clue.VALUE
+                           else clue.x.symbol)
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode()
+
+
+def decode_action(line: bytes) -> Action:
+    """
+    Decode an action.
+
+    :param line: a line encoded by :func:`encode_action`.
+
+    :return: the action.
+
+    :raise ValueError: if the line is not a valid action.
+
+    >>> print(decode_action(b'{"action":"clue","i":1,"clue":3}'))
+    Clue 3 to player in relative position 1
+    >>> decode_action(b'{"action":"dance"}')
+    Traceback (most recent call last):
+    ValueError: Invalid action: b'{"action":"dance"}'
+    """
+    try:
+        message = json.loads(line)
+        name = message['action']
+        if name == 'throw':
+            return ActionThrow(k=int(message['k']))
+        if name == 'play':
+            return ActionPlayCard(k=int(message['k']))
+        if name == 'clue':
+            return ActionClue(i=int(message['i']),
+                              clue=_decode_clue(message['clue']))
+        if name == 'forfeit':
+            return ActionForfeit()
+    except (ValueError, KeyError, TypeError):
+        pass
+    raise ValueError('Invalid action: %s' % line)
+
+
+class PlayerRemote(Player):
+    """
+    A proxy for a player connected to a :class:`Server`.
+
+    Each callback is sent to the client as a line of JSON (cf.
+    :func:`encode_message`). The messages are buffered by the stream and
+    sent without blocking; :meth:`drain` waits until they are transmitted.
+    The action is requested with :meth:`ask_action`, which is a coroutine.
+    Hence this player can only be driven by a :class:`Server`, which awaits
+    the actions; the synchronous methods :meth:`Game.play` and
+    :meth:`Game.ask_action` cannot be used (cf. :meth:`choose_action`).
+
+    If the client disconnects, the proxy stops sending messages and all its
+    further actions are forfeits.
+
+    :param name: the name of the player.
+    :param reader: the stream of the connection (input).
+    :param writer: the stream of the connection (output).
+
+    :var bool connected: whether the connection is still open.
+    """
+
+    def __init__(self, name: str, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter):
+        super().__init__(name)
+        self.reader = reader
+        self.writer = writer
+        self.connected = True
+
+    def send(self, event: str, **kwargs) -> None:
+        """
+        Send a message to the client.
+
+        :param event: the name of the callback.
+        :param kwargs: its arguments.
+        """
+        if not self.connected:
+            return
+        if self.writer.is_closing():
+            self.connected = False
+            return
+        self.writer.write(encode_message(event, **kwargs))
+
+    async def drain(self) -> None:
+        """
+        Wait until the messages are transmitted to the client.
+        """
+        if not self.connected:
+            return
+        try:
+            await self.writer.drain()
+        except ConnectionError:
+            self.connected = False
+
+    async def ask_action(self) -> Action:
+        """
+        Ask the client for an action.
+
+        :return: the action. A disconnection gives a forfeit.
+
+        :raise ValueError: if the line received is not a valid action.
+        """
+        self.send('choose_action')
+        await self.drain()
+        if not self.connected:
+            return ActionForfeit()
+        try:
+            line = await self.reader.readline()
+        except ConnectionError:
+            line = b''
+        if not line:
+            self.connected = False
+            return ActionForfeit()
+        return decode_action(line)
+
+    def choose_action(self) -> Action:
+        """
+        A remote player cannot choose an action synchronously.
+
+        :raise TypeError: always. The game must be driven by a
+            :class:`Server`, which calls the coroutine :meth:`ask_action`.
+
+        >>> PlayerRemote('Antoine', reader=None, writer=None).choose_action()
+        Traceback (most recent call last):
+        TypeError: PlayerRemote Antoine must be driven by a Server, which \
+awaits ask_action.
+        """
+        raise TypeError('PlayerRemote %s must be driven by a Server, which '
+                        'awaits ask_action.' % self.name)
+
+    async def wait_disconnection(self) -> None:
+        """
+        Wait until the client disconnects.
+
+        This is meant to be used before the game begins, and cancelled when it
+        begins. Whatever the client sends in the meantime is ignored.
+        """
+        try:
+            while await self.reader.read(4096):
+                pass
+        except ConnectionError:
+            pass
+        self.connected = False
+
+    async def close(self) -> None:
+        """
+        Close the connection.
+        """
+        await self.drain()
+        self.connected = False
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def _sent(name: str):
+    """
+    Method of :class:`PlayerRemote` that sends a callback to the client.
+
+    :param name: the name of the callback.
+
+    :return: the method.
+    """
+    parameters = PARAMETERS[name]
+
+    def method(self, *args, **kwargs):
+        kwargs.update(zip(parameters, args))
+        self.send(name, **kwargs)
+    method.__name__ = name
+    method.__doc__ = getattr(Player, name).__doc__
+    return method
+
+
+for _name in PARAMETERS:
+    if _name != 'choose_action':
+        setattr(PlayerRemote, _name, _sent(_name))
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import List
+from hanabython.Modules.Action import Action
+from hanabython.Modules.ActionClue import ActionClue
+from hanabython.Modules.ActionThrow import ActionThrow
+from hanabython.Modules.Board import Board
+from hanabython.Modules.Card import Card
+from hanabython.Modules.Clue import Clue
+from hanabython.Modules.Configuration import Configuration
+from hanabython.Modules.Player import Player
+
+
+class PlayerScripted(Player):
+    """
+    A cheap scripted player, typically used for load tests.
+
+    Like :class:`PlayerPuppet`, she does not try to play well. She only keeps
+    track of what is needed to always choose a legal action: the number of
+    clues, the board and the hand of the next player. If a clue is available,
+    she clues the next player about the value of her newest card; otherwise,
+    she discards her own newest card.
+
+    :var int n_clues: the number of clues left.
+    :var Board board: the board.
+    :var list next_hand: the hand of the next player (newest card first).
+
+    >>> from hanabython import Game
+    >>> game = Game([PlayerScripted('Antoine'), PlayerScripted('Donald X')],
+    ...             seed=0)
+    >>> game.play()
+    0
+    >>> game.n_turns
+    89
+    >>> game.n_clues_given
+    48
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.cfg = None                 # type: Configuration
+        self.n_clues = None             # type: int
+        self.board = None               # type: Board
+        self.n_cards = None             # type: int
+        self.next_hand = None           # type: List[Card]
+
+    def receive_init(self, cfg: Configuration, player_names: List[str]) -> None:
+        self.cfg = cfg
+        self.n_clues = cfg.n_clues
+        self.board = Board(cfg, backend='python')
+        self.n_cards = cfg.n_cards
+        self.next_hand = []
+
+    def receive_i_draw(self) -> None:
+        if self.n_cards > 0:
+            self.n_cards -= 1
+
+    def receive_partner_draws(self, i_active: int, card: Card) -> None:
+        if self.n_cards > 0:
+            self.n_cards -= 1
+            if i_active == 1:
+                self.next_hand.insert(0, card)
+
+    def choose_action(self) -> Action:
+        if self.n_clues > 0 and self.next_hand:
+            return ActionClue(i=1, clue=Clue(self.next_hand[0].v))
+        return ActionThrow(k=0)
+
+    def receive_someone_throws(self, i_active: int, k: int,
+                               card: Card) -> None:
+        self.n_clues += 1
+        if i_active == 1:
+            self.next_hand.pop(k)
+
+    def receive_someone_plays_card(
+        self, i_active: int, k: int, card: Card
+    ) -> None:
+        if (self.board.try_to_play(card)
+                and card.v == self.cfg.highest[card.c]
+                and self.n_clues < self.cfg.n_clues):
+            self.n_clues += 1
+        if i_active == 1:
+            self.next_hand.pop(k)
+
+    def receive_someone_clues(self, i_active: int, i_clued: int, clue: Clue,
+                              bool_list: List[bool]) -> None:
+        self.n_clues -= 1
+
+
+if __name__ == '__main__':
+    from hanabython.Modules.Game import Game
+    my_player = PlayerScripted('Antoine')
+    my_player.test_str()
+    print(Game([my_player, PlayerScripted('Donald X')]).play())
+
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from copy import copy
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.GameEvent import GameEvent
+from hanabython.Modules.Player import Player
+
+
+class PlayerSubscriber(Colored):
+    """
+    Subscriber that transmits the events of a game to a player.
+
+    Each :class:`GameEvent` is converted to the point of view of the player:
+    absolute positions become relative positions (0 for this player, 1 for the
+    next player, etc.), and the corresponding ``receive_...`` method of the
+    player is called.
+
+    By default, the player receives copies of the cards, clues and lists
+    of booleans, so that she cannot modify the objects shared by the game. A
+    trusted player receives the shared objects themselves (the list of
+    booleans is then a tuple): this is faster, but the player must not modify
+    them. Apart from the tuple, these objects are not frozen: this is not
+    checked, hence trusted mode is meant for in-process bots only.
+
+    :param player: the player.
+    :param i: the absolute position of the player in the game.
+    :param n_players: the number of players in the game.
+    :param trusted: whether the player is trusted.
+
+    >>> from hanabython import Card, PlayerPuppet
+    >>> antoine = PlayerPuppet('Antoine', speak=True)
+    >>> subscriber = PlayerSubscriber(antoine, i=1, n_players=3)
+    >>> subscriber(GameEvent(GameEvent.DRAW, i_active=0, card=Card('B3')))
+    Antoine: Another player tries to draw a card.
+    Antoine: i_active = 2
+    Antoine: card = B3
+    >>> subscriber(GameEvent(GameEvent.DRAW, i_active=1, card=Card('Y1')))
+    Antoine: This player tries to draw a card.
+
+    A trusted player receives the objects of the event:
+
+    >>> from hanabython import Clue, Player
+    >>> event = GameEvent(GameEvent.CLUE, i_active=0, i_clued=1, clue=Clue(3),
+    ...                   bool_list=(True, False))
+    >>> class Spy(Player):
+    ...     def receive_someone_clues(self, i_active, i_clued, clue,
+    ...                               bool_list):
+    ...         print(clue is event.clue, bool_list)
+    >>> PlayerSubscriber(Spy('Antoine'), i=1, n_players=2)(event)
+    False [True, False]
+    >>> PlayerSubscriber(Spy('Antoine'), i=1, n_players=2, trusted=True)(event)
+    True (True, False)
+    """
+
+    def __init__(self, player: Player, i: int, n_players: int,
+                 trusted: bool = False):
+        self.player = player
+        self.i = i
+        self.n_players = n_players
+        self.trusted = trusted
+        self._copy = _identity if trusted else copy
+        self._copy_list = _identity if trusted else list
+        self._dispatch = {
+            GameEvent.BEGIN_DEALING: self._begin_dealing,
+            GameEvent.END_DEALING: self._end_dealing,
+            GameEvent.DRAW: self._draw,
+            GameEvent.THROW: self._throw,
+            GameEvent.PLAY_CARD: self._play_card,
+            GameEvent.CLUE: self._clue,
+            GameEvent.FORFEIT: self._forfeit,
+            GameEvent.REMAINING_TURNS: self._remaining_turns,
+            GameEvent.LOSE: self._lose,
+            GameEvent.GAME_EXHAUSTED: self._game_exhausted,
+            GameEvent.WIN: self._win,
+        }
+
+    def colored(self) -> str:
+        return '%s (position %s)' % (self.player.colored(), self.i)
+
+    def __call__(self, event: GameEvent) -> None:
+        self._dispatch[event.category](event)
+
+    def rel(self, who: int) -> int:
+        """
+        Relative position of a player from the point of view of this player.
+
+        :param who: the absolute position of the player we talk about.
+
+        :return: the relative position.
+
+        >>> from hanabython import Player
+        >>> subscriber = PlayerSubscriber(Player('Antoine'), i=2, n_players=3)
+        >>> subscriber.rel(1)
+        2
+        """
+        return (who - self.i) % self.n_players
+
+    def _begin_dealing(self, event: GameEvent) -> None:
+        self.player.receive_begin_dealing()
+
+    def _end_dealing(self, event: GameEvent) -> None:
+        self.player.receive_end_dealing()
+
+    def _draw(self, event: GameEvent) -> None:
+        if event.i_active == self.i:
+            self.player.receive_i_draw()
+        else:
+            self.player.receive_partner_draws(
+                self.rel(event.i_active), self._copy(event.card))
+
+    def _throw(self, event: GameEvent) -> None:
+        self.player.receive_someone_throws(
+            self.rel(event.i_active), event.k, self._copy(event.card))
+
+    def _play_card(self, event: GameEvent) -> None:
+        self.player.receive_someone_plays_card(
+            self.rel(event.i_active), event.k, self._copy(event.card))
+
+    def _clue(self, event: GameEvent) -> None:
+        self.player.receive_someone_clues(
+            self.rel(event.i_active), self.rel(event.i_clued),
+            self._copy(event.clue), self._copy_list(event.bool_list))
+
+    def _forfeit(self, event: GameEvent) -> None:
+        self.player.receive_someone_forfeits(self.rel(event.i_active))
+
+    def _remaining_turns(self, event: GameEvent) -> None:
+        self.player.receive_remaining_turns(event.value)
+
+    def _lose(self, event: GameEvent) -> None:
+        self.player.receive_lose(score=event.value)
+
+    def _game_exhausted(self, event: GameEvent) -> None:
+        self.player.receive_game_exhausted(score=event.value)
+
+    def _win(self, event: GameEvent) -> None:
+        self.player.receive_win(score=event.value)
+
+
+def _identity(o: object) -> object:
+    """
+    Identity function (used instead of a copy for trusted players).
+
+    :param o: an object.
+
+    :return: the same object.
+    """
+    return o
+
+
+if __name__ == '__main__':
+    from hanabython.Modules.PlayerPuppet import PlayerPuppet
+    my_subscriber = PlayerSubscriber(PlayerPuppet('Antoine'), i=0, n_players=2)
+    my_subscriber.test_str()
+
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from time import perf_counter_ns
+from hanabython.Modules.LatencyHistograms import LatencyHistograms
+from hanabython.Modules.Player import Player
+from hanabython.Modules.PlayerWrapper import PlayerWrapper
+
+
+class PlayerTimed(PlayerWrapper):
+    """
+    A wrapper that measures the duration of the callbacks of a player.
+
+    Each callback (:meth:`choose_action` and all the ``receive_...``
+    methods) is transmitted to the wrapped player and its duration is counted
+    in :attr:`histograms`. The other attributes are read from the wrapped
+    player (cf. :class:`PlayerWrapper`).
+
+    :param player: the player.
+    :param histograms: the histograms where the durations are counted. If
+        None, new histograms are created. Giving the same object to several
+        wrappers (e.g. the successive games of a tournament) merges their
+        measures.
+
+    >>> from hanabython import Game, PlayerRandom
+    >>> antoine = PlayerTimed(PlayerRandom('Antoine', seed=0))
+    >>> donald = PlayerTimed(PlayerRandom('Donald X', seed=1))
+    >>> game = Game([antoine, donald], seed=0)
+    >>> _ = game.play()
+    >>> antoine.name, antoine.cautious
+    ('Antoine', False)
+    >>> n_turns = antoine.histograms.n_calls('choose_action')
+    >>> n_turns == antoine.histograms.n_calls('receive_turn_begin')
+    True
+    >>> n_turns + donald.histograms.n_calls('choose_action') == game.n_turns
+    True
+    >>> antoine.histograms.n_calls('receive_init')
+    1
+    """
+
+    def __init__(self, player: Player, histograms: LatencyHistograms = None):
+        super().__init__(player)
+        if histograms is None:
+            histograms = LatencyHistograms()
+        self.histograms = histograms            # type: LatencyHistograms
+
+    def call(self, name: str, *args, **kwargs) -> object:
+        start = perf_counter_ns()
+        result = super().call(name, *args, **kwargs)
+        self.histograms.add(name, perf_counter_ns() - start)
+        return result
+
+
+if __name__ == '__main__':
+    from hanabython.Modules.Game import Game
+    from hanabython.Modules.PlayerRandom import PlayerRandom
+    my_players = [PlayerTimed(PlayerRandom('Antoine')),
+                  PlayerTimed(PlayerRandom('Donald X'))]
+    my_players[0].test_str()
+    Game(my_players).play()
+    print(my_players[0].histograms)
+
+    import doctest
+    doctest.testmod()
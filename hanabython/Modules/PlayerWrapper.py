@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from hanabython.Modules.Player import Player
+
+
+class PlayerWrapper(Player):
+    """
+    A player that transmits the callbacks to another player.
+
+    Each callback (:meth:`choose_action` and all the ``receive_...``
+    methods) goes through the hook :meth:`call`, which transmits it to the
+    wrapped player. The other attributes are read from the wrapped player.
+    Subclasses specialize the wrapper by overriding :meth:`call` (for all the
+    callbacks) or a given callback.
+
+    :param player: the player.
+
+    >>> from hanabython import Game, PlayerRandom
+    >>> class PlayerCounter(PlayerWrapper):
+    ...     n_calls = 0
+    ...     def call(self, name, *args, **kwargs):
+    ...         self.n_calls += 1
+    ...         return super().call(name, *args, **kwargs)
+    >>> antoine = PlayerCounter(PlayerRandom('Antoine', seed=0))
+    >>> donald = PlayerRandom('Donald X', seed=1)
+    >>> _ = Game([antoine, donald], seed=0).play()
+    >>> antoine.name, antoine.cautious
+    ('Antoine', False)
+    >>> antoine.n_calls > 0
+    True
+    """
+
+    #: Names of the callbacks that go through :meth:`call`.
+    CALLBACKS = tuple(name for name in vars(Player)
+                      if name.startswith('receive_')
+                      or name == 'choose_action')
+
+    def __init__(self, player: Player):
+        super().__init__(player.name)
+        self.player = player
+
+    def colored(self) -> str:
+        return self.player.colored()
+
+    def __getattr__(self, name: str) -> object:
+        if name == 'player':
+            raise AttributeError(name)
+        return getattr(self.player, name)
+
+    def call(self, name: str, *args, **kwargs) -> object:
+        """
+        Transmit a callback to the wrapped player.
+
+        :param name: the name of the callback, in :attr:`CALLBACKS`.
+        :param args: the positional arguments.
+        :param kwargs: the keyword arguments.
+
+        :return: what the wrapped player returns.
+        """
+        return getattr(self.player, name)(*args, **kwargs)
+
+
+def _transmitted(name: str):
+    """
+    Method of :class:`PlayerWrapper` that transmits a callback.
+
+    :param name: the name of the callback.
+
+    :return: the method.
+    """
+    def method(self, *args, **kwargs):
+        return self.call(name, *args, **kwargs)
+    method.__name__ = name
+    method.__doc__ = getattr(Player, name).__doc__
+    return method
+
+
+for _name in PlayerWrapper.CALLBACKS:
+    setattr(PlayerWrapper, _name, _transmitted(_name))
+
+
+if __name__ == '__main__':
+    from hanabython.Modules.PlayerRandom import PlayerRandom
+    my_player = PlayerWrapper(PlayerRandom('Antoine'))
+    my_player.test_str()
+
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import multiprocessing
+from typing import Callable
+
+
+def worker_pool(n_workers: int, initializer: Callable,
+                initargs: tuple) -> multiprocessing.Pool:
+    """
+    Pool of worker processes for simulations.
+
+    The `fork` start method is used when it is available, so that the
+    arguments of the initializer (typically functions that create players)
+    do not need to be picklable.
+
+    :param n_workers: the number of worker processes.
+    :param initializer: the function run at the start of each worker.
+    :param initargs: the arguments of the initializer.
+
+    :return: the pool.
+
+    >>> import os
+    >>> with worker_pool(2, initializer=os.getpid, initargs=()) as pool:
+    ...     pool.map(abs, [-1, 2, -3])
+    [1, 2, 3]
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = multiprocessing.get_context()
+    return context.Pool(n_workers, initializer=initializer, initargs=initargs)
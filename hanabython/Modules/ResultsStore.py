@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import multiprocessing
+import sqlite3
+from typing import List, Tuple, Union
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.Configuration import Configuration
+from hanabython.Modules.GameResult import GameResult
+from hanabython.Modules.Statistics import Statistics
+
+
+class ResultsStore(Colored):
+    """
+    Results of simulations, stored in a local SQLite file.
+
+    Each game is recorded with its configuration, the specification of its
+    players (any string chosen by the user, e.g. the names of the bots), its
+    seed and its :class:`GameResult`. Records are buffered and written by
+    batches, each batch in one transaction. The table is indexed by
+    configuration and players, and by players.
+
+    SQLite supports only one writer at a time: when games are played by
+    several worker processes, they should send their results to one process
+    that owns the store, e.g. with :class:`ResultsWriter`.
+
+    :param path: the path of the SQLite file (created if necessary).
+        ':memory:' can be used for a temporary database.
+    :param batch_size: the number of records in the buffer that triggers a
+        write.
+
+    >>> store = ResultsStore(':memory:')
+    >>> store.add(Configuration.STANDARD, 'Random x 2', seed=0,
+    ...           result=GameResult(0, GameResult.LOSE, 8, 3, 2))
+    >>> store.add(Configuration.STANDARD, 'Random x 2', seed=1,
+    ...           result=GameResult(3, GameResult.GAME_EXHAUSTED, 70, 2, 40))
+    >>> store.count(Configuration.STANDARD, 'Random x 2')
+    2
+    >>> print(store.statistics(Configuration.STANDARD, 'Random x 2'))
+    Games: 2.
+    Score: mean 1.50, standard deviation 2.12.
+    Endings: win 0.0%, lose 50.0%, game_exhausted 50.0%.
+    Misfires: mean 2.50.
+    Clues given: mean 21.00.
+    >>> store.close()
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.buffer = []                                # type: List[tuple]
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS games ('
+                'configuration TEXT NOT NULL, players TEXT NOT NULL, '
+                'seed INTEGER, score INTEGER NOT NULL, ending TEXT NOT NULL, '
+                'n_turns INTEGER NOT NULL, n_misfires INTEGER NOT NULL, '
+                'n_clues_given INTEGER NOT NULL)')
+            self.connection.execute(
+                'CREATE INDEX IF NOT EXISTS games_configuration_players '
+                'ON games (configuration, players)')
+            self.connection.execute(
+                'CREATE INDEX IF NOT EXISTS games_players ON games (players)')
+
+    def colored(self) -> str:
+        return 'Results store %s' % self.path
+
+    def __enter__(self) -> 'ResultsStore':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def add(self, cfg: Union[Configuration, str], players: str, seed: int,
+            result: GameResult) -> None:
+        """
+        Record a game.
+
+        The record is written when the buffer is full, or by :meth:`flush`.
+
+        :param cfg: the configuration, or its key (cf.
+            :func:`configuration_key`).
+        :param players: the specification of the players.
+        :param seed: the seed of the game (or None).
+        :param result: the result of the game.
+        """
+        self.buffer.append((configuration_key(cfg), players, seed) + result)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the buffered records, in one transaction.
+        """
+        if not self.buffer:
+            return
+        with self.connection:
+            self.connection.executemany(
+                'INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                self.buffer)
+        self.buffer.clear()
+
+    def close(self) -> None:
+        """
+        Write the buffered records and close the database.
+        """
+        self.flush()
+        self.connection.close()
+
+    def count(self, cfg: Configuration, players: str) -> int:
+        """
+        Number of games recorded.
+
+        :param cfg: the configuration.
+        :param players: the specification of the players.
+
+        :return: the number of games recorded with this configuration and
+            these players (including the buffered records).
+        """
+        self.flush()
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM games WHERE configuration = ? '
+            'AND players = ?', (configuration_key(cfg), players)).fetchone()[0]
+
+    def results(self, cfg: Configuration,
+                players: str) -> List[Tuple[int, GameResult]]:
+        """
+        Results recorded.
+
+        :param cfg: the configuration.
+        :param players: the specification of the players.
+
+        :return: a list of tuples (seed, result), in the order of insertion.
+        """
+        self.flush()
+        rows = self.connection.execute(
+            'SELECT seed, score, ending, n_turns, n_misfires, n_clues_given '
+            'FROM games WHERE configuration = ? AND players = ? '
+            'ORDER BY rowid', (configuration_key(cfg), players))
+        return [(row[0], GameResult(*row[1:])) for row in rows]
+
+    def statistics(self, cfg: Configuration, players: str) -> Statistics:
+        """
+        Statistics on the games recorded.
+
+        :param cfg: the configuration.
+        :param players: the specification of the players.
+
+        :return: the statistics on the games with this configuration and these
+            players.
+        """
+        statistics = Statistics(cfg)
+        for _, result in self.results(cfg, players):
+            statistics.add(result)
+        return statistics
+
+
+class ResultsWriter(Colored):
+    """
+    A process that receives results from other processes and records them.
+
+    Use it as a context manager. Other processes (typically workers that
+    play games) put tuples ``(key, players, seed, result)`` in :attr:`queue`,
+    or lists of such tuples, which is more efficient. The key of the
+    configuration is given by :func:`configuration_key`. The writer process
+    owns the :class:`ResultsStore` and is the only one to write in the
+    database. On exit, it records the remaining results and closes the
+    database.
+
+    :param path: the path of the SQLite file.
+    :param batch_size: cf. :class:`ResultsStore`.
+
+    :var multiprocessing.Queue queue: the queue where the results are put.
+
+    >>> import os, tempfile
+    >>> from hanabython import Game, PlayerRandom
+    >>> def play(queue, seeds):
+    ...     for seed in seeds:
+    ...         game = Game([PlayerRandom('Antoine', seed),
+    ...                      PlayerRandom('Donald X', seed)], seed=seed)
+    ...         game.play()
+    ...         queue.put(('standard', 'Random', seed, game.result))
+    >>> path = os.path.join(tempfile.mkdtemp(), 'results.sqlite')
+    >>> context = multiprocessing.get_context('fork')
+    >>> with ResultsWriter(path) as writer:
+    ...     workers = [context.Process(target=play, args=(writer.queue, seeds))
+    ...                for seeds in [range(0, 10), range(10, 20)]]
+    ...     for worker in workers:
+    ...         worker.start()
+    ...     for worker in workers:
+    ...         worker.join()
+    >>> with ResultsStore(path) as store:
+    ...     store.count(Configuration.STANDARD, 'Random')
+    20
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.queue = multiprocessing.Queue()
+        self.process = multiprocessing.Process(
+            target=_write, args=(path, batch_size, self.queue))
+
+    def colored(self) -> str:
+        return 'Results writer %s' % self.path
+
+    def __enter__(self) -> 'ResultsWriter':
+        self.process.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.queue.put(None)
+        self.process.join()
+
+
+def configuration_key(cfg: Union[Configuration, str]) -> str:
+    """
+    Key of a configuration in the database.
+
+    :param cfg: a configuration (or directly its key).
+
+    :return: its name if it has one, its representation otherwise.
+
+    >>> configuration_key(Configuration.W_MULTICOLOR)
+    'with normal multicolor (10 cards)'
+    """
+    if isinstance(cfg, str):
+        return cfg
+    return cfg.name if cfg.name else repr(cfg)
+
+
+def _write(path: str, batch_size: int, queue: multiprocessing.Queue) -> None:
+    """
+    Record results received in a queue, until None is received.
+
+    :param path: the path of the SQLite file.
+    :param batch_size: cf. :class:`ResultsStore`.
+    :param queue: the queue.
+    """
+    with ResultsStore(path, batch_size) as store:
+        for item in iter(queue.get, None):
+            for record in (item if isinstance(item, list) else [item]):
+                store.add(*record)
+
+
+if __name__ == '__main__':
+    my_store = ResultsStore(':memory:')
+    my_store.test_str()
+
+    import doctest
+    doctest.testmod()
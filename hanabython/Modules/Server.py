@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import asyncio
+import json
+import logging
+from time import perf_counter_ns
+from typing import Dict, List, Tuple, Union
+from hanabython.Modules.Action import Action
+from hanabython.Modules.ActionForfeit import ActionForfeit
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.Configuration import Configuration
+from hanabython.Modules.Game import Game
+from hanabython.Modules.LatencyHistograms import LatencyHistograms
+from hanabython.Modules.Player import Player
+from hanabython.Modules.PlayerRemote import (
+    PlayerRemote, decode_message, encode_action)
+
+
+class Server(Colored):
+    """
+    A server that hosts many simultaneous games in an asyncio event loop.
+
+    Players connect over TCP or a Unix socket (cf. :meth:`start`) and
+    exchange lines of JSON. The first line sent by a client is
+    ``{"name": ..., "table": ...}``. When a table has :attr:`n_players`
+    players, in the order where they joined, its game begins. Then the client
+    receives each callback of :class:`Player` as a line (cf.
+    :class:`PlayerRemote`), and answers each ``choose_action`` with an action
+    (cf. :func:`encode_action`). At the end of the game, the connection is
+    closed. The function :func:`play_remote` implements the client side for
+    any :class:`Player`.
+
+    Local players (e.g. bots) can also take a seat with :meth:`join`. They are
+    run directly in the event loop, hence they should be fast.
+
+    All the tables run in the same thread: a connection that waits (for a
+    table to be complete, or for its turn) costs only a coroutine.
+
+    :param cfg: the configuration of the games.
+    :param n_players: the number of players per table.
+    :param seed: if given, the game number ``k`` (in the order where the
+        tables are complete, starting at 0) uses the seed ``seed + k``.
+
+    :var int n_connections: the number of open connections.
+    :var int n_games_started: the number of games started.
+    :var int n_games_finished: the number of games finished.
+    :var int n_turns: the number of turns played in the finished games.
+
+    >>> from hanabython import PlayerRandom
+    >>> async def main():
+    ...     server = Server(seed=0)
+    ...     await server.start()
+    ...     host, port = server.address
+    ...     bot = server.join('table', PlayerRandom('Antoine', seed=0))
+    ...     score = await play_remote(PlayerRandom('Donald X', seed=1),
+    ...                               'table', host=host, port=port)
+    ...     await server.close()
+    ...     print(server)
+    ...     return score, await bot, server.n_turns
+    >>> asyncio.run(main())
+    Server: 0 connections, 0 tables waiting, 1 games finished.
+    (0, 0, 8)
+
+    This is the same game as:
+
+    >>> game = Game([PlayerRandom('Antoine', seed=0),
+    ...              PlayerRandom('Donald X', seed=1)], seed=0)
+    >>> game.play(), game.n_turns
+    (0, 8)
+    """
+
+    def __init__(self, cfg: Configuration = Configuration.STANDARD,
+                 n_players: int = 2, seed: int = None):
+        self.cfg = cfg
+        self.n_players = n_players
+        self.seed = seed
+        self.n_connections = 0
+        self.n_games_started = 0
+        self.n_games_finished = 0
+        self.n_turns = 0
+        self.server = None                  # type: asyncio.AbstractServer
+        self._waiting = {}
+        # type: Dict[str, Tuple[List[Player], List[asyncio.Future]]]
+        self._watchers = {}                 # type: Dict[Player, asyncio.Task]
+        self._tasks = set()
+
+    def colored(self) -> str:
+        return (
+            'Server: %s connections, %s tables waiting, %s games finished.'
+            % (self.n_connections, len(self._waiting), self.n_games_finished))
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0,
+                    path: str = None,
+                    backlog: int = 4096) -> asyncio.AbstractServer:
+        """
+        Start listening.
+
+        :param host: the host (for TCP).
+        :param port: the port (for TCP). With 0, a free port is chosen, cf.
+            :attr:`address`.
+        :param path: if given, listen on this Unix socket instead of TCP.
+        :param backlog: the maximal number of pending connections (capped by
+            the system). With the default value of asyncio (100), a burst of
+            clients connecting to a Unix socket would be refused.
+
+        :return: the asyncio server (it is also stored in :attr:`server`).
+        """
+        if path is None:
+            self.server = await asyncio.start_server(
+                self._handle, host, port, backlog=backlog)
+        else:
+            self.server = await asyncio.start_unix_server(
+                self._handle, path, backlog=backlog)
+        return self.server
+
+    @property
+    def address(self) -> Union[Tuple[str, int], str]:
+        """
+        The address where the server listens.
+
+        :return: ``(host, port)`` for TCP, the path for a Unix socket.
+        """
+        address = self.server.sockets[0].getsockname()
+        if isinstance(address, str):
+            return address
+        return address[:2]
+
+    async def close(self) -> None:
+        """
+        Stop listening, release the incomplete tables and wait for the games
+        and the connections in progress.
+        """
+        self.server.close()
+        for watcher in self._watchers.values():
+            watcher.cancel()
+        self._watchers.clear()
+        for players, futures in self._waiting.values():
+            for future in futures:
+                future.cancel()
+        self._waiting.clear()
+        if self._tasks:
+            await asyncio.wait(self._tasks)
+        await self.server.wait_closed()
+
+    def join(self, table: str, player: Player) -> asyncio.Future:
+        """
+        Take a seat at a table.
+
+        :param table: the name of the table.
+        :param player: the player (a local player or a :class:`PlayerRemote`).
+
+        :return: a future whose result is the final score of the game. It is
+            cancelled if the player leaves the table before the game begins:
+            for a :class:`PlayerRemote`, this happens when the client
+            disconnects.
+        """
+        players, futures = self._waiting.setdefault(table, ([], []))
+        future = asyncio.get_running_loop().create_future()
+        players.append(player)
+        futures.append(future)
+        if isinstance(player, PlayerRemote) and len(players) < self.n_players:
+            self._watchers[player] = asyncio.ensure_future(
+                self._watch(table, player))
+        if len(players) == self.n_players:
+            del self._waiting[table]
+            for p in players:
+                watcher = self._watchers.pop(p, None)
+                if watcher is not None:
+                    watcher.cancel()
+            seed = (None if self.seed is None
+                    else self.seed + self.n_games_started)
+            self.n_games_started += 1
+            task = asyncio.ensure_future(self._play(players, futures, seed))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return future
+
+    def leave(self, table: str, player: Player) -> None:
+        """
+        Leave a table before the game begins.
+
+        :param table: the name of the table.
+        :param player: the player. Her future (cf. :meth:`join`) is
+            cancelled.
+        """
+        players, futures = self._waiting[table]
+        i = players.index(player)
+        del players[i]
+        futures.pop(i).cancel()
+        if not players:
+            del self._waiting[table]
+        watcher = self._watchers.pop(player, None)
+        if watcher is not None:
+            watcher.cancel()
+
+    async def _watch(self, table: str, player: PlayerRemote) -> None:
+        """
+        Remove a remote player from her table if she disconnects before the
+        game begins.
+
+        :param table: the name of the table.
+        :param player: the player.
+        """
+        await player.wait_disconnection()
+        del self._watchers[player]
+        self.leave(table, player)
+
+    async def _handle(self, reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter) -> None:
+        """
+        Serve a connection.
+
+        :param reader: the stream of the connection (input).
+        :param writer: the stream of the connection (output).
+        """
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        self.n_connections += 1
+        try:
+            try:
+                message = json.loads(await reader.readline())
+                name, table = str(message['name']), str(message['table'])
+            except (ValueError, KeyError, TypeError, ConnectionError):
+                writer.close()
+                return
+            player = PlayerRemote(name, reader, writer)
+            future = self.join(table, player)
+            await asyncio.wait([future])
+            if not future.cancelled() and future.exception() is not None:
+                logging.error('Game failed at table %s: %r.'
+                              % (table, future.exception()))
+            await player.close()
+        finally:
+            self.n_connections -= 1
+
+    async def _play(self, players: List[Player],
+                    futures: List[asyncio.Future], seed: int) -> None:
+        """
+        Play a game.
+
+        :param players: the players.
+        :param futures: the futures of the players, cf. :meth:`join`.
+        :param seed: the seed of the game.
+        """
+        remotes = [p for p in players if isinstance(p, PlayerRemote)]
+        try:
+            game = Game(players, self.cfg, seed=seed)
+            game.start()
+            while True:
+                score = game.begin_turn()
+                if score is not None:
+                    break
+                for player in remotes:
+                    await player.drain()
+                await self._ask_action(game)
+                score = game.finish_turn()
+                if score is not None:
+                    break
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        self.n_games_finished += 1
+        self.n_turns += game.n_turns
+        for future in futures:
+            future.set_result(score)
+
+    @staticmethod
+    async def _ask_action(game: Game) -> None:
+        """
+        Ask the active player for an action and execute it.
+
+        This is the asynchronous version of :meth:`Game.ask_action`: for a
+        :class:`PlayerRemote`, the action is awaited. For a local player, the
+        event loop is given a chance to run the other tables.
+
+        :param game: the game.
+        """
+        player = game.active
+        if not isinstance(player, PlayerRemote):
+            game.ask_action()
+            await asyncio.sleep(0)
+            return
+        for _ in range(Game.ATTEMPTS_BEFORE_FORFEIT):
+            try:
+                action = await player.ask_action()
+            except ValueError as e:
+                player.receive_action_illegal(str(e))
+                continue
+            error = Server._out_of_range(game, action)
+            if error is not None:
+                player.receive_action_illegal(error)
+                continue
+            if game.execute_action(action):
+                return
+        logging.warning(
+            "%s failed 100 times to choose an action. Automatic "
+            "forfeit is applied." % player.name)
+        game.execute_action(ActionForfeit())
+
+    @staticmethod
+    def _out_of_range(game: Game, action: Action) -> Union[str, None]:
+        """
+        Check the positions given in an action received from the network.
+
+        :class:`Game` expects a position of card that exists in the hand of
+        the active player and a relative position of partner between 1 and
+        ``n_players - 1``, which is not guaranteed for a remote client.
+
+        :param game: the game.
+        :param action: the action of the active player.
+
+        :return: an error message, or None if the positions are valid.
+
+        >>> from hanabython import ActionClue, ActionThrow, Clue, PlayerPuppet
+        >>> game = Game([PlayerPuppet('Antoine'), PlayerPuppet('Donald X')],
+        ...             seed=0)
+        >>> game.start()
+        >>> _ = game.begin_turn()
+        >>> print(Server._out_of_range(game, ActionThrow(k=4)))
+        None
+        >>> print(Server._out_of_range(game, ActionThrow(k=99)))
+        There is no card in position 100.
+        >>> print(Server._out_of_range(game, ActionThrow(k=-1)))
+        There is no card in position 0.
+        >>> print(Server._out_of_range(game, ActionClue(i=2, clue=Clue(1))))
+        There is no partner in relative position 2.
+        """
+        if action.category in {Action.THROW, Action.PLAY_CARD}:
+            if not 0 <= action.k < len(game.hands[game.i_active]):
+                return 'There is no card in position %s.' % (action.k + 1)
+        elif action.category == Action.CLUE:
+            if not 1 <= action.i < game.n_players:
+                return ('There is no partner in relative position %s.'
+                        % action.i)
+        return None
+
+
+async def play_remote(player: Player, table: str, host: str = '127.0.0.1',
+                      port: int = None, path: str = None,
+                      histograms: LatencyHistograms = None) -> int:
+    """
+    Play a game on a :class:`Server`, as a client.
+
+    :param player: a player. She receives the callbacks sent by the server
+        and her method :meth:`Player.choose_action` gives her actions.
+    :param table: the name of the table.
+    :param host: the host of the server (for TCP).
+    :param port: the port of the server (for TCP).
+    :param path: if given, connect to this Unix socket instead of TCP.
+    :param histograms: if given, the round-trip time of each move (from
+        sending the action to receiving the answer of the server) is counted
+        there under the name ``'move'``.
+
+    :return: the final score, or None if the connection was closed before
+        the end of the game.
+    """
+    if path is None:
+        reader, writer = await asyncio.open_connection(host, port)
+    else:
+        reader, writer = await asyncio.open_unix_connection(path)
+    writer.write((json.dumps({'name': player.name, 'table': table})
+                  + '\n').encode())
+    score = None
+    sent = None
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if sent is not None:
+                histograms.add('move', perf_counter_ns() - sent)
+                sent = None
+            event, kwargs = decode_message(line)
+            if event == 'choose_action':
+                writer.write(encode_action(player.choose_action()))
+                await writer.drain()
+                if histograms is not None:
+                    sent = perf_counter_ns()
+                continue
+            getattr(player, event)(**kwargs)
+            score = kwargs.get('score', score)
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+    return score
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from math import sqrt
+from typing import List
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.Configuration import Configuration
+from hanabython.Modules.GameResult import GameResult
+
+
+class Statistics(Colored):
+    """
+    Running statistics on the results of many games.
+
+    The results are folded one by one, in constant memory: the individual
+    results are not kept. The mean and variance of the score are computed
+    with Welford's algorithm. Statistics computed separately (e.g. in
+    different worker processes) can be combined with :meth:`merge`.
+
+    :param cfg: the configuration of the games.
+
+    :var int n_games: the number of games.
+    :var float mean: the mean score.
+    :var float m2: the sum of the squared deviations of the scores from their
+        mean (cf. :attr:`variance`).
+    :var list score_histogram: the number of games for each score, from 0 to
+        :attr:`Configuration.max_score`.
+    :var dict ending_counts: the number of games for each ending, cf.
+        :attr:`GameResult.ENDINGS`.
+    :var list misfire_histogram: the number of games for each number of
+        misfires, from 0 to :attr:`Configuration.n_misfires`.
+    :var list clue_histogram: the number of games for each number of clues
+        given, from 0 to the maximal number observed.
+
+    >>> statistics = Statistics(Configuration.STANDARD)
+    >>> statistics.add(GameResult(17, GameResult.GAME_EXHAUSTED, 61, 2, 25))
+    >>> statistics.add(GameResult(0, GameResult.LOSE, 30, 3, 12))
+    >>> other = Statistics(Configuration.STANDARD)
+    >>> other.add(GameResult(19, GameResult.GAME_EXHAUSTED, 60, 1, 27))
+    >>> statistics.merge(other)
+    >>> print(statistics)
+    Games: 3.
+    Score: mean 12.00, standard deviation 10.44.
+    Endings: win 0.0%, lose 33.3%, game_exhausted 66.7%.
+    Misfires: mean 2.00.
+    Clues given: mean 21.33.
+    >>> statistics.score_histogram[17:20]
+    [1, 0, 1]
+    """
+
+    def __init__(self, cfg: Configuration = Configuration.STANDARD):
+        self.cfg = cfg
+        self.n_games = 0                                    # type: int
+        self.mean = 0.                                      # type: float
+        self.m2 = 0.                                        # type: float
+        self.score_histogram = [0] * (cfg.max_score + 1)    # type: List[int]
+        self.ending_counts = {ending: 0 for ending in GameResult.ENDINGS}
+        self.misfire_histogram = [0] * (cfg.n_misfires + 1)  # type: List[int]
+        self.clue_histogram = []                            # type: List[int]
+
+    def colored(self) -> str:
+        if self.n_games == 0:
+            return 'Games: 0.'
+        return '\n'.join([
+            'Games: %s.' % self.n_games,
+            'Score: mean %.2f, standard deviation %.2f.' % (
+                self.mean, self.standard_deviation),
+            'Endings: %s.' % ', '.join(
+                '%s %.1f%%' % (ending, 100 * self.rate(ending))
+                for ending in GameResult.ENDINGS),
+            'Misfires: mean %.2f.' % _mean(self.misfire_histogram),
+            'Clues given: mean %.2f.' % _mean(self.clue_histogram),
+        ])
+
+    @property
+    def variance(self) -> float:
+        """
+        Variance of the score (unbiased estimator).
+
+        :return: the variance, or NaN if there are less than 2 games.
+        """
+        if self.n_games < 2:
+            return float('nan')
+        return self.m2 / (self.n_games - 1)
+
+    @property
+    def standard_deviation(self) -> float:
+        """
+        Standard deviation of the score.
+
+        :return: the square root of :attr:`variance`.
+        """
+        return sqrt(self.variance)
+
+    def rate(self, ending: str) -> float:
+        """
+        Proportion of the games with a given ending.
+
+        :param ending: an ending, e.g. :attr:`GameResult.WIN`.
+
+        :return: the proportion, between 0 and 1, or NaN if there is no game
+            (like :attr:`variance`).
+
+        >>> from hanabython import Configuration, GameResult
+        >>> Statistics(Configuration.STANDARD).rate(GameResult.WIN)
+        nan
+        """
+        if self.n_games == 0:
+            return float('nan')
+        return self.ending_counts[ending] / self.n_games
+
+    def add(self, result: GameResult) -> None:
+        """
+        Add the result of a game.
+
+        :param result: the result, typically :attr:`Game.result`.
+        """
+        self.n_games += 1
+        delta = result.score - self.mean
+        self.mean += delta / self.n_games
+        self.m2 += delta * (result.score - self.mean)
+        self.score_histogram[result.score] += 1
+        self.ending_counts[result.ending] += 1
+        self.misfire_histogram[result.n_misfires] += 1
+        _extend(self.clue_histogram, result.n_clues_given + 1)
+        self.clue_histogram[result.n_clues_given] += 1
+
+    def to_dict(self) -> dict:
+        """
+        Convert to a dictionary (e.g. to save it as JSON).
+
+        :return: a dictionary with all the variables, except the
+            configuration. Cf. :meth:`from_dict`.
+
+        >>> statistics = Statistics(Configuration.STANDARD)
+        >>> statistics.add(GameResult(17, GameResult.GAME_EXHAUSTED, 61, 2, 3))
+        >>> statistics.to_dict()['clue_histogram']
+        [0, 0, 0, 1]
+        """
+        return {
+            'n_games': self.n_games, 'mean': self.mean, 'm2': self.m2,
+            'score_histogram': list(self.score_histogram),
+            'ending_counts': dict(self.ending_counts),
+            'misfire_histogram': list(self.misfire_histogram),
+            'clue_histogram': list(self.clue_histogram),
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict,
+                  cfg: Configuration = Configuration.STANDARD) -> 'Statistics':
+        """
+        Convert from a dictionary.
+
+        :param d: a dictionary given by :meth:`to_dict`.
+        :param cfg: the configuration of the games.
+
+        :return: the statistics.
+
+        >>> statistics = Statistics(Configuration.STANDARD)
+        >>> statistics.add(GameResult(17, GameResult.GAME_EXHAUSTED, 61, 2, 3))
+        >>> print(Statistics.from_dict(statistics.to_dict()))
+        Games: 1.
+        Score: mean 17.00, standard deviation nan.
+        Endings: win 0.0%, lose 0.0%, game_exhausted 100.0%.
+        Misfires: mean 2.00.
+        Clues given: mean 3.00.
+        """
+        statistics = cls(cfg)
+        for key, value in d.items():
+            setattr(statistics, key, value)
+        return statistics
+
+    def merge(self, other: 'Statistics') -> None:
+        """
+        Add the games of other statistics.
+
+        The result is the same as if all the games had been added to this
+        object (up to rounding errors on :attr:`mean` and :attr:`m2`).
+
+        :param other: other statistics, with the same configuration.
+        """
+        n_games = self.n_games + other.n_games
+        if n_games == 0:
+            return
+        delta = other.mean - self.mean
+        self.mean += delta * other.n_games / n_games
+        self.m2 += (other.m2
+                    + delta ** 2 * self.n_games * other.n_games / n_games)
+        self.n_games = n_games
+        for histogram, other_histogram in [
+            (self.score_histogram, other.score_histogram),
+            (self.misfire_histogram, other.misfire_histogram),
+            (self.clue_histogram, other.clue_histogram)
+        ]:
+            _extend(histogram, len(other_histogram))
+            for i, count in enumerate(other_histogram):
+                histogram[i] += count
+        for ending, count in other.ending_counts.items():
+            self.ending_counts[ending] += count
+
+
+def _extend(histogram: List[int], length: int) -> None:
+    """
+    Extend a histogram with zeros.
+
+    :param histogram: a list of counts.
+    :param length: the minimal length of the list after the extension.
+    """
+    if len(histogram) < length:
+        histogram.extend([0] * (length - len(histogram)))
+
+
+def _mean(histogram: List[int]) -> float:
+    """
+    Mean of a histogram.
+
+    :param histogram: a list of counts. The `i`-th coefficient is the number
+        of observations equal to `i`.
+
+    :return: the mean of the observations.
+
+    >>> _mean([1, 0, 3])
+    1.5
+    """
+    return sum(i * count for i, count in enumerate(histogram)) / sum(histogram)
+
+
+if __name__ == '__main__':
+    from hanabython.Modules.Game import Game
+    from hanabython.Modules.PlayerRandom import PlayerRandom
+    my_statistics = Statistics()
+    for my_seed in range(100):
+        my_game = Game([PlayerRandom('Player %s' % i, seed=2 * my_seed + i,
+                                     cautious=True) for i in range(2)],
+                       seed=my_seed)
+        my_game.play()
+        my_statistics.add(my_game.result)
+    my_statistics.test_str()
+
+    import doctest
+    doctest.testmod()
@@ -19,16 +19,23 @@ This file is part of Hanabython.
     along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
 """
 import re
-from typing import Iterable
+from functools import lru_cache, wraps
+from typing import Callable, Iterable
 
 
+#: ANSI escape codes, as removed by :func:`uncolor`.
+ANSI_ESCAPE = re.compile(r'\033.\d*(;\d*)?m')
+
+
+@lru_cache(maxsize=4096)
 def uncolor(s: str) -> str:
     """
     Remove ANSI escape codes from the string.
 
     :param string s: a string.
 
-    :return: the same string without its ANSI escape codes.
+    :return: the same string without its ANSI escape codes. The results are
+        cached, since the same strings are typically uncolored many times.
 
     >>> from hanabython import StringAnsi
     >>> s = (StringAnsi.RED + "Hanabi" + StringAnsi.RESET + ', a game by '
@@ -36,7 +43,9 @@ def uncolor(s: str) -> str:
     >>> uncolor(s)
     'Hanabi, a game by Antoine Bauza'
     """
-    return re.sub(r'\033.\d*(;\d*)?m', "", s)
+    if '\033' not in s:
+        return s
+    return ANSI_ESCAPE.sub('', s)
 
 
 def title(s: str, width: int) -> str:
@@ -86,6 +95,53 @@ def str_from_iterable(l: Iterable) -> str:
     return ' '.join([str(x) for x in l])
 
 
+def cached_rendering(method: Callable[[object], str]) -> Callable:
+    """
+    Decorator for a rendering method (such as ``colored``) of a component.
+
+    The result is stored in the dictionary ``_render_cache`` of the object,
+    so that the method is computed only once as long as the object does not
+    change. The object must define this dictionary, and clear it whenever it
+    is modified.
+
+    :param method: a method without parameters, returning a string.
+
+    :return: the method with a cache.
+
+    >>> class Counter:
+    ...     def __init__(self):
+    ...         self.value = 0
+    ...         self._render_cache = {}
+    ...     def increment(self):
+    ...         self.value += 1
+    ...         self._render_cache.clear()
+    ...     @cached_rendering
+    ...     def colored(self):
+    ...         print('Computing...')
+    ...         return str(self.value)
+    >>> counter = Counter()
+    >>> counter.colored()
+    Computing...
+    '0'
+    >>> counter.colored()
+    '0'
+    >>> counter.increment()
+    >>> counter.colored()
+    Computing...
+    '1'
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self) -> str:
+        try:
+            return self._render_cache[name]
+        except KeyError:
+            s = self._render_cache[name] = method(self)
+            return s
+    return wrapper
+
+
 if __name__ == "__main__":
     my_s = "\033[0;31mHanabi\033[0;0m by \033[0;94mAntoine Bauza\033[0;0m"
     print(my_s)
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from collections import OrderedDict
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+from hanabython.Modules.Campaign import Campaign
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.Configuration import Configuration
+from hanabython.Modules.ConfigurationEndRule import ConfigurationEndRule
+from hanabython.Modules.ConfigurationHandSize import ConfigurationHandSize
+from hanabython.Modules.GameResult import GameResult
+from hanabython.Modules.Player import Player
+
+
+class Sweep(Colored):
+    """
+    Evaluate players over many variants of the game.
+
+    The sweep expands the cross product of the presets of configuration, the
+    numbers of players, the rules for the hand size and the rules for the end
+    of game. Each combination is a *cell*. All the cells are played by one
+    :class:`Campaign`, i.e. on one shared pool of workers, and with the same
+    possibilities of checkpoint and resume.
+
+    The cells are scheduled longest first, so that a long cell does not run
+    alone at the end while the other workers are idle. The cost of a cell is
+    estimated by the number of cards in the deck (plus the initial hands with
+    the Crowning Piece rule, where the hands are played to the end) times the
+    number of players (who all receive each event).
+
+    :param make_players: a function that takes the seed of a game and the
+        number of players, and returns a new list of players.
+    :param presets: an ordered dictionary that associates a label to each
+        preset of configuration. By default, all the presets:
+        :attr:`Configuration.STANDARD`, :attr:`Configuration.W_SIXTH`, etc.
+        Only their deck, numbers of clues and misfires and rule for empty
+        clues are used.
+    :param n_players_list: the numbers of players.
+    :param hand_size_rules: an ordered dictionary that associates a label to
+        each rule for the hand size.
+    :param end_rules: an ordered dictionary that associates a label to each
+        rule for the end of game.
+    :param n_games: the number of games in each cell.
+    :param kwargs: other parameters of :class:`Campaign` (`path`,
+        `chunk_size`, `n_workers`, etc.).
+
+    :var list cells: the list of cells, in the order of the cross product.
+        Each cell is a tuple (preset label, number of players, hand size
+        rule label, end rule label).
+    :var Campaign campaign: the campaign that plays all the cells.
+
+    >>> from hanabython import PlayerRandom
+    >>> def make_players(seed, n_players):
+    ...     return [PlayerRandom('Player %s' % i, seed=n_players * seed + i,
+    ...                          cautious=True) for i in range(n_players)]
+    >>> presets = OrderedDict([('STANDARD', Configuration.STANDARD)])
+    >>> sweep = Sweep(make_players, presets=presets, n_players_list=[2, 5],
+    ...               n_games=10, n_workers=0)
+    >>> sweep.run()
+    True
+    >>> print(sweep)
+    Preset    Players  Hand size  End rule        Games  Mean  Std   Lose %
+    STANDARD  2        normal     normal          10     2.00  1.33  0.0
+    STANDARD  2        normal     Crowning Piece  10     2.60  1.71  0.0
+    STANDARD  2        6-3        normal          10     3.20  1.14  0.0
+    STANDARD  2        6-3        Crowning Piece  10     4.00  1.83  0.0
+    STANDARD  5        normal     normal          10     1.80  1.14  0.0
+    STANDARD  5        normal     Crowning Piece  10     2.50  1.35  0.0
+    STANDARD  5        6-3        normal          10     1.50  0.85  0.0
+    STANDARD  5        6-3        Crowning Piece  10     2.30  1.25  0.0
+
+    The cells are played longest first:
+
+    >>> for name, _, _ in sweep.campaign.tasks[:3]:
+    ...     print(name)
+    STANDARD, 5 players, normal, Crowning Piece
+    STANDARD, 5 players, 6-3, Crowning Piece
+    STANDARD, 5 players, normal, normal
+    """
+
+    #: All the presets of configuration.
+    PRESETS = OrderedDict([
+        ('STANDARD', Configuration.STANDARD),
+        ('W_SIXTH', Configuration.W_SIXTH),
+        ('W_SIXTH_SHORT', Configuration.W_SIXTH_SHORT),
+        ('W_MULTICOLOR', Configuration.W_MULTICOLOR),
+        ('W_MULTICOLOR_SHORT', Configuration.W_MULTICOLOR_SHORT),
+        ('EIGHT_COLORS', Configuration.EIGHT_COLORS),
+    ])
+    #: All the rules for the hand size.
+    HAND_SIZE_RULES = OrderedDict([
+        ('normal', ConfigurationHandSize.NORMAL),
+        ('6-3', ConfigurationHandSize.VARIANT_6_3),
+    ])
+    #: All the rules for the end of game.
+    END_RULES = OrderedDict([
+        ('normal', ConfigurationEndRule.NORMAL),
+        ('Crowning Piece', ConfigurationEndRule.CROWNING_PIECE),
+    ])
+
+    def __init__(self, make_players: Callable[[int, int], List[Player]],
+                 presets: Dict[str, Configuration] = None,
+                 n_players_list: List[int] = (2, 3, 4, 5),
+                 hand_size_rules: Dict[str, ConfigurationHandSize] = None,
+                 end_rules: Dict[str, ConfigurationEndRule] = None,
+                 n_games: int = 1000, **kwargs):
+        self.make_players = make_players
+        self.presets = self.PRESETS if presets is None else presets
+        self.n_players_list = n_players_list
+        self.hand_size_rules = (self.HAND_SIZE_RULES if hand_size_rules is None
+                                else hand_size_rules)
+        self.end_rules = self.END_RULES if end_rules is None else end_rules
+        self.n_games = n_games
+        self.cells = [
+            (preset, n_players, hand_size_rule, end_rule)
+            for preset in self.presets
+            for n_players in n_players_list
+            for hand_size_rule in self.hand_size_rules
+            for end_rule in self.end_rules
+        ]                           # type: List[Tuple[str, int, str, str]]
+        tasks = [(self.cell_name(cell), self.configuration(cell),
+                  partial(make_players, n_players=cell[1]))
+                 for cell in self.cells]
+        tasks.sort(key=lambda task: -_estimated_cost(task[1], task[2]))
+        self.campaign = Campaign(tasks, n_games, **kwargs)
+
+    def colored(self) -> str:
+        return self.table()
+
+    @staticmethod
+    def cell_name(cell: Tuple[str, int, str, str]) -> str:
+        """
+        Name of a cell.
+
+        :param cell: a cell.
+
+        :return: the name of the cell, used for the task in the
+            :attr:`campaign`.
+
+        >>> Sweep.cell_name(('STANDARD', 3, 'normal', 'Crowning Piece'))
+        'STANDARD, 3 players, normal, Crowning Piece'
+        """
+        return '%s, %s players, %s, %s' % cell
+
+    def configuration(self, cell: Tuple[str, int, str, str]) -> Configuration:
+        """
+        Configuration of a cell.
+
+        :param cell: a cell.
+
+        :return: the configuration.
+        """
+        preset, _, hand_size_rule, end_rule = cell
+        cfg = self.presets[preset]
+        return Configuration(
+            deck=cfg.deck, n_clues=cfg.n_clues, n_misfires=cfg.n_misfires,
+            hand_size_rule=self.hand_size_rules[hand_size_rule],
+            empty_clue_rule=cfg.empty_clue_rule,
+            end_rule=self.end_rules[end_rule],
+            name=self.cell_name(cell))
+
+    def run(self, max_chunks: int = None) -> bool:
+        """
+        Play the games that are not done yet.
+
+        :param max_chunks: cf. :meth:`Campaign.run`.
+
+        :return: True iff the sweep is finished.
+        """
+        return self.campaign.run(max_chunks)
+
+    def table(self) -> str:
+        """
+        Table of the results.
+
+        :return: a table with one row per cell, in the order of the cross
+            product: number of games, mean score, standard deviation and
+            percentage of lost games.
+        """
+        rows = [['Preset', 'Players', 'Hand size', 'End rule', 'Games',
+                 'Mean', 'Std', 'Lose %']]
+        for cell in self.cells:
+            statistics = self.campaign.statistics[self.cell_name(cell)]
+            if statistics.n_games == 0:
+                rows.append([str(x) for x in cell] + ['0', '', '', ''])
+                continue
+            rows.append([str(x) for x in cell] + [
+                str(statistics.n_games), '%.2f' % statistics.mean,
+                '%.2f' % statistics.standard_deviation,
+                '%.1f' % (100 * statistics.rate(GameResult.LOSE))])
+        widths = [max(len(row[j]) for row in rows)
+                  for j in range(len(rows[0]))]
+        return '\n'.join(
+            '  '.join(x.ljust(w) for x, w in zip(row, widths)).rstrip()
+            for row in rows)
+
+
+def _estimated_cost(cfg: Configuration,
+                    make_players: partial) -> int:
+    """
+    Estimated cost of the games of a cell, cf. :class:`Sweep`.
+
+    :param cfg: the configuration.
+    :param make_players: the function that creates the players (with the
+        number of players as keyword argument).
+
+    :return: an estimation of the cost, in arbitrary units.
+    """
+    n_players = make_players.keywords['n_players']
+    n_cards = int(cfg.n_cards)
+    if cfg.end_rule == ConfigurationEndRule.CROWNING_PIECE:
+        n_cards += n_players * cfg.hand_size_rule.f(n_players)
+    return n_cards * n_players
+
+
+if __name__ == '__main__':
+    from hanabython.Modules.PlayerRandom import PlayerRandom
+
+    def my_make_players(seed, n_players):
+        return [PlayerRandom('Player %s' % i, seed=n_players * seed + i,
+                             cautious=True) for i in range(n_players)]
+
+    my_sweep = Sweep(my_make_players, n_games=20, chunk_size=10)
+    my_sweep.run()
+    my_sweep.test_str()
+
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright François Durand
+fradurand@gmail.com
+
+This file is part of Hanabython.
+
+    Hanabython is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Hanabython is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Hanabython.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import shutil
+import sys
+from typing import List, TextIO, Tuple, Union
+from hanabython.Modules.Colored import Colored
+from hanabython.Modules.StringUtils import uncolor
+
+
+class TerminalRenderer(Colored):
+    """
+    Display successive screens ("frames") in a terminal, redrawing only the
+    lines that changed.
+
+    The frame is drawn at the top of the terminal. For each new frame, the
+    cursor is moved (with ANSI escape codes) to the lines that differ from
+    the previous frame, which are rewritten; then everything below the frame
+    is erased and the cursor is left just below it, so that the prompts of
+    the user appear there. Messages and prompts must be written with
+    :meth:`write` and :meth:`input`, which count the lines below the frame:
+    if they make the terminal scroll, the positions of the lines are lost and
+    the next frame is drawn entirely.
+
+    When the terminal does not support ANSI escape codes, each frame is
+    printed entirely after 40 blank lines. When the frame does not fit in the
+    terminal, it is printed entirely after clearing the screen.
+
+    :param stream: the output stream. If None, ``sys.stdout`` is used.
+    :param ansi: whether the terminal supports ANSI escape codes. If None,
+        it is guessed: the stream must be a terminal and the environment
+        variable ``TERM`` must not be ``dumb``.
+    :param size: the size of the terminal, as a pair (columns, lines). If
+        None, it is read before each frame.
+
+    :var list previous: the lines of the previous frame, or None if the next
+        frame must be drawn entirely.
+    :var int n_lines_below: the number of lines written below the previous
+        frame.
+
+    >>> from io import StringIO
+    >>> stream = StringIO()
+    >>> renderer = TerminalRenderer(stream, ansi=True, size=(80, 24))
+    >>> renderer.render('Board: B1\\nClues: 8')
+    >>> stream.getvalue()
+    '\\x1b[2J\\x1b[HBoard: B1\\nClues: 8\\x1b[3;1H\\x1b[J'
+
+    Only the second line is rewritten:
+
+    >>> _ = stream.seek(0), stream.truncate()
+    >>> renderer.render('Board: B1\\nClues: 7')
+    >>> stream.getvalue()
+    '\\x1b[2;1HClues: 7\\x1b[K\\x1b[3;1H\\x1b[J'
+
+    Without ANSI escape codes:
+
+    >>> stream = StringIO()
+    >>> renderer = TerminalRenderer(stream, ansi=False)
+    >>> renderer.render('Board: B1\\nClues: 8')
+    >>> stream.getvalue() == '\\n' * 41 + 'Board: B1\\nClues: 8\\n'
+    True
+    """
+
+    #: Erase the whole screen.
+    CLEAR_SCREEN = '\033[2J'
+    #: Move the cursor to the top left corner.
+    HOME = '\033[H'
+    #: Erase from the cursor to the end of the line.
+    CLEAR_LINE = '\033[K'
+    #: Erase from the cursor to the end of the screen.
+    CLEAR_BELOW = '\033[J'
+
+    def __init__(self, stream: TextIO = None, ansi: bool = None,
+                 size: Tuple[int, int] = None):
+        self.stream = sys.stdout if stream is None else stream
+        if ansi is None:
+            ansi = (hasattr(self.stream, 'isatty') and self.stream.isatty()
+                    and os.environ.get('TERM') != 'dumb')
+        self.ansi = ansi
+        self.size = size
+        self.previous = None                    # type: Union[List[str], None]
+        self.n_lines_below = 0
+
+    def colored(self) -> str:
+        return 'Terminal renderer (%s)' % (
+            'ANSI' if self.ansi else 'full redraw')
+
+    def render(self, s: str) -> None:
+        """
+        Display a frame.
+
+        :param s: the frame (possibly with ANSI escape codes for colors and
+            style).
+        """
+        self.stream.write(self.frame(s))
+        self.stream.flush()
+
+    def frame(self, s: str) -> str:
+        """
+        Characters to write in order to display a frame.
+
+        :param s: the frame.
+
+        :return: the characters to write. This also updates
+            :attr:`previous`.
+        """
+        if not self.ansi:
+            return '\n' * 41 + s + '\n'
+        lines = s.split('\n')
+        columns, n_lines = self._size()
+        if (self.previous is not None
+                and len(self.previous) + self.n_lines_below >= n_lines):
+            # The terminal has scrolled since the previous frame.
+            self.previous = None
+        self.n_lines_below = 0
+        if (len(lines) >= n_lines
+                or any(len(uncolor(line)) > columns for line in lines)):
+            # The frame scrolls or wraps: positions are unreliable.
+            self.previous = None
+            return self.CLEAR_SCREEN + self.HOME + s + '\n'
+        if self.previous is None:
+            out = [self.CLEAR_SCREEN, self.HOME, s]
+        else:
+            out = []
+            for row, line in enumerate(lines):
+                if row >= len(self.previous) or line != self.previous[row]:
+                    out.append('\033[%d;1H' % (row + 1) + line
+                               + self.CLEAR_LINE)
+        out.append('\033[%d;1H' % (len(lines) + 1) + self.CLEAR_BELOW)
+        self.previous = lines
+        return ''.join(out)
+
+    def reset(self) -> None:
+        """
+        Forget the previous frame: the next one will be drawn entirely.
+
+        This must be used when something else has written on the terminal
+        above the bottom of the frame.
+        """
+        self.previous = None
+        self.n_lines_below = 0
+
+    def write(self, s: str) -> None:
+        """
+        Write a message below the frame.
+
+        :param s: the message (usually ending with a new line).
+
+        >>> from io import StringIO
+        >>> stream = StringIO()
+        >>> renderer = TerminalRenderer(stream, ansi=True, size=(80, 4))
+        >>> renderer.render('Board: B1\\nClues: 8')
+        >>> renderer.write('Illegal action.\\n')
+        >>> renderer.n_lines_below
+        1
+        >>> _ = stream.seek(0), stream.truncate()
+        >>> renderer.render('Board: B1\\nClues: 7')
+        >>> stream.getvalue()
+        '\\x1b[2;1HClues: 7\\x1b[K\\x1b[3;1H\\x1b[J'
+
+        Here, two more lines would make the terminal scroll:
+
+        >>> renderer.write('Illegal action.\\nTry again.\\n')
+        >>> _ = stream.seek(0), stream.truncate()
+        >>> renderer.render('Board: B1\\nClues: 6')
+        >>> stream.getvalue()
+        '\\x1b[2J\\x1b[HBoard: B1\\nClues: 6\\x1b[3;1H\\x1b[J'
+        """
+        self.stream.write(s)
+        self.stream.flush()
+        columns = self._size()[0]
+        self.n_lines_below += s.count('\n') + sum(
+            len(uncolor(line)) // columns for line in s.split('\n'))
+
+    def input(self, prompt: str) -> str:
+        """
+        Ask the user for an input, below the frame.
+
+        :param prompt: the prompt.
+
+        :return: the answer of the user.
+        """
+        self.write(prompt)
+        answer = input()
+        self.n_lines_below += 1
+        return answer
+
+    def _size(self) -> Tuple[int, int]:
+        """
+        Size of the terminal.
+
+        :return: the number of columns and lines.
+        """
+        return shutil.get_terminal_size() if self.size is None else self.size
+
+
+if __name__ == '__main__':
+    from time import sleep
+    my_renderer = TerminalRenderer()
+    my_renderer.test_str()
+    for my_i in range(5):
+        my_renderer.render('Static line\nCounter: %s\nStatic line' % my_i)
+        sleep(0.5)
+
+    import doctest
+    doctest.testmod()
@@ -6,35 +6,155 @@ __author__ = """François Durand"""
 __email__ = 'fradurand@gmail.com'
 __version__ = '0.1.12'
 
-from .Modules.Action import Action
-from .Modules.ActionClue import ActionClue
-from .Modules.ActionThrow import ActionThrow
-from .Modules.ActionForfeit import ActionForfeit
-from .Modules.ActionPlayCard import ActionPlayCard
-from .Modules.Board import Board
-from .Modules.Card import Card
-from .Modules.CardPublic import CardPublic
-from .Modules.Clue import Clue
-from .Modules.Color import Color
-from .Modules.ColorMulticolor import ColorMulticolor
-from .Modules.ColorColorless import ColorColorless
-from .Modules.Colors import Colors
-from .Modules.Colored import Colored
-from .Modules.Configuration import Configuration
-from .Modules.ConfigurationColorContents import ConfigurationColorContents
-from .Modules.ConfigurationDeck import ConfigurationDeck
-from .Modules.ConfigurationEmptyClueRule import ConfigurationEmptyClueRule
-from .Modules.ConfigurationEndRule import ConfigurationEndRule
-from .Modules.ConfigurationHandSize import ConfigurationHandSize
-from .Modules.DiscardPile import DiscardPile
-from .Modules.DrawPile import DrawPile
-from .Modules.DrawPilePublic import DrawPilePublic
-from .Modules.Game import Game
-from .Modules.Hand import Hand
-from .Modules.HandPublic import HandPublic
-from .Modules.Player import Player
-from .Modules.PlayerBase import PlayerBase
-from .Modules.PlayerHumanText import PlayerHumanText
-from .Modules.PlayerPuppet import PlayerPuppet
-from .Modules.StringAnsi import StringAnsi
-from .Modules.StringUtils import uncolor, title, str_from_iterable
+import importlib
+from typing import TYPE_CHECKING
+
+# The public API is loaded lazily: each name is imported from its module the
+# first time it is accessed (PEP 562). Hence ``import hanabython`` is fast, and
+# e.g. a worker that only uses :class:`Game` does not pay for the rest.
+_modules = {
+    'Action': 'Action',
+    'ActionClue': 'ActionClue',
+    'ActionThrow': 'ActionThrow',
+    'ActionForfeit': 'ActionForfeit',
+    'ActionPlayCard': 'ActionPlayCard',
+    'ActionSpace': 'ActionSpace',
+    'Board': 'Board',
+    'Campaign': 'Campaign',
+    'Card': 'Card',
+    'CardClassification': 'CardClassification',
+    'CardPublic': 'CardPublic',
+    'Clue': 'Clue',
+    'Color': 'Color',
+    'ColorMulticolor': 'ColorMulticolor',
+    'ColorColorless': 'ColorColorless',
+    'ColorPermutation': 'ColorPermutation',
+    'Colors': 'Colors',
+    'Comparison': 'Comparison',
+    'Colored': 'Colored',
+    'Configuration': 'Configuration',
+    'ConfigurationColorContents': 'ConfigurationColorContents',
+    'ConfigurationDeck': 'ConfigurationDeck',
+    'ConfigurationEmptyClueRule': 'ConfigurationEmptyClueRule',
+    'ConfigurationEndRule': 'ConfigurationEndRule',
+    'ConfigurationHandSize': 'ConfigurationHandSize',
+    'DecisionCache': 'DecisionCache',
+    'cached_decision': 'DecisionCache',
+    'DiscardPile': 'DiscardPile',
+    'DrawPile': 'DrawPile',
+    'DrawPilePublic': 'DrawPilePublic',
+    'Environment': 'Environment',
+    'EnvironmentVector': 'EnvironmentVector',
+    'Game': 'Game',
+    'GameEvent': 'GameEvent',
+    'GameRecorder': 'GameRecorder',
+    'GameResult': 'GameResult',
+    'Hand': 'Hand',
+    'HandArray': 'HandArray',
+    'HandPublic': 'HandPublic',
+    'LatencyHistograms': 'LatencyHistograms',
+    'LoadTest': 'LoadTest',
+    'OpeningBook': 'OpeningBook',
+    'Player': 'Player',
+    'PlayerBase': 'PlayerBase',
+    'PlayerHumanText': 'PlayerHumanText',
+    'PlayerOpeningBook': 'PlayerOpeningBook',
+    'PlayerPuppet': 'PlayerPuppet',
+    'PlayerRandom': 'PlayerRandom',
+    'PlayerRemote': 'PlayerRemote',
+    'PlayerScripted': 'PlayerScripted',
+    'PlayerSubscriber': 'PlayerSubscriber',
+    'PlayerTimed': 'PlayerTimed',
+    'PlayerWrapper': 'PlayerWrapper',
+    'ResultsStore': 'ResultsStore',
+    'ResultsWriter': 'ResultsStore',
+    'Server': 'Server',
+    'play_remote': 'Server',
+    'Statistics': 'Statistics',
+    'StringAnsi': 'StringAnsi',
+    'Sweep': 'Sweep',
+    'TerminalRenderer': 'TerminalRenderer',
+    'uncolor': 'StringUtils',
+    'title': 'StringUtils',
+    'str_from_iterable': 'StringUtils',
+}
+
+__all__ = list(_modules)
+
+
+def __getattr__(name: str):
+    try:
+        module = _modules[name]
+    except KeyError:
+        raise AttributeError("module %r has no attribute %r"
+                             % (__name__, name)) from None
+    value = getattr(importlib.import_module('.Modules.' + module, __name__),
+                    name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .Modules.Action import Action
+    from .Modules.ActionClue import ActionClue
+    from .Modules.ActionThrow import ActionThrow
+    from .Modules.ActionForfeit import ActionForfeit
+    from .Modules.ActionPlayCard import ActionPlayCard
+    from .Modules.ActionSpace import ActionSpace
+    from .Modules.Board import Board
+    from .Modules.Campaign import Campaign
+    from .Modules.Card import Card
+    from .Modules.CardClassification import CardClassification
+    from .Modules.CardPublic import CardPublic
+    from .Modules.Clue import Clue
+    from .Modules.Color import Color
+    from .Modules.ColorMulticolor import ColorMulticolor
+    from .Modules.ColorColorless import ColorColorless
+    from .Modules.ColorPermutation import ColorPermutation
+    from .Modules.Colors import Colors
+    from .Modules.Comparison import Comparison
+    from .Modules.Colored import Colored
+    from .Modules.Configuration import Configuration
+    from .Modules.ConfigurationColorContents import ConfigurationColorContents
+    from .Modules.ConfigurationDeck import ConfigurationDeck
+    from .Modules.ConfigurationEmptyClueRule import ConfigurationEmptyClueRule
+    from .Modules.ConfigurationEndRule import ConfigurationEndRule
+    from .Modules.ConfigurationHandSize import ConfigurationHandSize
+    from .Modules.DecisionCache import DecisionCache, cached_decision
+    from .Modules.DiscardPile import DiscardPile
+    from .Modules.DrawPile import DrawPile
+    from .Modules.DrawPilePublic import DrawPilePublic
+    from .Modules.Environment import Environment
+    from .Modules.EnvironmentVector import EnvironmentVector
+    from .Modules.Game import Game
+    from .Modules.GameEvent import GameEvent
+    from .Modules.GameRecorder import GameRecorder
+    from .Modules.GameResult import GameResult
+    from .Modules.Hand import Hand
+    from .Modules.HandArray import HandArray
+    from .Modules.HandPublic import HandPublic
+    from .Modules.LatencyHistograms import LatencyHistograms
+    from .Modules.LoadTest import LoadTest
+    from .Modules.OpeningBook import OpeningBook
+    from .Modules.Player import Player
+    from .Modules.PlayerBase import PlayerBase
+    from .Modules.PlayerHumanText import PlayerHumanText
+    from .Modules.PlayerOpeningBook import PlayerOpeningBook
+    from .Modules.PlayerPuppet import PlayerPuppet
+    from .Modules.PlayerRandom import PlayerRandom
+    from .Modules.PlayerRemote import PlayerRemote
+    from .Modules.PlayerScripted import PlayerScripted
+    from .Modules.PlayerSubscriber import PlayerSubscriber
+    from .Modules.PlayerTimed import PlayerTimed
+    from .Modules.PlayerWrapper import PlayerWrapper
+    from .Modules.ResultsStore import ResultsStore, ResultsWriter
+    from .Modules.Server import Server, play_remote
+    from .Modules.Statistics import Statistics
+    from .Modules.StringAnsi import StringAnsi
+    from .Modules.Sweep import Sweep
+    from .Modules.TerminalRenderer import TerminalRenderer
+    from .Modules.StringUtils import uncolor, title, str_from_iterable